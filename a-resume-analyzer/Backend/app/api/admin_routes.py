@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from app.Backend.app.core.database import get_db, User, ResumeBuild, MatchHistory
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Backend.app.core.database import get_async_db, SessionLocal, User, ResumeBuild, MatchHistory
 from app.Backend.app.api.auth_routes import get_current_user
 from app.Backend.app.core.limiter import limiter
+from app.Backend.app.core.dependencies import get_primary_vectorizer
+from app.Backend.app.schemas.auth import ResumeSearchRequest, ResumeSearchResponse
+from app.Backend.app.services.model_store import model_store
+from app.Backend.app.services.resume_index import resume_index
+from app.Backend.app.services.job_descriptions import job_description_store
 from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
-def verify_admin(user: User = Depends(get_current_user)):
+async def verify_admin(user: User = Depends(get_current_user)):
     """Dependency to check if user is admin"""
     if not user.is_admin:
         raise HTTPException(
@@ -18,16 +25,18 @@ def verify_admin(user: User = Depends(get_current_user)):
 
 @router.get("/stats")
 @limiter.limit("30/minute")
-def get_system_stats(request: Request, db: Session = Depends(get_db), current_admin: User = Depends(verify_admin)):
+async def get_system_stats(request: Request, db: AsyncSession = Depends(get_async_db), current_admin: User = Depends(verify_admin)):
     """Get system usage statistics (Admin only)"""
     
-    total_users = db.query(User).count()
-    total_resumes = db.query(ResumeBuild).count()
-    total_matches = db.query(MatchHistory).count()
+    total_users = await db.scalar(select(func.count()).select_from(User))
+    total_resumes = await db.scalar(select(func.count()).select_from(ResumeBuild))
+    total_matches = await db.scalar(select(func.count()).select_from(MatchHistory))
     
     # Active users in last 24h (proxy by recent resumes or matches)
     yesterday = datetime.utcnow() - timedelta(days=1)
-    recent_users = db.query(ResumeBuild.user_id).filter(ResumeBuild.created_at >= yesterday).distinct().count()
+    recent_users = await db.scalar(
+        select(func.count(ResumeBuild.user_id.distinct())).where(ResumeBuild.created_at >= yesterday)
+    )
     
     return {
         "total_users": total_users,
@@ -38,13 +47,47 @@ def get_system_stats(request: Request, db: Session = Depends(get_db), current_ad
     }
 
 @router.put("/users/{user_id}/role")
-def update_user_role(user_id: int, is_admin: bool, db: Session = Depends(get_db), current_admin: User = Depends(verify_admin)):
+async def update_user_role(user_id: int, is_admin: bool, db: AsyncSession = Depends(get_async_db), current_admin: User = Depends(verify_admin)):
     """Update user role (Admin only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
     user.is_admin = is_admin
-    db.commit()
+    await db.commit()
     
     return {"message": f"User {user.email} admin status updated to {is_admin}"}
+
+@router.post("/resumes/search", response_model=ResumeSearchResponse)
+@limiter.limit("30/minute")
+async def search_resumes(
+    request: Request,
+    payload: ResumeSearchRequest,
+    vectorizer=Depends(get_primary_vectorizer),
+    current_admin: User = Depends(verify_admin)
+):
+    """
+    Rank stored resumes against a job description (Admin only).
+    Uses the inverted resume index, synced with new resumes before searching.
+    The job comes from the job description store.
+    """
+    version = model_store.loaded_version
+    try:
+        result = await run_in_threadpool(_search_resumes, payload, vectorizer, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ResumeSearchResponse(model_version=version, **result)
+
+
+def _search_resumes(payload: ResumeSearchRequest, vectorizer, version) -> dict:
+    """Index sync (vectorizing new resumes) and scoring are CPU-bound; run in a worker thread"""
+    db = SessionLocal()
+    try:
+        resume_index.sync(db, vectorizer, version)
+    finally:
+        db.close()
+    job = job_description_store.get(payload.job_description, vectorizer, version)
+    if not job.clean_text:
+        raise ValueError("Job description has no meaningful content")
+    return resume_index.search(payload.job_description, vectorizer, top_k=payload.top_k, job_vector=job.vector)
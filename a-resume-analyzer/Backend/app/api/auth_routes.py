@@ -1,9 +1,11 @@
 """Authentication and Authorization Routes"""
 
 from fastapi import APIRouter, HTTPException, Depends, status, Header, Request
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.Backend.app.core.database import get_db, User, Subscription
+from app.Backend.app.core.database import get_async_db, User, Subscription
 from app.Backend.app.core.auth import (
     hash_password,
     verify_password,
@@ -20,7 +22,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-def get_current_user(token: str, db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str, db: AsyncSession = Depends(get_async_db)) -> User:
     """Dependency to get current user from token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,7 +39,7 @@ def get_current_user(token: str, db: Session = Depends(get_db)) -> User:
     if token_data is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = await db.scalar(select(User).where(User.email == token_data.email))
     if user is None:
         raise credentials_exception
     
@@ -46,7 +48,7 @@ def get_current_user(token: str, db: Session = Depends(get_db)) -> User:
 
 @router.post("/signup", response_model=TokenResponse)
 @limiter.limit("5/minute")
-def signup(request: Request, payload: UserSignup, db: Session = Depends(get_db)):
+async def signup(request: Request, payload: UserSignup, db: AsyncSession = Depends(get_async_db)):
     """User signup endpoint"""
     
     # Validate email format
@@ -64,7 +66,7 @@ def signup(request: Request, payload: UserSignup, db: Session = Depends(get_db))
         )
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == payload.email.lower()).first()
+    existing_user = await db.scalar(select(User).where(User.email == payload.email.lower()))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -73,14 +75,16 @@ def signup(request: Request, payload: UserSignup, db: Session = Depends(get_db))
     
     try:
         # Create new user
+        # bcrypt is CPU-bound; keep it off the event loop
+        hashed_password = await run_in_threadpool(hash_password, payload.password)
         user = User(
             email=payload.email.lower(),  # Store email in lowercase for consistency
-            hashed_password=hash_password(payload.password),
+            hashed_password=hashed_password,
             is_verified=False
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         
         # Create free subscription with 1 trial credit
         subscription = Subscription(
@@ -90,7 +94,7 @@ def signup(request: Request, payload: UserSignup, db: Session = Depends(get_db))
             remaining_credits=1
         )
         db.add(subscription)
-        db.commit()
+        await db.commit()
         
         logger.info(f"✅ New user registered: {user.email} (ID: {user.id})")
         
@@ -106,7 +110,7 @@ def signup(request: Request, payload: UserSignup, db: Session = Depends(get_db))
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Error during signup: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -116,7 +120,7 @@ def signup(request: Request, payload: UserSignup, db: Session = Depends(get_db))
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit("10/minute")
-def login(request: Request, payload: UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, payload: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """User login endpoint"""
     
     # Validate inputs
@@ -127,7 +131,7 @@ def login(request: Request, payload: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Find user by email (case-insensitive)
-    user = db.query(User).filter(User.email == payload.email.lower()).first()
+    user = await db.scalar(select(User).where(User.email == payload.email.lower()))
     
     if not user:
         raise HTTPException(
@@ -136,7 +140,7 @@ def login(request: Request, payload: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(payload.password, user.hashed_password):
+    if not await run_in_threadpool(verify_password, payload.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password. Please check your credentials or create a new account."
@@ -155,7 +159,7 @@ def login(request: Request, payload: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+async def get_current_user_info(authorization: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db)):
     """Get current user information"""
     
     if not authorization:
@@ -164,7 +168,7 @@ def get_current_user_info(authorization: Optional[str] = Header(None), db: Sessi
             detail="Not authenticated"
         )
     
-    user = get_current_user(authorization, db)
+    user = await get_current_user(authorization, db)
     
     return UserResponse(
         id=user.id,
@@ -175,7 +179,7 @@ def get_current_user_info(authorization: Optional[str] = Header(None), db: Sessi
 
 
 @router.get("/subscription", response_model=SubscriptionResponse)
-def get_user_subscription(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+async def get_user_subscription(authorization: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db)):
     """Get user subscription details"""
     
     if not authorization:
@@ -184,8 +188,8 @@ def get_user_subscription(authorization: Optional[str] = Header(None), db: Sessi
             detail="Not authenticated"
         )
     
-    user = get_current_user(authorization, db)
-    subscription = db.query(Subscription).filter(Subscription.user_id == user.id).first()
+    user = await get_current_user(authorization, db)
+    subscription = await db.scalar(select(Subscription).where(Subscription.user_id == user.id))
     
     if not subscription:
         # Create default subscription if doesn't exist
@@ -195,7 +199,7 @@ def get_user_subscription(authorization: Optional[str] = Header(None), db: Sessi
             remaining_credits=1
         )
         db.add(subscription)
-        db.commit()
+        await db.commit()
     
     return SubscriptionResponse(
         plan=subscription.plan,
@@ -206,7 +210,7 @@ def get_user_subscription(authorization: Optional[str] = Header(None), db: Sessi
 
 
 @router.post("/verify-email")
-def verify_email(token: str, db: Session = Depends(get_db)):
+async def verify_email(token: str, db: AsyncSession = Depends(get_async_db)):
     """Verify user email"""
     
     token_data = verify_token(token)
@@ -216,7 +220,7 @@ def verify_email(token: str, db: Session = Depends(get_db)):
             detail="Invalid or expired token"
         )
     
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = await db.scalar(select(User).where(User.email == token_data.email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -224,7 +228,7 @@ def verify_email(token: str, db: Session = Depends(get_db)):
         )
     
     user.is_verified = True
-    db.commit()
+    await db.commit()
     
     logger.info(f"✅ Email verified for user: {user.email}")
     
@@ -232,10 +236,10 @@ def verify_email(token: str, db: Session = Depends(get_db)):
 
 
 @router.post("/request-email-verification")
-def request_email_verification(email: str, db: Session = Depends(get_db)):
+async def request_email_verification(email: str, db: AsyncSession = Depends(get_async_db)):
     """Request email verification token"""
     
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
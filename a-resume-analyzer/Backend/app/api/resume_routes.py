@@ -1,11 +1,20 @@
 """Resume Building and Generation Routes"""
 
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from app.Backend.app.core.database import get_db, User, Subscription, ResumeBuild
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Backend.app.core.database import get_async_db, SessionLocal, User, Subscription, ResumeBuild
 from app.Backend.app.api.auth_routes import get_current_user
-from app.Backend.app.schemas.auth import ResumeBuilderRequest, ResumeGenerationResponse, ResumeTemplate
+from app.Backend.app.core.dependencies import get_primary_vectorizer
+from app.Backend.app.schemas.auth import (
+    ResumeBuilderRequest,
+    ResumeGenerationResponse,
+    ResumeTemplate,
+    JobMatchRequest,
+    JobMatchResponse
+)
 from app.Backend.app.services.resume_generator import (
     generate_ats_score,
     generate_resume_html,
@@ -13,6 +22,14 @@ from app.Backend.app.services.resume_generator import (
     get_available_templates,
     TEMPLATES
 )
+from app.Backend.app.services.model_store import model_store
+from app.Backend.app.services.resume_index import resume_index, resume_text
+from app.Backend.app.services.resume_vectors import resume_vector_store
+from app.Backend.app.services.job_descriptions import job_description_store
+from app.Backend.app.services.match_history import match_history_recorder
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.matcher import compute_similarity
+from app.Backend.app.services.skill_extractor import skill_extractor
 import json
 import logging
 from datetime import datetime
@@ -21,6 +38,38 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/resume", tags=["Resume Builder"])
 
 
+def _index_resume(resume_build: ResumeBuild):
+    """Add a new resume to the recruiter search index (skipped until a model is loaded)"""
+    try:
+        resume_index.add(resume_build, get_primary_vectorizer(), model_store.loaded_version)
+    except HTTPException:
+        pass
+    except Exception as e:
+        logger.warning(f"⚠️  Resume {resume_build.id} not indexed: {e}")
+
+
+def _store_resume_vector(resume_build: ResumeBuild):
+    """Persist the preprocessed text and vector for /resume/match (computed lazily if this fails)"""
+    db = SessionLocal()
+    try:
+        resume_vector_store.store(db, resume_build, get_primary_vectorizer(), model_store.loaded_version)
+    except HTTPException:
+        pass
+    except Exception as e:
+        logger.warning(f"⚠️  Vector for resume {resume_build.id} not stored: {e}")
+    finally:
+        db.close()
+
+
+def _saved_resume_vector(resume: ResumeBuild, vectorizer, model_version):
+    """resume_vector_store.get on a session of its own (runs in the threadpool)"""
+    db = SessionLocal()
+    try:
+        return resume_vector_store.get(db, resume, vectorizer, model_version)
+    finally:
+        db.close()
+
+
 @router.get("/templates", response_model=list[ResumeTemplate])
 def list_resume_templates():
     """Get available resume templates"""
@@ -29,10 +78,10 @@ def list_resume_templates():
 
 
 @router.post("/generate", response_model=ResumeGenerationResponse)
-def generate_resume(
+async def generate_resume(
     payload: ResumeBuilderRequest,
     authorization: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate a new resume"""
     
@@ -43,7 +92,7 @@ def generate_resume(
         )
     
     try:
-        user = get_current_user(authorization, db)
+        user = await get_current_user(authorization, db)
     except HTTPException:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,7 +100,7 @@ def generate_resume(
         )
     
     # Check subscription credits
-    subscription = db.query(Subscription).filter(Subscription.user_id == user.id).first()
+    subscription = await db.scalar(select(Subscription).where(Subscription.user_id == user.id))
     if not subscription or subscription.remaining_credits <= 0:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
@@ -83,7 +132,7 @@ def generate_resume(
         
         # Generate HTML and PDF
         html_content = generate_resume_html(resume_data, payload.template)
-        pdf_bytes = generate_resume_pdf(resume_data, payload.template)
+        pdf_bytes = await run_in_threadpool(generate_resume_pdf, resume_data, payload.template)
         
         # Save resume build to database
         resume_build = ResumeBuild(
@@ -93,14 +142,17 @@ def generate_resume(
             score=ats_score
         )
         db.add(resume_build)
-        db.commit()
-        db.refresh(resume_build)
+        await db.commit()
+        await db.refresh(resume_build)
+        
+        await run_in_threadpool(_index_resume, resume_build)
+        await run_in_threadpool(_store_resume_vector, resume_build)
         
         # Deduct credit from subscription
         subscription.remaining_credits -= 1
         if not subscription.trial_used:
             subscription.trial_used = True
-        db.commit()
+        await db.commit()
         
         logger.info(f"✅ Resume generated for user {user.email} with ATS score {ats_score}")
         
@@ -126,10 +178,10 @@ def generate_resume(
 
 
 @router.get("/download/{resume_id}")
-def download_resume(
+async def download_resume(
     resume_id: int,
     authorization: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Download generated resume as PDF"""
     
@@ -140,7 +192,7 @@ def download_resume(
         )
     
     try:
-        user = get_current_user(authorization, db)
+        user = await get_current_user(authorization, db)
     except HTTPException:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -148,10 +200,10 @@ def download_resume(
         )
     
     # Get resume and verify ownership
-    resume = db.query(ResumeBuild).filter(
+    resume = await db.scalar(select(ResumeBuild).where(
         ResumeBuild.id == resume_id,
         ResumeBuild.user_id == user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -162,7 +214,7 @@ def download_resume(
     try:
         # Regenerate PDF from stored content
         resume_data = json.loads(resume.resume_content)
-        pdf_bytes = generate_resume_pdf(resume_data, resume.template_name)
+        pdf_bytes = await run_in_threadpool(generate_resume_pdf, resume_data, resume.template_name)
         
         filename = f"resume_{user.email.split('@')[0]}_{datetime.now().strftime('%Y%m%d')}.pdf"
         
@@ -180,7 +232,7 @@ def download_resume(
 
 
 @router.get("/my-resumes")
-def get_user_resumes(authorization: str = None, db: Session = Depends(get_db)):
+async def get_user_resumes(authorization: str = None, db: AsyncSession = Depends(get_async_db)):
     """Get all resumes for current user"""
     
     if not authorization:
@@ -190,14 +242,14 @@ def get_user_resumes(authorization: str = None, db: Session = Depends(get_db)):
         )
     
     try:
-        user = get_current_user(authorization, db)
+        user = await get_current_user(authorization, db)
     except HTTPException:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
     
-    resumes = db.query(ResumeBuild).filter(ResumeBuild.user_id == user.id).all()
+    resumes = (await db.scalars(select(ResumeBuild).where(ResumeBuild.user_id == user.id))).all()
     
     return [
         {
@@ -212,10 +264,10 @@ def get_user_resumes(authorization: str = None, db: Session = Depends(get_db)):
 
 
 @router.get("/preview/{resume_id}")
-def preview_resume(
+async def preview_resume(
     resume_id: int,
     authorization: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get HTML preview of resume"""
     
@@ -226,17 +278,17 @@ def preview_resume(
         )
     
     try:
-        user = get_current_user(authorization, db)
+        user = await get_current_user(authorization, db)
     except HTTPException:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
     
-    resume = db.query(ResumeBuild).filter(
+    resume = await db.scalar(select(ResumeBuild).where(
         ResumeBuild.id == resume_id,
         ResumeBuild.user_id == user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -252,3 +304,91 @@ def preview_resume(
         "html": html_content,
         "ats_score": resume.score
     }
+
+
+@router.post("/match", response_model=JobMatchResponse)
+async def match_saved_resume(
+    payload: JobMatchRequest,
+    authorization: str = None,
+    db: AsyncSession = Depends(get_async_db),
+    vectorizer=Depends(get_primary_vectorizer)
+):
+    """
+    Match one of the user's saved resumes against a job description by resume_id.
+    The resume's stored preprocessed text and vector are used (recomputed from
+    the stored text after a retrain), and the job comes from the job
+    description store, so a repeated job is not preprocessed either.
+    """
+    
+    if not authorization:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    
+    try:
+        user = await get_current_user(authorization, db)
+    except HTTPException:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    
+    if payload.resume_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="resume_id is required; use /api/match for resume text"
+        )
+    
+    resume = await db.scalar(select(ResumeBuild).where(
+        ResumeBuild.id == payload.resume_id,
+        ResumeBuild.user_id == user.id
+    ))
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    version = model_store.loaded_version
+    job = await run_in_threadpool(job_description_store.get, payload.job_description, vectorizer, version)
+    if not job.clean_text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Job description has no meaningful content after preprocessing"
+        )
+    
+    try:
+        resume_vector, resume_tokens, reused = await run_in_threadpool(
+            _saved_resume_vector, resume, vectorizer, version
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    score = compute_similarity(resume_vector, job.vector)
+    matched, missing = skill_extractor.match_keywords(
+        resume_text(json.loads(resume.resume_content)), payload.job_description
+    )
+    
+    if settings.MATCH_HISTORY_ENABLED:
+        match_history_recorder.record(
+            job.text_hash,
+            score,
+            user_id=user.id,
+            resume_id=resume.id,
+            matched_keywords=matched,
+            missing_keywords=missing
+        )
+    
+    return JobMatchResponse(
+        match_score=score,
+        matched_skills=matched,
+        missing_skills=missing,
+        suggestions=[],
+        resume_id=resume.id,
+        processed_resume_tokens=resume_tokens,
+        processed_job_tokens=job.token_count,
+        model_version=version,
+        vector_reused=reused
+    )
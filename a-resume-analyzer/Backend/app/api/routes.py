@@ -1,24 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, FastAPI, Request
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, FastAPI, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Iterable, Literal
 import json
 import hashlib
+import itertools
+import time
+from sqlalchemy.orm import Session
 from app.Backend.app.services.preprocessing import process_text
 from app.Backend.app.services.vectorizer import TextVectorizer
+from app.Backend.app.services.model_store import model_store
+from app.Backend.app.services.model_registry import model_registry
+from app.Backend.app.services.retrainer import model_retrainer
 from app.Backend.app.services.matcher import compute_similarity
 from app.Backend.app.services.pdf_parser import parse_resume_pdf
-from app.Backend.app.services.batch_processor import BatchProcessor, MultiJobMatcher
+from app.Backend.app.services.batch_processor import BatchProcessor, MultiJobMatcher, TopKMatches
+from app.Backend.app.services.bulk_matcher import BulkMatcher, iter_pdf_entries
+from app.Backend.app.services.job_queue import batch_job_queue, get_job_results, JobQueueFull
+from app.Backend.app.services.ann_index import job_catalog
+from app.Backend.app.services.sharded_index import shard_coordinator
 from app.Backend.app.services.llm_matcher import llm_match_resume
-from app.Backend.app.core.dependencies import get_vectorizer, verify_admin_token
+from app.Backend.app.services.skill_extractor import skill_extractor
+from app.Backend.app.services.near_duplicates import near_duplicate_index, job_key
+from app.Backend.app.services.job_descriptions import job_description_store, job_hash, StoredJob
+from app.Backend.app.services.match_history import match_history_recorder
+from app.Backend.app.core.dependencies import get_vectorizer, get_primary_vectorizer, verify_admin_token
 from app.Backend.app.core.config import settings
+from app.Backend.app.core.database import get_db, BatchJob
 from app.Backend.app.core.limiter import limiter
 from app.Backend.app.core.cache import get_cache, set_cache
 
 router = APIRouter()
 
 
+def _ndjson_stream(results: Iterable[dict]):
+    """Encode result dicts as newline-delimited JSON, one line per result"""
+    for result in results:
+        yield json.dumps(result) + "\n"
+
+
 class MatchRequest(BaseModel):
     resume_text: str = Field(..., min_length=10, description="Resume text content")
     job_description: str = Field(..., min_length=10, description="Job description text")
@@ -33,14 +56,40 @@ class MatchResponse(BaseModel):
     suggestions: Optional[List[str]] = None
     is_cached: bool = False
     used_llm: bool = False
+    near_duplicate_similarity: Optional[float] = Field(None, description="Set when the resume is a near-duplicate of an earlier one")
 
 
 class RetrainResponse(BaseModel):
-    status: str
-    message: str
-    version: str
-    num_docs: int
-    trained_at: str
+    state: Literal["idle", "running", "completed", "failed"]
+    stage: Optional[str] = None
+    mode: Optional[str] = None
+    version: Optional[str] = None
+    base_version: Optional[str] = None
+    current_version: Optional[str] = None
+    num_docs: Optional[int] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    trained_at: Optional[str] = None
+    new_docs: Optional[int] = None
+    admitted_terms: Optional[int] = None
+    pending_terms: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ModelRoutingRequest(BaseModel):
+    canary_version: Optional[str] = Field(None, description="Resident version for percentage routing")
+    canary_percent: float = Field(0.0, ge=0.0, le=100.0)
+    shadow_version: Optional[str] = Field(None, description="Version scoring matches in the background")
+
+
+class ModelRegistryResponse(BaseModel):
+    primary_version: Optional[str]
+    resident_versions: List[str]
+    available_versions: List[str]
+    canary_version: Optional[str]
+    canary_percent: float
+    shadow_version: Optional[str]
+    shadow_stats: dict
 
 
 class HealthResponse(BaseModel):
@@ -67,12 +116,61 @@ class BatchMatchResponse(BaseModel):
     failed: int
     results: List[dict]
     processing_time_seconds: float
+    dedup: Optional[dict] = Field(None, description="Unique document counts and dedup ratios")
+
+
+class BatchMatrixRequest(BaseModel):
+    resumes: List[str] = Field(..., min_length=1, description="Unique resume texts")
+    job_descriptions: List[str] = Field(..., min_length=1, description="Unique job descriptions")
+    mode: Literal["matrix", "top_k"] = Field("top_k", description="Full score matrix or per-resume/per-job top K")
+    top_k: int = Field(5, ge=1, le=1000, description="K for top_k mode")
+    encoding: Literal["uint16", "list"] = Field(
+        "uint16", description="Matrix mode: base64 packed uint16 scores or nested float lists"
+    )
+
+
+class BatchMatrixResponse(BaseModel):
+    shape: List[int]
+    empty_resumes: List[int]
+    empty_jobs: List[int]
+    scores: Optional[List[List[float]]] = None
+    scores_b64: Optional[str] = Field(None, description="Row-major little-endian uint16 scores, base64")
+    scores_scale: Optional[int] = Field(None, description="Divide scores_b64 values by this to get match scores")
+    top_k: Optional[int] = None
+    top_jobs_per_resume: Optional[List[List[dict]]] = None
+    top_resumes_per_job: Optional[List[List[dict]]] = None
+    processing_time_seconds: float
+
+
+class BatchJobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    successful: int
+    failed: int
+    progress: float = Field(..., ge=0.0, le=1.0, description="Fraction of pairs processed")
+    error: Optional[str] = None
+    dedup: Optional[dict] = Field(None, description="Unique document counts and dedup ratios so far")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class BatchJobResultsResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    offset: int
+    limit: int
+    results: List[dict]
 
 
 class MultiJobMatchRequest(BaseModel):
     resume_text: str = Field(..., min_length=10)
     job_descriptions: List[str] = Field(..., min_length=1)
     top_k: Optional[int] = Field(None, ge=1, description="Return top K matches")
+    scoring: Literal["tfidf", "lsa"] = Field("tfidf", description="Sparse TF-IDF cosine or dense LSA embeddings")
 
 
 class MultiJobMatchResponse(BaseModel):
@@ -80,17 +178,136 @@ class MultiJobMatchResponse(BaseModel):
     matches: List[dict]
 
 
+class CatalogJob(BaseModel):
+    job_id: int
+    description: str = Field(..., min_length=10)
+
+
+class CatalogAddRequest(BaseModel):
+    jobs: List[CatalogJob] = Field(..., min_length=1)
+
+
+class CatalogResponse(BaseModel):
+    total_jobs: int
+    model_version: str | None = None
+    indexed: int | None = None
+    removed: int | None = None
+
+
+class CatalogMatchRequest(BaseModel):
+    resume_text: str = Field(..., min_length=10)
+    top_k: int = Field(10, ge=1, le=1000)
+    n_probes: Optional[int] = Field(None, ge=1, description="Buckets probed per hash table (default ANN_PROBES)")
+
+
+class CatalogMatchResponse(BaseModel):
+    total_jobs: int
+    candidates: int
+    scoring: Literal["tfidf", "lsa"] = Field(..., description="Score of the re-rank: exact TF-IDF cosine, or LSA similarity for jobs indexed without a stored vector")
+    matches: List[dict]
+
+
+class ShardStatusResponse(BaseModel):
+    running: bool
+    n_shards: int
+    count: int
+    model_version: str | None = None
+    shards: List[dict]
+
+
+class ShardedMatchRequest(BaseModel):
+    resume_text: str = Field(..., min_length=10)
+    top_k: int = Field(10, ge=1, le=1000)
+
+
+class ShardedMatchResponse(BaseModel):
+    total_jobs: int
+    shards: int
+    failed_shards: List[int]
+    scoring: Literal["tfidf", "lsa"] = Field(..., description="Score of matches: TF-IDF cosine, or LSA similarity")
+    matches: List[dict]
+
+
+def _record_match(job_text: str, result: dict):
+    """Queue a match_history row (written behind, in bulk)"""
+    if settings.MATCH_HISTORY_ENABLED:
+        match_history_recorder.record(
+            job_hash(job_text),
+            result["match_score"],
+            matched_keywords=result.get("matched_keywords"),
+            missing_keywords=result.get("missing_keywords")
+        )
+
+
+async def _score_match(request: Request, resume_text: str, job_text: str, resume_clean: str, job: StoredJob,
+                       vectorizer) -> dict:
+    """
+    Score one resume/job pair: LLM if available, else the ML model (with
+    skill-taxonomy keywords). The job comes preprocessed and vectorized from
+    the job description store. A near-duplicate of a resume already scored
+    by the LLM against the same job reuses that result instead of calling
+    the LLM again; ML results are always recomputed (milliseconds, and exact
+    for the edited text) and only flagged as near-duplicates.
+    """
+    dup = key = None
+    if settings.NEAR_DUP_ENABLED:
+        dup = near_duplicate_index.match(resume_clean)
+        key = job_key(job.clean_text, request.state.model_version)
+        reused = near_duplicate_index.cached_result(dup, key) if settings.NEAR_DUP_REUSE_RESULTS else None
+        if reused:
+            reused["processed_resume_tokens"] = len(resume_clean.split())
+            reused["near_duplicate_similarity"] = round(dup.similarity, 3)
+            return reused
+    
+    resume_tokens = len(resume_clean.split())
+    job_tokens = job.token_count
+    
+    # Try LLM Matching
+    llm_result = await llm_match_resume(resume_text, job_text)
+    
+    if llm_result:
+        result_dict = {
+            "match_score": llm_result["match_score"],
+            "processed_resume_tokens": resume_tokens,
+            "processed_job_tokens": job_tokens,
+            "matched_keywords": llm_result["matched_keywords"],
+            "missing_keywords": llm_result["missing_keywords"],
+            "suggestions": llm_result["suggestions"],
+            "used_llm": True
+        }
+    else:
+        # Fallback to ML Model
+        start = time.perf_counter()
+        score = compute_similarity(vectorizer.transform([resume_clean]), job.vector)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        model_registry.shadow(resume_clean, job.clean_text, request.state.model_version, score, elapsed_ms)
+        matched, missing = skill_extractor.match_keywords(resume_text, job_text)
+        result_dict = {
+            "match_score": score,
+            "processed_resume_tokens": resume_tokens,
+            "processed_job_tokens": job_tokens,
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "used_llm": False
+        }
+    
+    if dup is not None:
+        if result_dict["used_llm"]:
+            near_duplicate_index.store_result(dup.doc_id, key, result_dict)
+        if dup.duplicate_of is not None:
+            # Flag it even though this job had not been scored for the earlier copy
+            result_dict["near_duplicate_similarity"] = round(dup.similarity, 3)
+    return result_dict
+
+
 @router.get("/health", response_model=HealthResponse)
 def health_check():
     """Health check endpoint"""
     try:
-        vectorizer = get_vectorizer()
+        vectorizer = get_primary_vectorizer()
         model_loaded = True
         # Try to read metadata
-        version = None
-        if settings.META_PATH.exists():
-            meta = json.loads(settings.META_PATH.read_text())
-            version = meta.get("version")
+        version = model_store.meta().get("version")
     except HTTPException:
         model_loaded = False
         version = None
@@ -108,6 +325,7 @@ async def match_resume(request: Request, payload: MatchRequest, vectorizer: Text
     """
     Match a resume against a job description.
     Uses LLM if available, falls back to pre-trained ML model.
+    On the ML path, matched/missing keywords come from the skill taxonomy.
     Results are cached via Redis.
     """
     if not payload.resume_text.strip() or not payload.job_description.strip():
@@ -115,52 +333,33 @@ async def match_resume(request: Request, payload: MatchRequest, vectorizer: Text
 
     # Generate cache key
     combined_text = payload.resume_text + payload.job_description
-    cache_key = f"match:{hashlib.sha256(combined_text.encode()).hexdigest()}"
+    cache_key = f"match:{request.state.model_version}:{hashlib.sha256(combined_text.encode()).hexdigest()}"
     
     # Check cache
     cached_result = await get_cache(cache_key)
     if cached_result:
         cached_result['is_cached'] = True
+        _record_match(payload.job_description, cached_result)
         return MatchResponse(**cached_result)
 
     try:
         # Preprocessing for token counts (and fallback ML)
         resume_clean = process_text(payload.resume_text)
-        job_clean = process_text(payload.job_description)
+        # The store reads / writes the database on a miss; keep it off the event loop
+        job = await run_in_threadpool(
+            job_description_store.get, payload.job_description, vectorizer, request.state.model_version
+        )
         
-        if not resume_clean or not job_clean:
+        if not resume_clean or not job.clean_text:
             raise HTTPException(status_code=400, detail="Texts have no meaningful content after preprocessing")
             
-        resume_tokens = len(resume_clean.split())
-        job_tokens = len(job_clean.split())
-
-        # Try LLM Matching
-        llm_result = await llm_match_resume(payload.resume_text, payload.job_description)
-        
-        if llm_result:
-            result_dict = {
-                "match_score": llm_result["match_score"],
-                "processed_resume_tokens": resume_tokens,
-                "processed_job_tokens": job_tokens,
-                "matched_keywords": llm_result["matched_keywords"],
-                "missing_keywords": llm_result["missing_keywords"],
-                "suggestions": llm_result["suggestions"],
-                "used_llm": True
-            }
-        else:
-            # Fallback to ML Model
-            resume_vec = vectorizer.transform([resume_clean])
-            job_vec = vectorizer.transform([job_clean])
-            score = compute_similarity(resume_vec, job_vec)
-            result_dict = {
-                "match_score": score,
-                "processed_resume_tokens": resume_tokens,
-                "processed_job_tokens": job_tokens,
-                "used_llm": False
-            }
+        result_dict = await _score_match(
+            request, payload.resume_text, payload.job_description, resume_clean, job, vectorizer
+        )
             
         # Save to cache
         await set_cache(cache_key, result_dict, expire_secs=86400) # 24 hours
+        _record_match(payload.job_description, result_dict)
         
         result_dict["is_cached"] = False
         return MatchResponse(**result_dict)
@@ -171,76 +370,111 @@ async def match_resume(request: Request, payload: MatchRequest, vectorizer: Text
         raise HTTPException(status_code=500, detail=f"Error processing match: {str(e)}")
 
 
-@router.post("/admin/retrain", response_model=RetrainResponse)
+@router.get("/admin/dedup/stats")
+def near_duplicate_stats(admin_token: str = Depends(verify_admin_token)):
+    """
+    Near-duplicate detection counters for this worker: lookups, exact and
+    near duplicates seen, results reused (and LLM calls avoided) and average
+    lookup time.
+    """
+    return near_duplicate_index.stats()
+
+
+@router.get("/admin/job-descriptions/stats")
+def job_description_stats(admin_token: str = Depends(verify_admin_token)):
+    """
+    Job description store counters for this worker: lookups, memory and
+    database hits, and how many jobs had to be preprocessed or vectorized.
+    """
+    return job_description_store.stats()
+
+
+@router.get("/admin/match-history/stats")
+def match_history_stats(admin_token: str = Depends(verify_admin_token)):
+    """
+    Write-behind match history counters for this worker: recorded, inserted,
+    buffered, spilled to disk, replayed and dropped events.
+    """
+    return match_history_recorder.stats()
+
+
+@router.post("/admin/retrain", response_model=RetrainResponse, status_code=202)
 def retrain_model(admin_token: str = Depends(verify_admin_token)):
     """
     Admin endpoint to retrain the vectorizer model.
     Requires X-Admin-Token header for authentication.
+    
+    Training runs in the background and returns immediately. The new model
+    is written as a new version, validated and then published atomically;
+    every worker switches to it on its next reload check. Poll
+    /admin/retrain/status for progress.
     """
     try:
-        import sys
-        from pathlib import Path as PathLib
-        # Add project root to path if not already there
-        project_root = PathLib(__file__).resolve().parents[3]
-        if str(project_root) not in sys.path:
-            sys.path.insert(0, str(project_root))
-        
-        from ml.train_vectorizer import (
-            load_corpus_from_data_folder,
-            DEFAULT_CORPUS,
-            ARTIFACT_DIR,
-            VECTOR_PATH,
-            META_PATH
-        )
-        from app.Backend.app.core.dependencies import set_vectorizer
-        
-        # Ensure artifact directory exists
-        ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
-        
-        # 1) Load corpus
-        corpus = load_corpus_from_data_folder()
-        if not corpus:
-            corpus = DEFAULT_CORPUS
-        
-        if len(corpus) < 2:
-            raise HTTPException(
-                status_code=400, 
-                detail="Need at least 2 documents to train. Add more data to data/processed/"
-            )
-
-        # 2) Train new vectorizer
-        tv = TextVectorizer()
-        tv.fit_transform(corpus)
-
-        # 3) Save artifact and metadata
-        tv.save(str(VECTOR_PATH))
-        
-        version = f"v{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        trained_at = datetime.now().isoformat() + "Z"
-        meta = {
-            "version": version,
-            "created_at": trained_at,
-            "num_docs": len(corpus)
-        }
-        META_PATH.write_text(json.dumps(meta, indent=2), encoding="utf-8")
-        
-        # 4) Load new model into memory (hot reload)
-        tv_new = TextVectorizer()
-        tv_new.load(str(VECTOR_PATH))
-        set_vectorizer(tv_new)
-        
-        return RetrainResponse(
-            status="success",
-            message="Model retrained and reloaded successfully",
-            version=version,
-            num_docs=len(corpus),
-            trained_at=trained_at
-        )
+        status = model_retrainer.start()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retraining model: {str(e)}")
+    return RetrainResponse(**status)
+
+
+@router.post("/admin/retrain/incremental", response_model=RetrainResponse, status_code=202)
+def retrain_model_incremental(admin_token: str = Depends(verify_admin_token)):
+    """
+    Absorb documents added to data/processed/ since the published model into its
+    document frequencies and publish a new version, without a full refit.
+    New terms join the vocabulary once they reach INCREMENTAL_MIN_DF documents.
+    Runs in the background like /admin/retrain; poll /admin/retrain/status.
+    """
+    try:
+        status = model_retrainer.start(mode="incremental")
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return RetrainResponse(**status)
+
+
+@router.get("/admin/retrain/status", response_model=RetrainResponse)
+def retrain_status(admin_token: str = Depends(verify_admin_token)):
+    """Progress of the last retrain and the currently published model version"""
+    return RetrainResponse(**model_retrainer.status())
+
+
+@router.get("/admin/models", response_model=ModelRegistryResponse)
+def list_models(admin_token: str = Depends(verify_admin_token)):
+    """Resident model versions, routing and shadow scoring statistics (this worker)"""
+    model_registry.refresh()
+    return ModelRegistryResponse(**model_registry.status(model_store.loaded_version))
+
+
+@router.post("/admin/models/{version}/load", response_model=ModelRegistryResponse)
+def load_model_version(version: str, admin_token: str = Depends(verify_admin_token)):
+    """Load a stored model version next to the published one (selectable via X-Model-Version)"""
+    try:
+        model_registry.load(version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return ModelRegistryResponse(**model_registry.status(model_store.loaded_version))
+
+
+@router.delete("/admin/models/{version}", response_model=ModelRegistryResponse)
+def unload_model_version(version: str, admin_token: str = Depends(verify_admin_token)):
+    """Unload a resident version (routing that points at it is cleared)"""
+    if not model_registry.unload(version):
+        raise HTTPException(status_code=404, detail=f"Model version {version} is not loaded")
+    return ModelRegistryResponse(**model_registry.status(model_store.loaded_version))
+
+
+@router.put("/admin/models/routing", response_model=ModelRegistryResponse)
+def configure_model_routing(payload: ModelRoutingRequest, admin_token: str = Depends(verify_admin_token)):
+    """
+    Route canary_percent of requests to canary_version and shadow-score
+    single-pair matches with shadow_version. Versions are loaded if needed.
+    """
+    try:
+        model_registry.configure(payload.canary_version, payload.canary_percent, payload.shadow_version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return ModelRegistryResponse(**model_registry.status(model_store.loaded_version))
 
 
 @router.post("/upload/resume", response_model=FileUploadResponse)
@@ -305,50 +539,29 @@ async def upload_and_match(
     
     # Generate cache key
     combined_text = resume_text + job_description
-    cache_key = f"match_upload:{hashlib.sha256(combined_text.encode()).hexdigest()}"
+    cache_key = f"match_upload:{request.state.model_version}:{hashlib.sha256(combined_text.encode()).hexdigest()}"
     
     # Check cache
     cached_result = await get_cache(cache_key)
     if cached_result:
         cached_result['is_cached'] = True
+        _record_match(job_description, cached_result)
         return MatchResponse(**cached_result)
     
     # Process matching
     try:
         resume_clean = process_text(resume_text)
-        job_clean = process_text(job_description)
+        job = await run_in_threadpool(
+            job_description_store.get, job_description, vectorizer, request.state.model_version
+        )
         
-        if not resume_clean or not job_clean:
+        if not resume_clean or not job.clean_text:
             raise HTTPException(status_code=400, detail="Texts have no meaningful content after preprocessing")
             
-        resume_tokens = len(resume_clean.split())
-        job_tokens = len(job_clean.split())
-
-        # Try LLM Matching
-        llm_result = await llm_match_resume(resume_text, job_description)
-        
-        if llm_result:
-            result_dict = {
-                "match_score": llm_result["match_score"],
-                "processed_resume_tokens": resume_tokens,
-                "processed_job_tokens": job_tokens,
-                "matched_keywords": llm_result["matched_keywords"],
-                "missing_keywords": llm_result["missing_keywords"],
-                "suggestions": llm_result["suggestions"],
-                "used_llm": True
-            }
-        else:
-            resume_vec = vectorizer.transform([resume_clean])
-            job_vec = vectorizer.transform([job_clean])
-            score = compute_similarity(resume_vec, job_vec)
-            result_dict = {
-                "match_score": score,
-                "processed_resume_tokens": resume_tokens,
-                "processed_job_tokens": job_tokens,
-                "used_llm": False
-            }
+        result_dict = await _score_match(request, resume_text, job_description, resume_clean, job, vectorizer)
             
         await set_cache(cache_key, result_dict, expire_secs=86400)
+        _record_match(job_description, result_dict)
         
         result_dict["is_cached"] = False
         return MatchResponse(**result_dict)
@@ -359,8 +572,41 @@ async def upload_and_match(
         raise HTTPException(status_code=500, detail=f"Error processing match: {str(e)}")
 
 
+@router.post("/upload/match/bulk")
+@limiter.limit("5/minute")
+async def bulk_upload_and_match(
+    request: Request,
+    files: List[UploadFile] = File(..., description="Resume PDFs and/or ZIP archives of PDFs"),
+    job_description: str = Form(...),
+    vectorizer: TextVectorizer = Depends(get_vectorizer)
+):
+    """
+    Upload many resumes (PDFs or ZIP archives) and match them against one job description.
+    Streams NDJSON: one "result" line per resume as it completes, then a "summary"
+    line with the full ranking (highest score first).
+    """
+    if len(job_description.strip()) < 10:
+        raise HTTPException(status_code=400, detail="job_description is required (min 10 chars)")
+    
+    matcher = BulkMatcher(max_workers=settings.BULK_MAX_WORKERS, job_store=job_description_store)
+    try:
+        job_clean, job_vec = await run_in_threadpool(
+            matcher.prepare_job, job_description, vectorizer, request.state.model_version
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    entries = iter_pdf_entries(
+        ((f.filename, f.file) for f in files),
+        max_files=settings.BULK_MAX_FILES
+    )
+    results = matcher.stream_matches(entries, job_clean, job_vec, vectorizer)
+    return StreamingResponse(_ndjson_stream(results), media_type="application/x-ndjson")
+
+
 @router.post("/batch/match", response_model=BatchMatchResponse)
 def batch_match(
+    request: Request,
     payload: BatchMatchRequest,
     vectorizer: TextVectorizer = Depends(get_vectorizer)
 ):
@@ -374,8 +620,15 @@ def batch_match(
             detail=f"Mismatch: {len(payload.resumes)} resumes vs {len(payload.job_descriptions)} jobs"
         )
     
+    if len(payload.resumes) > settings.BATCH_MAX_PAIRS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(payload.resumes)} pairs, max {settings.BATCH_MAX_PAIRS}). Use /batch/jobs instead"
+        )
+    
     try:
-        processor = BatchProcessor(max_workers=4)
+        processor = BatchProcessor(max_workers=4, cache_size=settings.BATCH_DOC_CACHE_SIZE,
+                                   job_store=job_description_store, model_version=request.state.model_version)
         start_time = datetime.now()
         
         results = processor.process_batch(
@@ -389,29 +642,226 @@ def batch_match(
         successful = sum(1 for r in results if r.get("success", False))
         failed = len(results) - successful
         
+        for r in results:
+            if r.get("success", False):
+                _record_match(payload.job_descriptions[r["index"]], r)
+        
         return BatchMatchResponse(
             total_processed=len(results),
             successful=successful,
             failed=failed,
             results=results,
-            processing_time_seconds=round(elapsed, 3)
+            processing_time_seconds=round(elapsed, 3),
+            dedup=processor.dedup_stats
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch processing error: {str(e)}")
 
 
+def _job_status(job: BatchJob) -> BatchJobStatusResponse:
+    return BatchJobStatusResponse(
+        job_id=job.id,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        successful=job.successful,
+        failed=job.failed,
+        progress=round(job.processed / job.total, 4) if job.total else 1.0,
+        error=job.error,
+        dedup=json.loads(job.dedup) if job.dedup else None,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
+
+
+@router.post("/batch/match/stream")
+def batch_match_stream(
+    request: Request,
+    payload: BatchMatchRequest,
+    ordered: bool = Query(False, description="Emit results in input order (small reorder buffer)"),
+    vectorizer: TextVectorizer = Depends(get_vectorizer)
+):
+    """
+    Process multiple resume-job pairs, streaming NDJSON.
+    Each "result" line is emitted as soon as it is computed, followed by a
+    final "summary" line. Memory stays flat regardless of batch size.
+    """
+    if len(payload.resumes) != len(payload.job_descriptions):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Mismatch: {len(payload.resumes)} resumes vs {len(payload.job_descriptions)} jobs"
+        )
+    
+    if len(payload.resumes) > settings.BATCH_JOB_MAX_PAIRS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(payload.resumes)} pairs, max {settings.BATCH_JOB_MAX_PAIRS})"
+        )
+    
+    model_version = request.state.model_version
+    
+    def results():
+        processor = BatchProcessor(max_workers=4, cache_size=settings.BATCH_DOC_CACHE_SIZE,
+                                   job_store=job_description_store, model_version=model_version)
+        start_time = datetime.now()
+        successful = 0
+        failed = 0
+        
+        for result in processor.iter_batch(
+            payload.resumes,
+            payload.job_descriptions,
+            vectorizer,
+            ordered=ordered
+        ):
+            if result.get("success", False):
+                successful += 1
+            else:
+                failed += 1
+            yield {"type": "result", **result}
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        yield {
+            "type": "summary",
+            "total_processed": successful + failed,
+            "successful": successful,
+            "failed": failed,
+            "processing_time_seconds": round(elapsed, 3),
+            "dedup": processor.dedup_stats
+        }
+    
+    return StreamingResponse(_ndjson_stream(results()), media_type="application/x-ndjson")
+
+
+@router.post("/batch/matrix", response_model=BatchMatrixResponse, response_model_exclude_none=True)
+def batch_match_matrix(
+    request: Request,
+    payload: BatchMatrixRequest,
+    vectorizer: TextVectorizer = Depends(get_vectorizer)
+):
+    """
+    Score every resume against every job description (N x M).
+    Send unique texts once instead of N x M duplicated pairs.
+    """
+    cells = len(payload.resumes) * len(payload.job_descriptions)
+    if cells > settings.BATCH_MATRIX_MAX_CELLS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Matrix too large ({cells} cells, max {settings.BATCH_MATRIX_MAX_CELLS})"
+        )
+    
+    try:
+        processor = BatchProcessor(max_workers=4, job_store=job_description_store,
+                                   model_version=request.state.model_version)
+        start_time = datetime.now()
+        
+        result = processor.process_matrix(
+            payload.resumes,
+            payload.job_descriptions,
+            vectorizer,
+            mode=payload.mode,
+            top_k=payload.top_k,
+            chunk_size=settings.BATCH_MATRIX_CHUNK_SIZE,
+            encoding=payload.encoding
+        )
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        return BatchMatrixResponse(**result, processing_time_seconds=round(elapsed, 3))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Matrix processing error: {str(e)}")
+
+
+@router.post("/batch/jobs", response_model=BatchJobStatusResponse, status_code=202)
+def submit_batch_job(
+    request: Request,
+    payload: BatchMatchRequest,
+    vectorizer: TextVectorizer = Depends(get_vectorizer)
+):
+    """
+    Queue a large batch of resume-job pairs for background processing.
+    Returns a job id immediately; poll /batch/jobs/{job_id} for progress.
+    """
+    if len(payload.resumes) != len(payload.job_descriptions):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Mismatch: {len(payload.resumes)} resumes vs {len(payload.job_descriptions)} jobs"
+        )
+    
+    if len(payload.resumes) > settings.BATCH_JOB_MAX_PAIRS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(payload.resumes)} pairs, max {settings.BATCH_JOB_MAX_PAIRS})"
+        )
+    
+    try:
+        job = batch_job_queue.submit(
+            payload.resumes, payload.job_descriptions, vectorizer, model_version=request.state.model_version
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"{e}; retry later", headers={"Retry-After": "30"})
+    return _job_status(job)
+
+
+@router.get("/batch/jobs/{job_id}", response_model=BatchJobStatusResponse)
+def get_batch_job(job_id: str, db: Session = Depends(get_db)):
+    """Get status and progress of a queued batch job"""
+    job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return _job_status(job)
+
+
+@router.post("/batch/jobs/{job_id}/cancel", response_model=BatchJobStatusResponse)
+def cancel_batch_job(job_id: str):
+    """
+    Cancel a batch job. Queued jobs stop immediately, running jobs after
+    the current chunk; results persisted so far remain available.
+    """
+    job = batch_job_queue.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return _job_status(job)
+
+
+@router.get("/batch/jobs/{job_id}/results", response_model=BatchJobResultsResponse)
+def get_batch_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Page through the results persisted so far, ordered by pair index"""
+    job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    
+    return BatchJobResultsResponse(
+        job_id=job.id,
+        status=job.status,
+        total=job.total,
+        offset=offset,
+        limit=limit,
+        results=get_job_results(db, job_id, offset=offset, limit=limit)
+    )
+
+
 @router.post("/match/multi-job", response_model=MultiJobMatchResponse)
 def match_to_multiple_jobs(
+    request: Request,
     payload: MultiJobMatchRequest,
     vectorizer: TextVectorizer = Depends(get_vectorizer)
 ):
     """
     Match a single resume against multiple job descriptions.
     Returns ranked matches (highest score first).
+    scoring="lsa" ranks with dense LSA embeddings (one matrix product for all jobs).
     """
     try:
-        matcher = MultiJobMatcher()
-        matches = matcher.match_resume_to_jobs(
+        matcher = MultiJobMatcher(job_description_store, request.state.model_version)
+        match_fn = matcher.match_resume_to_jobs_dense if payload.scoring == "lsa" else matcher.match_resume_to_jobs
+        matches = match_fn(
             payload.resume_text,
             payload.job_descriptions,
             vectorizer,
@@ -427,6 +877,48 @@ def match_to_multiple_jobs(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing matches: {str(e)}")
 
+@router.post("/match/multi-job/stream")
+def match_to_multiple_jobs_stream(
+    request: Request,
+    payload: MultiJobMatchRequest,
+    vectorizer: TextVectorizer = Depends(get_vectorizer)
+):
+    """
+    Match a single resume against multiple job descriptions, streaming NDJSON.
+    Emits one "match" line per job in job order as it is scored, then a
+    "summary" line with the top K ranking (if top_k is set).
+    """
+    if payload.scoring != "tfidf":
+        raise HTTPException(status_code=400, detail="Only tfidf scoring can be streamed; use /match/multi-job for lsa")
+    
+    matcher = MultiJobMatcher(job_description_store, request.state.model_version)
+    matches = matcher.iter_matches(payload.resume_text, payload.job_descriptions, vectorizer)
+    
+    # Fail before streaming starts if the resume itself is unusable
+    try:
+        first = next(matches, None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def results():
+        top = TopKMatches(payload.top_k) if payload.top_k else None
+        scored = 0
+        
+        if first is not None:
+            for match in itertools.chain([first], matches):
+                scored += 1
+                if top:
+                    top.add(match)
+                yield {"type": "match", **match}
+        
+        summary = {"type": "summary", "total_jobs": len(payload.job_descriptions), "scored_jobs": scored}
+        if top:
+            summary["top_matches"] = top.ranked()
+        yield summary
+    
+    return StreamingResponse(_ndjson_stream(results()), media_type="application/x-ndjson")
+
+
 app = FastAPI()
 
 @app.get("/health", tags=["health"])
@@ -436,3 +928,152 @@ async def health_check():
         "service": "ai-resume-analyzer",
         "version": "0.1.0"
     }
+
+
+@router.post("/jobs/catalog", response_model=CatalogResponse, response_model_exclude_none=True)
+def add_catalog_jobs(
+    payload: CatalogAddRequest,
+    vectorizer: TextVectorizer = Depends(get_primary_vectorizer),
+    admin_token: str = Depends(verify_admin_token)
+):
+    """
+    Add (or replace) jobs in the ANN job catalog searched by /match/catalog.
+    Jobs are embedded with the published model's LSA stage (LSA_COMPONENTS > 0).
+    After a new model version is published, clear the catalog and re-index.
+    """
+    try:
+        indexed = job_catalog.add_jobs(
+            [(job.job_id, job.description) for job in payload.jobs],
+            vectorizer,
+            model_store.loaded_version
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return CatalogResponse(total_jobs=len(job_catalog), model_version=job_catalog.model_version, indexed=indexed)
+
+
+@router.delete("/jobs/catalog/{job_id}", response_model=CatalogResponse, response_model_exclude_none=True)
+def remove_catalog_job(job_id: int, admin_token: str = Depends(verify_admin_token)):
+    """Remove one job from the catalog"""
+    removed = job_catalog.remove_jobs([job_id])
+    if not removed:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} is not in the catalog")
+    return CatalogResponse(total_jobs=len(job_catalog), model_version=job_catalog.model_version, removed=removed)
+
+
+@router.delete("/jobs/catalog", response_model=CatalogResponse, response_model_exclude_none=True)
+def clear_catalog(admin_token: str = Depends(verify_admin_token)):
+    """Remove every job from the catalog (e.g. before re-indexing with a new model version)"""
+    removed = len(job_catalog)
+    job_catalog.clear()
+    return CatalogResponse(total_jobs=0, removed=removed)
+
+
+@router.post("/jobs/catalog/save", response_model=CatalogResponse, response_model_exclude_none=True)
+def save_catalog(admin_token: str = Depends(verify_admin_token)):
+    """Persist pending catalog changes to ANN_INDEX_DIR (every change is already saved as it is made)"""
+    job_catalog.save()
+    return CatalogResponse(total_jobs=len(job_catalog), model_version=job_catalog.model_version)
+
+
+@router.post("/match/catalog", response_model=CatalogMatchResponse)
+def match_catalog(
+    payload: CatalogMatchRequest,
+    vectorizer: TextVectorizer = Depends(get_primary_vectorizer)
+):
+    """
+    Rank catalog jobs for a resume without scoring the whole catalog.
+    LSH buckets on the LSA embedding select candidates, which are then
+    re-ranked by exact TF-IDF cosine (the /match score); "candidates"
+    reports how many jobs were scored.
+    """
+    try:
+        result = job_catalog.search(
+            payload.resume_text,
+            vectorizer,
+            model_store.loaded_version,
+            top_k=payload.top_k,
+            n_probes=payload.n_probes
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return CatalogMatchResponse(**result)
+
+
+@router.post("/jobs/catalog/shards", response_model=ShardStatusResponse)
+def build_catalog_shards(
+    n_shards: int = Query(settings.SHARD_COUNT, ge=1, le=64),
+    admin_token: str = Depends(verify_admin_token)
+):
+    """
+    Partition the job catalog's embeddings into n_shards memory-mapped shards
+    and (re)start one search process per shard. Run again after the catalog
+    changes; /match/catalog/sharded serves the last built shards.
+    """
+    ids, vectors, version = job_catalog.snapshot()
+    if ids.size == 0:
+        raise HTTPException(status_code=400, detail="Job catalog is empty")
+    
+    try:
+        shard_coordinator.rebuild(ids, vectors, n_shards, version)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return ShardStatusResponse(**shard_coordinator.status())
+
+
+@router.get("/jobs/catalog/shards", response_model=ShardStatusResponse)
+def catalog_shard_status(admin_token: str = Depends(verify_admin_token)):
+    """Shard sizes, liveness and restart counts"""
+    return ShardStatusResponse(**shard_coordinator.status())
+
+
+@router.post("/match/catalog/sharded", response_model=ShardedMatchResponse)
+def match_catalog_sharded(
+    payload: ShardedMatchRequest,
+    vectorizer: TextVectorizer = Depends(get_primary_vectorizer)
+):
+    """
+    Exact top-k over the whole catalog, scattered across shard processes.
+    Each shard scans its memory-mapped embeddings and returns its own top-k;
+    the results are merged with a heap and re-ranked by TF-IDF cosine (the
+    /match score; scoring="lsa" if the jobs' TF-IDF vectors are unavailable).
+    Shards that fail or time out are restarted in the background and listed
+    in failed_shards (the ranking then covers the rest).
+    """
+    status = shard_coordinator.status()
+    if not status["running"]:
+        raise HTTPException(status_code=503, detail="Shards are not running; build them via /jobs/catalog/shards")
+    if status["model_version"] != model_store.loaded_version:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Shards were built with model {status['model_version']}, current is {model_store.loaded_version}"
+        )
+    
+    try:
+        resume_vector, query = job_catalog.encode_resume(payload.resume_text, vectorizer)
+        result = shard_coordinator.search(query, payload.top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    ranked, scoring = result["matches"], "lsa"
+    job_ids = [job_id for job_id, _ in ranked]
+    scores = job_catalog.rescore(resume_vector, job_ids, vectorizer, model_store.loaded_version)
+    if scores is not None:
+        ranked = sorted(zip(job_ids, scores.tolist()), key=lambda item: (-item[1], item[0]))
+        scoring = "tfidf"
+    
+    return ShardedMatchResponse(
+        total_jobs=status["count"],
+        shards=result["shards"],
+        failed_shards=result["failed_shards"],
+        scoring=scoring,
+        matches=[
+            {"job_id": job_id, "match_score": round(max(score, 0.0), 3), "job_preview": job_catalog.preview(job_id)}
+            for job_id, score in ranked
+        ]
+    )
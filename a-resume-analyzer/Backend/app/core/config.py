@@ -1,6 +1,7 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 class Settings(BaseSettings):
     # App Info
@@ -10,6 +11,14 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: Optional[str] = "sqlite:///./resume_analyzer.db"
     
+    # SQLite connection profile, applied to every new connection (ignored for PostgreSQL)
+    SQLITE_TUNING: bool = True                    # False: driver defaults (rollback journal, synchronous=FULL)
+    SQLITE_JOURNAL_MODE: str = "WAL"              # WAL: readers and the writer do not block each other
+    SQLITE_SYNCHRONOUS: str = "NORMAL"            # NORMAL is durable against crashes in WAL mode; a power loss may drop the last commits
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000            # Wait this long for a lock before "database is locked"
+    SQLITE_MMAP_SIZE: int = 268435456             # Bytes of the file read through mmap (0 disables)
+    SQLITE_CACHE_SIZE: int = -65536               # Page cache; negative values are KiB (64 MiB per connection)
+    
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ADMIN_TOKEN: str = "dev-admin-token-change-in-production"
@@ -28,6 +37,86 @@ class Settings(BaseSettings):
     # Model paths
     VECTOR_PATH: Path = Path("app/ml/artifacts/vectorizer.joblib")
     META_PATH: Path = Path("app/ml/artifacts/vectorizer_meta.json")
+    VECTOR_DIR: Path = Path("app/ml/artifacts")
+    VECTOR_FORMAT: str = "joblib"  # "joblib" (pickled sklearn), "npy" (memory-mapped, pickle-free) or "hashing" (stateless)
+    
+    # Model versions (VECTOR_DIR/versions/<version> + "current" pointer)
+    MODEL_RELOAD_INTERVAL_SECONDS: float = 5.0    # How often workers check for a new version
+    MODEL_KEEP_VERSIONS: int = 3                  # Versions kept on disk, including the current one
+    MODEL_RETRAIN_TIMEOUT_SECONDS: int = 3600     # A "running" retrain older than this is considered dead
+    
+    # Model routing (resident versions via /admin/models)
+    MODEL_CANARY_VERSION: Optional[str] = None    # Version serving MODEL_CANARY_PERCENT of requests
+    MODEL_CANARY_PERCENT: float = 0.0
+    MODEL_SHADOW_VERSION: Optional[str] = None    # Version scoring matches in the background only
+    MODEL_SHADOW_MAX_PENDING: int = 100           # Pairs queued for shadow scoring before new ones are dropped
+    
+    # Vectorizer training (recorded in vectorizer_meta.json under "params")
+    VECTOR_DTYPE: str = "float64"                  # "float32" halves vector and index memory
+    VECTOR_MIN_DF: Union[int, float] = 1           # int = document count, float = proportion
+    VECTOR_MAX_DF: Union[int, float] = 1.0         # 1.0 = no limit; the int 1 would mean "in at most 1 document"
+    VECTOR_MAX_FEATURES: Optional[int] = None      # Keep only the most frequent terms
+    LSA_COMPONENTS: int = 0                        # Dense LSA embedding size (0 disables, e.g. 256)
+    
+    # Incremental IDF updates (/admin/retrain/incremental)
+    INCREMENTAL_MIN_DF: int = 2                   # Documents a new term needs before it joins the vocabulary
+    INCREMENTAL_MAX_PENDING: int = 100000         # Not-yet-admitted terms whose counts are kept
+    
+    # Bulk upload matching
+    BULK_MAX_FILES: int = 500
+    BULK_MAX_WORKERS: int = 4
+    
+    # Batch matching
+    BATCH_MAX_PAIRS: int = 1000           # Limit for synchronous /batch/match
+    BATCH_JOB_MAX_PAIRS: int = 50000      # Limit for queued /batch/jobs
+    BATCH_JOB_WORKERS: int = 2            # Background worker threads
+    BATCH_JOB_MAX_QUEUED: int = 20        # Jobs waiting in memory per process before /batch/jobs returns 503
+    BATCH_JOB_CHUNK_SIZE: int = 200       # Pairs processed and persisted per step
+    BATCH_DOC_CACHE_SIZE: int = 2048      # Processed resumes / jobs kept per batch for deduplication (LRU)
+    BATCH_MATRIX_MAX_CELLS: int = 1000000 # Max resumes x jobs for /batch/matrix
+    BATCH_MATRIX_CHUNK_SIZE: int = 256    # Resume rows per sparse matrix product
+    
+    # Job catalog ANN index (/jobs/catalog, /match/catalog; needs LSA_COMPONENTS > 0)
+    ANN_INDEX_DIR: Path = Path("app/ml/indexes/jobs")
+    ANN_TABLES: int = 8                   # More hash tables: higher recall, more candidates
+    ANN_BITS: int = 12                    # More bits per table: smaller buckets, lower latency
+    ANN_PROBES: int = 2                   # Buckets probed per table (1 = exact bucket only)
+    
+    # Sharded exact search over the job catalog (/match/catalog/sharded)
+    SHARD_DIR: Path = Path("app/ml/indexes/shards")
+    SHARD_COUNT: int = 4                  # Shard subprocesses created by /jobs/catalog/shards
+    SHARD_TIMEOUT_SECONDS: float = 2.0    # A shard slower than this is restarted
+    
+    # Skill taxonomy for matched/missing keywords on the non-LLM match path
+    SKILLS_TAXONOMY_PATH: Path = Path("app/ml/skills_taxonomy.json")
+    
+    # Near-duplicate resume detection (MinHash LSH, per worker process)
+    NEAR_DUP_ENABLED: bool = True
+    NEAR_DUP_REUSE_RESULTS: bool = True   # Serve a near-duplicate's earlier LLM result for the same job
+    NEAR_DUP_THRESHOLD: float = 0.9       # Estimated Jaccard similarity of 3-word shingles
+    NEAR_DUP_NUM_PERM: int = 128          # Signature length
+    NEAR_DUP_BANDS: int = 16              # LSH bands; NUM_PERM must be divisible by BANDS
+    NEAR_DUP_SHINGLE_SIZE: int = 3
+    NEAR_DUP_MAX_DOCS: int = 100000       # Most recent resumes kept (LRU)
+    
+    # Job description store (job_descriptions table): in-memory entries per worker
+    JOB_STORE_CACHE_SIZE: int = 10000
+    
+    # Write-behind match history (match_history table)
+    MATCH_HISTORY_ENABLED: bool = True
+    MATCH_HISTORY_BATCH_SIZE: int = 500            # Rows per bulk INSERT; a full batch triggers a flush
+    MATCH_HISTORY_FLUSH_SECONDS: float = 2.0       # Max time an event waits in memory
+    MATCH_HISTORY_MAX_BUFFER: int = 10000          # Buffered events before new ones spill to disk
+    MATCH_HISTORY_SPILL_DIR: Optional[Path] = Path("data/match_history_spill")  # None: drop instead of spilling
+    
+    @field_validator("VECTOR_MIN_DF", "VECTOR_MAX_DF", mode="before")
+    @classmethod
+    def _document_frequency(cls, value):
+        """Keep the type as written: "1.0" is a proportion (float), "1" a document count (int)"""
+        if isinstance(value, str):
+            value = value.strip()
+            return float(value) if any(c in value for c in ".eE") else int(value)
+        return value
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,10 +1,14 @@
-from sqlalchemy import create_engine, Column, String, Integer, Boolean, DateTime, Float, Text, ForeignKey, Index
+from sqlalchemy import create_engine, event, Column, String, Integer, Boolean, DateTime, Float, Text, LargeBinary, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from datetime import datetime
+from typing import Dict, Union
 import os
 from dotenv import load_dotenv
 
+from app.Backend.app.core.config import settings
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -19,6 +23,50 @@ DATABASE_URL = os.getenv(
 
 print(f"📊 Using database: {DATABASE_URL.split('://')[0].upper()}")
 
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def sqlite_pragmas() -> Dict[str, Union[str, int]]:
+    """
+    PRAGMAs of the SQLite profile in Settings (empty when SQLITE_TUNING is off).
+
+    Raises:
+        ValueError: If the journal mode or synchronous level is not a valid SQLite value
+    """
+    if not settings.SQLITE_TUNING:
+        return {}
+    journal_mode = settings.SQLITE_JOURNAL_MODE.upper()
+    synchronous = settings.SQLITE_SYNCHRONOUS.upper()
+    if journal_mode not in _JOURNAL_MODES:
+        raise ValueError(f"SQLITE_JOURNAL_MODE must be one of {sorted(_JOURNAL_MODES)}, got {journal_mode}")
+    if synchronous not in _SYNCHRONOUS:
+        raise ValueError(f"SQLITE_SYNCHRONOUS must be one of {sorted(_SYNCHRONOUS)}, got {synchronous}")
+    # busy_timeout first, so switching the journal mode waits for other connections' locks
+    return {
+        "busy_timeout": int(settings.SQLITE_BUSY_TIMEOUT_MS),
+        "journal_mode": journal_mode,
+        "synchronous": synchronous,
+        "cache_size": int(settings.SQLITE_CACHE_SIZE),
+        "mmap_size": int(settings.SQLITE_MMAP_SIZE),
+    }
+
+
+def apply_sqlite_pragmas(sync_engine, pragmas: Dict[str, Union[str, int]]):
+    """Run the PRAGMAs on every new DBAPI connection of an SQLite engine (async engines: pass .sync_engine)"""
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
 # Create engine with appropriate settings
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
@@ -26,6 +74,7 @@ if DATABASE_URL.startswith("sqlite"):
         connect_args={"check_same_thread": False},
         echo=os.getenv("SQL_ECHO", "False").lower() == "true"
     )
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
 else:  # PostgreSQL
     engine = create_engine(
         DATABASE_URL,
@@ -40,6 +89,44 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def _async_url(url: str) -> str:
+    """Same database through an async driver: aiosqlite for SQLite, asyncpg for PostgreSQL"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgres"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+
+# Async engine for async def routes (auth, resume, admin); the sync engine above
+# stays for sync routes and background threads. Override the URL with
+# ASYNC_DATABASE_URL (e.g. when psycopg2-only query parameters such as
+# sslmode need asyncpg equivalents).
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+
+try:
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=os.getenv("SQL_ECHO", "False").lower() == "true"
+        )
+        apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+    else:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=os.getenv("SQL_ECHO", "False").lower() == "true",
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            pool_size=10,
+            max_overflow=20
+        )
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+except ImportError as e:
+    print(f"⚠️  Async database driver not available ({e}); install aiosqlite / asyncpg and greenlet")
+    async_engine = None
+    AsyncSessionLocal = None
+
+
 class User(Base):
     """User account table with email and authentication"""
     __tablename__ = "users"
@@ -98,6 +185,7 @@ class ResumeBuild(Base):
     
     # Relationships
     user = relationship("User", back_populates="resumes")
+    vector = relationship("ResumeVector", back_populates="resume", uselist=False, cascade="all, delete-orphan")
     
     # Indexes
     __table_args__ = (
@@ -108,12 +196,66 @@ class ResumeBuild(Base):
         return f"<ResumeBuild(id={self.id}, user_id={self.user_id}, template='{self.template_name}')>"
 
 
+class ResumeVector(Base):
+    """Preprocessed text and sparse TF-IDF vector of a ResumeBuild, for matching by resume id"""
+    __tablename__ = "resume_vectors"
+
+    resume_id = Column(Integer, ForeignKey('resume_builds.id', ondelete='CASCADE'), primary_key=True)
+    processed_text = Column(Text, nullable=False)  # process_text output (independent of the model)
+    token_count = Column(Integer, nullable=False)
+    model_version = Column(String(64), nullable=True)  # Version the vector was computed with
+    n_features = Column(Integer, nullable=False)
+    indices = Column(LargeBinary, nullable=False)  # int32 column indices of the non-zeros
+    weights = Column(LargeBinary, nullable=False)  # float64 values of the non-zeros
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    resume = relationship("ResumeBuild", back_populates="vector")
+    
+    def __repr__(self):
+        return f"<ResumeVector(resume_id={self.resume_id}, version='{self.model_version}', nnz={len(self.indices) // 4})>"
+
+
+class JobDescription(Base):
+    """Job description text, content-addressed by the SHA256 of the submitted text"""
+    __tablename__ = "job_descriptions"
+
+    text_hash = Column(String(64), primary_key=True)  # Same hash as MatchHistory.job_description_hash
+    normalized_text = Column(Text, nullable=False)  # process_text output ("" if nothing meaningful)
+    token_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    vectors = relationship("JobDescriptionVector", back_populates="job", cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<JobDescription(hash='{self.text_hash[:12]}', tokens={self.token_count})>"
+
+
+class JobDescriptionVector(Base):
+    """Sparse vector of a job description under one model version"""
+    __tablename__ = "job_description_vectors"
+
+    text_hash = Column(String(64), ForeignKey('job_descriptions.text_hash', ondelete='CASCADE'), primary_key=True)
+    model_version = Column(String(64), primary_key=True)
+    n_features = Column(Integer, nullable=False)
+    indices = Column(LargeBinary, nullable=False)  # int32 column indices of the non-zeros
+    weights = Column(LargeBinary, nullable=False)  # float64 values of the non-zeros
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    job = relationship("JobDescription", back_populates="vectors")
+    
+    def __repr__(self):
+        return f"<JobDescriptionVector(hash='{self.text_hash[:12]}', version='{self.model_version}')>"
+
+
 class MatchHistory(Base):
     """History of resume-job matching operations"""
     __tablename__ = "match_history"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=True, index=True)  # NULL for anonymous /match calls
     resume_id = Column(Integer, ForeignKey('resume_builds.id', ondelete='SET NULL'), nullable=True)
     job_description_hash = Column(String(64), nullable=False)  # SHA256 hash of job description
     match_score = Column(Float, nullable=False)  # Match score (0.0 to 1.0)
@@ -133,6 +275,55 @@ class MatchHistory(Base):
         return f"<MatchHistory(id={self.id}, user_id={self.user_id}, score={self.match_score})>"
 
 
+class BatchJob(Base):
+    """Asynchronous batch matching job submitted via /batch/jobs"""
+    __tablename__ = "batch_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    status = Column(String(20), default="queued", nullable=False, index=True)  # queued, running, cancelling, completed, cancelled, failed
+    total = Column(Integer, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    successful = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    owner = Column(String(255), nullable=True)  # "<host>:<pid>" of the server process holding the inputs
+    dedup = Column(Text, nullable=True)  # JSON resume/job dedup stats, updated per chunk
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    results = relationship("BatchJobResult", back_populates="job", cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<BatchJob(id='{self.id}', status='{self.status}', processed={self.processed}/{self.total})>"
+
+
+class BatchJobResult(Base):
+    """Per-pair result of a batch job, persisted as each chunk completes"""
+    __tablename__ = "batch_job_results"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String(32), ForeignKey('batch_jobs.id', ondelete='CASCADE'), nullable=False)
+    item_index = Column(Integer, nullable=False)  # Index of the pair in the submitted batch
+    success = Column(Boolean, nullable=False)
+    match_score = Column(Float, nullable=False)
+    resume_tokens = Column(Integer, nullable=True)
+    job_tokens = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    # Relationships
+    job = relationship("BatchJob", back_populates="results")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_batch_result_job_index', 'job_id', 'item_index', unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<BatchJobResult(job_id='{self.job_id}', index={self.item_index}, score={self.match_score})>"
+
+
 # Database initialization function
 def init_database():
     """Initialize database tables"""
@@ -155,3 +346,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async database session dependency"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database engine is not available; install aiosqlite / asyncpg and greenlet")
+    async with AsyncSessionLocal() as db:
+        yield db
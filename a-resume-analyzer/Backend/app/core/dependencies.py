@@ -1,10 +1,13 @@
 # app/core/dependencies.py
 from pathlib import Path
-from fastapi import HTTPException, Header
+from fastapi import HTTPException, Header, Request, Response
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.Backend.app.core.config import settings
 from app.Backend.app.core.database import SessionLocal
+from app.Backend.app.services.model_store import model_store
+from app.Backend.app.services.model_registry import model_registry
+from app.Backend.app.services.resume_index import resume_index
 
 # Global vectorizer instance - loaded on startup
 _vectorizer = None
@@ -14,8 +17,13 @@ def set_vectorizer(vectorizer):
     global _vectorizer
     _vectorizer = vectorizer
 
-def get_vectorizer():
-    """Dependency to get the loaded vectorizer"""
+def get_primary_vectorizer():
+    """Get the published vectorizer (switches to a newly published model version)"""
+    global _vectorizer
+    reloaded = model_store.refresh()
+    if reloaded is not None:
+        _vectorizer = reloaded
+        resume_index.warm(reloaded, model_store.loaded_version)
     if _vectorizer is None:
         raise HTTPException(
             status_code=503, 
@@ -23,6 +31,22 @@ def get_vectorizer():
         )
     return _vectorizer
 
+def get_vectorizer(request: Request, response: Response, x_model_version: Optional[str] = Header(None)):
+    """
+    Dependency to get the vectorizer for this request: the version named in
+    the X-Model-Version header, a canary by percentage, or the published one.
+    The chosen version is echoed in the X-Model-Version response header.
+    """
+    primary = get_primary_vectorizer()
+    model_registry.refresh()
+    try:
+        version, vectorizer = model_registry.select(x_model_version, model_store.loaded_version, primary)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Model version {x_model_version} is not loaded")
+    request.state.model_version = version
+    response.headers["X-Model-Version"] = version
+    return vectorizer
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
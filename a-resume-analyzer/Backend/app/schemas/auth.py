@@ -125,3 +125,20 @@ class JobMatchResponse(BaseModel):
     missing_skills: List[str]
     matched_skills: List[str]
     suggestions: List[str]
+    resume_id: Optional[int] = None
+    processed_resume_tokens: Optional[int] = None
+    processed_job_tokens: Optional[int] = None
+    model_version: Optional[str] = None
+    vector_reused: bool = False  # Stored resume vector used without recomputing
+
+
+class ResumeSearchRequest(BaseModel):
+    job_description: str = Field(..., min_length=10)
+    top_k: int = Field(10, ge=1, le=500)
+
+
+class ResumeSearchResponse(BaseModel):
+    total_resumes: int
+    candidates: int
+    model_version: Optional[str] = None
+    matches: List[dict]
@@ -0,0 +1,525 @@
+# app/services/ann_index.py
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import logging
+import shutil
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.preprocessing import process_text
+from app.Backend.app.services.matcher import compute_similarities
+from app.Backend.app.services.job_descriptions import job_description_store, job_hash
+from app.Backend.app.services.model_store import write_atomic, file_lock
+
+logger = logging.getLogger(__name__)
+
+PLANES_FILE = "lsh_planes.npy"
+VECTORS_FILE = "lsh_vectors.npy"
+IDS_FILE = "lsh_ids.npy"
+INDEX_META_FILE = "lsh_meta.json"
+PREVIEWS_FILE = "job_previews.json"
+HASHES_FILE = "job_hashes.json"
+CURRENT_FILE = "current"            # Pointer file naming the saved catalog generation
+GENERATIONS_DIR = "generations"
+LOCK_FILE = "catalog.lock"
+KEEP_GENERATIONS = 2                # Older generations are deleted after a save
+
+
+class LshIndex:
+    """
+    Random-projection (SimHash) LSH index over L2-normalized dense embeddings.
+
+    Each of n_tables hash tables maps a vector to an n_bits code (signs of
+    its projections on random hyperplanes); vectors with small angles share
+    codes with high probability. A query probes its own bucket plus the
+    buckets reached by flipping its n_probes - 1 least certain bits in each
+    table. More tables / probes raise recall, more bits shrink buckets and
+    lower latency.
+
+    Inserts and deletes are incremental (rows are tombstoned and compacted
+    on save). Vectors and hyperplanes persist as .npy; buckets are rebuilt
+    from them on load.
+    """
+
+    def __init__(self, dim: int, n_tables: int = 8, n_bits: int = 12, n_probes: int = 1, seed: int = 42,
+                 planes: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+        self.seed = seed
+        if planes is None:
+            planes = np.random.default_rng(seed).standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self.planes = planes
+        self._weights = (1 << np.arange(n_bits)).astype(np.int64)
+
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._row_of: Dict[int, int] = {}
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(n_tables)]
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        """Hyperplane margins, (n, n_tables, n_bits)"""
+        return (vectors @ self.planes.T).reshape(len(vectors), self.n_tables, self.n_bits)
+
+    def _codes(self, margins: np.ndarray) -> np.ndarray:
+        """Bucket code per table, (n, n_tables)"""
+        return (margins > 0).astype(np.int64) @ self._weights
+
+    def _reserve(self, extra: int):
+        capacity = self._vectors.shape[0]
+        if self._size + extra <= capacity:
+            return
+        new_capacity = max(self._size + extra, capacity * 2, 1024)
+        for name, fill in (("_vectors", 0.0), ("_ids", 0), ("_alive", False)):
+            old = getattr(self, name)
+            grown = np.full((new_capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def insert(self, ids: Iterable[int], vectors: np.ndarray):
+        """Add (or replace) vectors under integer ids"""
+        ids = [int(i) for i in ids]
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        self.delete(ids)
+
+        self._reserve(len(ids))
+        start = self._size
+        rows = range(start, start + len(ids))
+        self._vectors[start:start + len(ids)] = vectors
+        self._ids[start:start + len(ids)] = ids
+        self._alive[start:start + len(ids)] = True
+        self._size += len(ids)
+
+        codes = self._codes(self._project(vectors))
+        for row, item_id, row_codes in zip(rows, ids, codes.tolist()):
+            self._row_of[item_id] = row
+            for table, code in zip(self._tables, row_codes):
+                table.setdefault(code, []).append(row)
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """Remove ids; returns how many were present"""
+        removed = 0
+        for item_id in ids:
+            row = self._row_of.pop(int(item_id), None)
+            if row is None:
+                continue
+            codes = self._codes(self._project(self._vectors[row:row + 1]))[0]
+            for table, code in zip(self._tables, codes.tolist()):
+                bucket = table.get(code)
+                if bucket is not None:
+                    bucket.remove(row)
+                    if not bucket:
+                        del table[code]
+            self._alive[row] = False
+            removed += 1
+        return removed
+
+    def candidates(self, query: np.ndarray, n_probes: Optional[int] = None) -> np.ndarray:
+        """Rows sharing a probed bucket with the query in any table"""
+        n_probes = n_probes or self.n_probes
+        margins = self._project(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+        base = self._codes(margins[None])[0]
+
+        rows = set()
+        for t, table in enumerate(self._tables):
+            codes = [int(base[t])]
+            # Multi-probe: flip the bits whose hyperplane the query is closest to
+            for bit in np.argsort(np.abs(margins[t]))[:max(0, n_probes - 1)]:
+                codes.append(int(base[t]) ^ (1 << int(bit)))
+            for code in codes:
+                rows.update(table.get(code, ()))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    def items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, vectors) of all live rows"""
+        live = np.flatnonzero(self._alive[:self._size])
+        return self._ids[live], self._vectors[live]
+
+    def vectors_of(self, rows: np.ndarray) -> np.ndarray:
+        return self._vectors[rows]
+
+    def ids_of(self, rows: np.ndarray) -> np.ndarray:
+        return self._ids[rows]
+
+    def search(self, query: np.ndarray, top_k: int, n_probes: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k by inner product among candidates.
+
+        Returns:
+            (ids, scores), best first
+        """
+        rows = self.candidates(query, n_probes)
+        if rows.size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = self._vectors[rows] @ np.asarray(query, dtype=np.float32).reshape(self.dim)
+        k = min(top_k, rows.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return self._ids[rows[top]], scores[top]
+
+    def save(self, index_dir: Path, extra_meta: Optional[Dict[str, Any]] = None):
+        """Write live vectors (compacted), ids, hyperplanes and parameters"""
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        ids, vectors = self.items()
+        np.save(index_dir / PLANES_FILE, self.planes)
+        np.save(index_dir / VECTORS_FILE, vectors)
+        np.save(index_dir / IDS_FILE, ids)
+        meta = {
+            "dim": self.dim,
+            "n_tables": self.n_tables,
+            "n_bits": self.n_bits,
+            "n_probes": self.n_probes,
+            "seed": self.seed,
+            "count": int(ids.size),
+            **(extra_meta or {}),
+        }
+        (index_dir / INDEX_META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Tuple["LshIndex", Dict[str, Any]]:
+        """Load a saved index and rebuild its buckets; returns (index, meta)"""
+        index_dir = Path(index_dir)
+        meta = json.loads((index_dir / INDEX_META_FILE).read_text(encoding="utf-8"))
+        index = cls(
+            meta["dim"], meta["n_tables"], meta["n_bits"], meta["n_probes"], meta["seed"],
+            planes=np.load(index_dir / PLANES_FILE, allow_pickle=False)
+        )
+        index.insert(
+            np.load(index_dir / IDS_FILE, allow_pickle=False).tolist(),
+            np.load(index_dir / VECTORS_FILE, allow_pickle=False)
+        )
+        return index, meta
+
+
+class JobCatalog:
+    """
+    Persistent catalog of job postings searchable by approximate nearest neighbours.
+
+    Jobs are embedded with the model's LSA stage and stored in an LshIndex.
+    A search collects LSH candidates and re-ranks only those (not the whole
+    catalog) by exact TF-IDF cosine, the score /match and /match/multi-job
+    report. The TF-IDF vectors come from the job store (job_descriptions),
+    keyed by the text hash kept per job. Without a job store, or for jobs
+    indexed before hashes were kept, candidates are ranked by their LSA
+    similarity instead and the result says scoring="lsa". The index is tied
+    to the model version it was built with; after a retrain it must be rebuilt.
+
+    Every change is saved as a new generation directory under
+    index_dir/generations/ and published by replacing the "current" pointer,
+    like the model store. Changes are applied to the latest saved generation
+    under a cross-process file lock, so workers do not overwrite each other,
+    and every process reloads the catalog when the pointer moves (checked at
+    most once per `reload_interval` seconds).
+    """
+
+    def __init__(self, index_dir: Path, n_tables: int = 8, n_bits: int = 12, n_probes: int = 2, job_store=None,
+                 reload_interval: float = 5.0):
+        self.index_dir = Path(index_dir)
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+        self.job_store = job_store
+        self.reload_interval = reload_interval
+        self.index: Optional[LshIndex] = None
+        self.model_version: Optional[str] = None
+        self.previews: Dict[int, str] = {}
+        self.text_hashes: Dict[int, str] = {}
+        self.generation: Optional[str] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._next_check = 0.0
+
+    def __len__(self) -> int:
+        return len(self.index) if self.index is not None else 0
+
+    @staticmethod
+    def _embedder(vectorizer):
+        if getattr(vectorizer, "lsa", None) is None:
+            raise ValueError("Model has no LSA embeddings; set LSA_COMPONENTS and retrain")
+        return vectorizer.lsa
+
+    def add_jobs(self, jobs: List[Tuple[int, str]], vectorizer, model_version: Optional[str]) -> int:
+        """
+        Embed and insert (job_id, description) pairs; existing ids are replaced.
+        Jobs with no meaningful content are skipped.
+
+        Returns:
+            Number of jobs indexed
+
+        Raises:
+            ValueError: If the model has no LSA stage or differs from the index's model
+        """
+        lsa = self._embedder(vectorizer)
+        if self.job_store is not None:
+            # Stores the TF-IDF vectors the search re-ranks with
+            stored = self.job_store.get_many([text for _, text in jobs], vectorizer, model_version)
+            cleaned = [(job_id, text, job.vector) for (job_id, text), job in zip(jobs, stored) if job.vector is not None]
+            if not cleaned:
+                return 0
+            tfidf = sp.vstack([vec for _, _, vec in cleaned], format="csr")
+        else:
+            cleaned = [(job_id, text, process_text(text)) for job_id, text in jobs]
+            cleaned = [item for item in cleaned if item[2]]
+            if not cleaned:
+                return 0
+            tfidf = vectorizer.transform([clean for _, _, clean in cleaned])
+        embeddings = lsa.embed(tfidf)
+
+        with self._update():
+            if self.index is not None and len(self.index) and self.model_version != model_version:
+                raise ValueError(
+                    f"Catalog was built with model {self.model_version}; clear it before indexing with {model_version}"
+                )
+            if self.index is None or self.index.dim != lsa.n_components:
+                self.index = LshIndex(lsa.n_components, self.n_tables, self.n_bits, self.n_probes)
+                self.previews = {}
+                self.text_hashes = {}
+            self.model_version = model_version
+            self.index.insert([job_id for job_id, _, _ in cleaned], embeddings)
+            for job_id, text, _ in cleaned:
+                self.previews[job_id] = text[:100] + "..." if len(text) > 100 else text
+                self.text_hashes[job_id] = job_hash(text)
+            self._dirty = True
+        return len(cleaned)
+
+    def remove_jobs(self, job_ids: List[int]) -> int:
+        with self._update():
+            if self.index is None:
+                return 0
+            removed = self.index.delete(job_ids)
+            for job_id in job_ids:
+                self.previews.pop(job_id, None)
+                self.text_hashes.pop(job_id, None)
+            self._dirty = self._dirty or removed > 0
+            return removed
+
+    def clear(self):
+        with self._update():
+            self.index = None
+            self.previews = {}
+            self.text_hashes = {}
+            self.model_version = None
+            self._dirty = True
+
+    def embed_resume(self, resume: str, vectorizer) -> np.ndarray:
+        """
+        LSA embedding of a resume, (1, n_components).
+
+        Raises:
+            ValueError: If the resume is empty or the model has no LSA stage
+        """
+        return self.encode_resume(resume, vectorizer)[1]
+
+    def encode_resume(self, resume: str, vectorizer) -> Tuple[Any, np.ndarray]:
+        """
+        (TF-IDF vector, LSA embedding) of a resume.
+
+        Raises:
+            ValueError: If the resume is empty or the model has no LSA stage
+        """
+        lsa = self._embedder(vectorizer)
+        resume_clean = process_text(resume)
+        if not resume_clean:
+            raise ValueError("Resume has no meaningful content")
+        resume_vector = vectorizer.transform([resume_clean])
+        return resume_vector, lsa.embed(resume_vector)
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, Optional[str]]:
+        """(ids, vectors, model_version) of every indexed job"""
+        self.refresh()
+        with self._lock:
+            if self.index is None:
+                return np.zeros(0, dtype=np.int64), np.zeros((0, 0), dtype=np.float32), self.model_version
+            ids, vectors = self.index.items()
+            return ids.copy(), vectors.copy(), self.model_version
+
+    def preview(self, job_id: int) -> Optional[str]:
+        return self.previews.get(job_id)
+
+    def rescore(self, resume_vector, job_ids: List[int], vectorizer,
+                model_version: Optional[str]) -> Optional[np.ndarray]:
+        """Exact TF-IDF cosine of a resume vector with catalog jobs; None if any job's vector is unavailable"""
+        with self._lock:
+            hashes = [self.text_hashes.get(int(i)) for i in job_ids]
+        return self._tfidf_scores(resume_vector, hashes, vectorizer, model_version)
+
+    def _tfidf_scores(self, resume_vector, hashes: List[Optional[str]], vectorizer,
+                      model_version: Optional[str]) -> Optional[np.ndarray]:
+        if self.job_store is None or not hashes or not all(hashes):
+            return None
+        stored = self.job_store.get_by_hash(hashes, vectorizer, model_version)
+        if not all(h in stored and stored[h].vector is not None for h in hashes):
+            return None
+        job_vectors = sp.vstack([stored[h].vector for h in hashes], format="csr")
+        return compute_similarities(resume_vector, job_vectors)
+
+    def search(self, resume: str, vectorizer, model_version: Optional[str], top_k: int = 10,
+               n_probes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Rank catalog jobs for a resume: LSH candidates, then an exact TF-IDF
+        re-rank of the candidates (LSA similarity if their TF-IDF vectors are
+        not available; see "scoring").
+
+        Raises:
+            ValueError: If the resume is empty, the model has no LSA stage or
+                does not match the model the catalog was built with
+        """
+        resume_vector, query = self.encode_resume(resume, vectorizer)
+        self.refresh()
+
+        with self._lock:
+            if self.index is None or not len(self.index):
+                return {"total_jobs": 0, "candidates": 0, "scoring": "tfidf", "matches": []}
+            if self.model_version != model_version:
+                raise ValueError(f"Catalog was built with model {self.model_version}, request uses {model_version}")
+
+            rows = self.index.candidates(query[0], n_probes)
+            vectors = self.index.vectors_of(rows)
+            ids = self.index.ids_of(rows)
+            total = len(self.index)
+            previews = {int(i): self.previews.get(int(i)) for i in ids}
+            hashes = [self.text_hashes.get(int(i)) for i in ids]
+
+        scores = self._tfidf_scores(resume_vector, hashes, vectorizer, model_version)
+        scoring = "tfidf"
+        if scores is None:
+            scoring = "lsa"
+            if ids.size:
+                logger.warning("Catalog candidates ranked by LSA similarity; re-index the jobs for TF-IDF scores")
+            scores = compute_similarities(query, vectors, normalized=True)
+
+        scored = sorted(zip(scores.tolist(), ids.tolist()), key=lambda item: (-item[0], item[1]))
+        matches = [
+            {"job_id": job_id, "match_score": max(score, 0.0), "job_preview": previews[job_id]}
+            for score, job_id in scored[:top_k]
+        ]
+        return {"total_jobs": total, "candidates": int(rows.size), "scoring": scoring, "matches": matches}
+
+    def save(self):
+        """Save pending changes (changes are saved as they are made; no-op if unchanged)"""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, file_lock(self.index_dir / LOCK_FILE):
+            self._save_locked()
+
+    def load(self):
+        """Load the saved catalog (or the legacy flat layout) if one exists"""
+        self._next_check = 0.0
+        self.refresh()
+        if self.generation is None and (self.index_dir / INDEX_META_FILE).exists():
+            data = self._read(self.index_dir)
+            with self._lock:
+                self._install(None, data)
+
+    def refresh(self):
+        """
+        Load the catalog another process saved if the pointer moved since the last check.
+        Cheap to call per request: the pointer is read at most once per interval.
+        """
+        if time.monotonic() < self._next_check:
+            return
+        now = time.monotonic()
+        self._next_check = now + self.reload_interval
+
+        generation = self._current_generation()
+        if generation is None or generation == self.generation:
+            return
+        try:
+            data = self._read(self._generation_dir(generation))
+        except Exception as e:
+            logger.error(f"Failed to load job catalog generation {generation}: {e}")
+            return
+        with self._lock:
+            self._install(generation, data)
+
+    @contextmanager
+    def _update(self):
+        """Apply a change to the latest saved catalog and save it, holding the thread and file locks"""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, file_lock(self.index_dir / LOCK_FILE):
+            generation = self._current_generation()
+            if generation is not None and generation != self.generation:
+                self._install(generation, self._read(self._generation_dir(generation)))
+            yield
+            self._save_locked()
+
+    def _current_generation(self) -> Optional[str]:
+        try:
+            return (self.index_dir / CURRENT_FILE).read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _generation_dir(self, generation: str) -> Path:
+        return self.index_dir / GENERATIONS_DIR / generation
+
+    @staticmethod
+    def _read(directory: Path) -> Optional[Tuple[LshIndex, Optional[str], Dict[int, str], Dict[int, str]]]:
+        """(index, model_version, previews, text hashes) saved in directory; None for an empty catalog"""
+        if not (directory / INDEX_META_FILE).exists():
+            return None
+        index, meta = LshIndex.load(directory)
+        previews = json.loads((directory / PREVIEWS_FILE).read_text(encoding="utf-8"))
+        hashes_path = directory / HASHES_FILE
+        hashes = json.loads(hashes_path.read_text(encoding="utf-8")) if hashes_path.exists() else {}
+        return (
+            index,
+            meta.get("model_version"),
+            {int(k): v for k, v in previews.items()},
+            {int(k): v for k, v in hashes.items()},
+        )
+
+    def _install(self, generation: Optional[str], data):
+        """Replace the in-memory catalog with data from _read (callers hold the lock)"""
+        if data is None:
+            self.index, self.model_version, self.previews, self.text_hashes = None, None, {}, {}
+        else:
+            self.index, self.model_version, self.previews, self.text_hashes = data
+        self.generation = generation
+        self._dirty = False
+        logger.info(f"Loaded job catalog with {len(self)} jobs (model {self.model_version})")
+
+    def _save_locked(self):
+        """Write a new generation and move the pointer to it (callers hold both locks)"""
+        if not self._dirty:
+            return
+        generation = f"g{time.time_ns()}"
+        target = self._generation_dir(generation)
+        target.mkdir(parents=True)
+        if self.index is not None:
+            self.index.save(target, {"model_version": self.model_version})
+            previews = {str(k): v for k, v in self.previews.items()}
+            (target / PREVIEWS_FILE).write_text(json.dumps(previews), encoding="utf-8")
+            hashes = {str(k): v for k, v in self.text_hashes.items()}
+            (target / HASHES_FILE).write_text(json.dumps(hashes), encoding="utf-8")
+        write_atomic(self.index_dir / CURRENT_FILE, generation)
+        self.generation = generation
+        self._dirty = False
+        logger.info(f"Saved job catalog ({len(self)} jobs) as {generation}")
+
+        # Keep the previous generation for processes still reading it
+        generations = sorted(p for p in (self.index_dir / GENERATIONS_DIR).iterdir() if p.is_dir())
+        for old in generations[:-KEEP_GENERATIONS]:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+# Global job catalog - loaded and saved in the application lifespan
+job_catalog = JobCatalog(
+    settings.ANN_INDEX_DIR,
+    n_tables=settings.ANN_TABLES,
+    n_bits=settings.ANN_BITS,
+    n_probes=settings.ANN_PROBES,
+    job_store=job_description_store,
+    reload_interval=settings.MODEL_RELOAD_INTERVAL_SECONDS
+)
@@ -1,28 +1,128 @@
 # app/services/batch_processor.py
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+import base64
+import hashlib
+import heapq
 import logging
+import threading
 from datetime import datetime
 
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
 from app.Backend.app.services.preprocessing import process_text
-from app.Backend.app.services.matcher import compute_similarity
+from app.Backend.app.services.matcher import compute_similarities
+from app.Backend.app.services.embeddings import DenseIndex
 
 logger = logging.getLogger(__name__)
 
 
+class DocumentCache:
+    """
+    Per-batch cache of preprocessed text and vectors, keyed by content hash.
+    Each document is processed once while it is cached; concurrent requests
+    for a document already being processed wait for that result. At most
+    `max_entries` completed documents are kept (LRU), so memory does not
+    grow with the batch; an evicted document is processed again if it
+    reappears. With a job_store (JobDescriptionStore), documents are read
+    from / saved to it instead of being preprocessed and vectorized here.
+    """
+    
+    def __init__(self, vectorizer, max_entries: int = 2048, job_store=None, model_version: Optional[str] = None):
+        self.vectorizer = vectorizer
+        self.max_entries = max_entries
+        self.job_store = job_store
+        self.model_version = model_version
+        self.requests = 0
+        self._processed = 0
+        self._entries: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, text: str) -> Tuple[str, Any]:
+        """Return (clean_text, vector) for text; vector is None if clean_text is empty"""
+        key = hashlib.sha256(text.encode()).hexdigest()
+        with self._lock:
+            self.requests += 1
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+                self._processed += 1
+                self._evict()
+            else:
+                self._entries.move_to_end(key)
+        
+        if owner:
+            try:
+                if self.job_store is not None:
+                    job = self.job_store.get(text, self.vectorizer, self.model_version)
+                    clean, vec = job.clean_text, job.vector
+                else:
+                    clean = process_text(text)
+                    vec = self.vectorizer.transform([clean]) if clean else None
+                future.set_result((clean, vec))
+            except Exception as e:
+                future.set_exception(e)
+        
+        return future.result()
+    
+    def _evict(self):
+        """Drop the least recently used completed entries (callers hold the lock)"""
+        while len(self._entries) > self.max_entries:
+            for key, future in self._entries.items():
+                if future.done():
+                    del self._entries[key]
+                    break
+            else:
+                return  # Only in-progress entries left; their waiters need them
+    
+    @property
+    def unique(self) -> int:
+        """Documents processed (equals the unique count unless entries were evicted)"""
+        return self._processed
+    
+    def stats(self) -> Dict[str, Any]:
+        """Unique count and dedup ratio (share of requests served from cache)"""
+        return {
+            "total": self.requests,
+            "unique": self.unique,
+            "dedup_ratio": round(1 - self.unique / self.requests, 4) if self.requests else 0.0
+        }
+
+
 class BatchProcessor:
     """
     Process multiple resume-job pairs in parallel.
+    Repeated resumes and job descriptions within a batch are processed once.
+    With a job_store (JobDescriptionStore), job texts and vectors come from /
+    are saved to it, like MultiJobMatcher.
     """
     
-    def __init__(self, max_workers: int = 4):
+    def __init__(self, max_workers: int = 4, cache_size: int = 2048, job_store=None,
+                 model_version: Optional[str] = None):
         self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.job_store = job_store
+        self.model_version = model_version
+        self.dedup_stats: Optional[Dict[str, Any]] = None
+    
+    def new_caches(self, vectorizer) -> Tuple[DocumentCache, DocumentCache]:
+        """Empty (resume, job) document caches, for sharing across several batches"""
+        return (
+            DocumentCache(vectorizer, self.cache_size),
+            DocumentCache(vectorizer, self.cache_size, job_store=self.job_store, model_version=self.model_version)
+        )
     
     def process_batch(
         self,
         resumes: List[str],
         job_descriptions: List[str],
-        vectorizer
+        vectorizer,
+        caches: Optional[Tuple[DocumentCache, DocumentCache]] = None
     ) -> List[Dict[str, Any]]:
         """
         Process multiple resume-job pairs in parallel.
@@ -31,66 +131,251 @@ class BatchProcessor:
             resumes: List of resume texts
             job_descriptions: List of job description texts (one per resume)
             vectorizer: Pre-trained vectorizer
+            caches: (resume, job) caches from new_caches() to dedup across calls
             
         Returns:
-            List of match results with scores and metadata
+            List of match results with scores and metadata, in input order
+        """
+        start_time = datetime.now()
+        
+        results = list(self.iter_batch(resumes, job_descriptions, vectorizer, ordered=True, caches=caches))
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Processed {len(results)} pairs in {elapsed:.2f}s")
+        
+        return results
+    
+    def iter_batch(
+        self,
+        resumes: List[str],
+        job_descriptions: List[str],
+        vectorizer,
+        ordered: bool = False,
+        window: Optional[int] = None,
+        caches: Optional[Tuple[DocumentCache, DocumentCache]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield match results as soon as they are computed.
+        
+        At most `window` pairs are in flight (submitted or buffered) at any
+        time, and at most `cache_size` documents of each kind are cached, so
+        memory stays flat regardless of batch size. Documents are
+        deduplicated by content hash; once the iterator is exhausted,
+        self.dedup_stats holds the resume/job dedup ratios (cumulative when
+        the same `caches` are passed to several calls).
+        
+        Args:
+            resumes: List of resume texts
+            job_descriptions: List of job description texts (one per resume)
+            vectorizer: Pre-trained vectorizer
+            ordered: Yield in input order, using a reorder buffer of at most `window` results
+            window: Max pairs in flight (default: 4 x max_workers)
+            caches: (resume, job) caches from new_caches(); fresh ones per call if None
+            
+        Yields:
+            Match result dicts (same shape as process_batch results)
         """
         if len(resumes) != len(job_descriptions):
             raise ValueError(
                 f"Mismatch: {len(resumes)} resumes vs {len(job_descriptions)} job descriptions"
             )
         
-        results = []
+        total = len(resumes)
+        window = window or self.max_workers * 4
+        resume_cache, job_cache = caches or self.new_caches(vectorizer)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            reorder_buffer = {}
+            next_submit = 0
+            next_emit = 0
+            
+            while pending or next_submit < total:
+                # Submit new pairs while the window has room
+                while next_submit < total and len(pending) + len(reorder_buffer) < window:
+                    future = executor.submit(
+                        self._prepare_pair,
+                        next_submit,
+                        resumes[next_submit],
+                        job_descriptions[next_submit],
+                        resume_cache,
+                        job_cache
+                    )
+                    pending[future] = next_submit
+                    next_submit += 1
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                prepared = []
+                for future in done:
+                    idx = pending.pop(future)
+                    try:
+                        prepared.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Failed to process pair {idx}: {e}")
+                        prepared.append({
+                            "index": idx,
+                            "success": False,
+                            "error": str(e),
+                            "match_score": 0.0
+                        })
+                
+                for result in self._score_pairs(prepared):
+                    if ordered:
+                        reorder_buffer[result["index"]] = result
+                    else:
+                        yield result
+                
+                # Flush the contiguous prefix of the reorder buffer
+                while next_emit in reorder_buffer:
+                    yield reorder_buffer.pop(next_emit)
+                    next_emit += 1
+        
+        self.dedup_stats = {
+            "resumes": resume_cache.stats(),
+            "job_descriptions": job_cache.stats()
+        }
+    
+    def process_matrix(
+        self,
+        resumes: List[str],
+        job_descriptions: List[str],
+        vectorizer,
+        mode: str = "top_k",
+        top_k: int = 5,
+        chunk_size: int = 256,
+        encoding: str = "uint16"
+    ) -> Dict[str, Any]:
+        """
+        Score every resume against every job (N x M) with sparse matrix products.
+        
+        Each text is preprocessed and vectorized once. Resume rows are multiplied
+        against the job matrix in chunks of `chunk_size`, so at most
+        chunk_size x M dense scores are held at a time.
+        
+        Args:
+            resumes: Unique resume texts (N)
+            job_descriptions: Unique job description texts (M)
+            vectorizer: Pre-trained vectorizer
+            mode: "matrix" for the full N x M score matrix, "top_k" for
+                per-resume and per-job top K
+            top_k: K for "top_k" mode
+            chunk_size: Resume rows scored per matrix product
+            encoding: "matrix" mode output; "uint16" packs each score as
+                round(score * 1000) in a little-endian uint16, row-major and
+                base64 encoded ("scores_b64"), "list" returns nested floats
+                ("scores")
+            
+        Returns:
+            Dict with shape, empty_resumes / empty_jobs (indices with no content
+            after preprocessing, scored 0.0) and either the score matrix or
+            "top_jobs_per_resume" / "top_resumes_per_job"
+        """
+        if mode not in ("matrix", "top_k"):
+            raise ValueError(f"Unknown matrix mode: {mode}")
+        if encoding not in ("uint16", "list"):
+            raise ValueError(f"Unknown matrix encoding: {encoding}")
+        
         start_time = datetime.now()
+        n_resumes, n_jobs = len(resumes), len(job_descriptions)
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            futures = {}
-            for idx, (resume, job_desc) in enumerate(zip(resumes, job_descriptions)):
-                future = executor.submit(
-                    self._process_single_pair,
-                    idx,
-                    resume,
-                    job_desc,
-                    vectorizer
-                )
-                futures[future] = idx
+            resume_clean = list(executor.map(process_text, resumes))
+            if self.job_store is None:
+                job_clean = list(executor.map(process_text, job_descriptions))
+        
+        resume_matrix = normalize(vectorizer.transform(resume_clean))
+        if self.job_store is None:
+            job_matrix = vectorizer.transform(job_clean)
+        else:
+            jobs = self.job_store.get_many(job_descriptions, vectorizer, self.model_version)
+            job_clean = [job.clean_text for job in jobs]
+            empty_row = sp.csr_matrix((1, resume_matrix.shape[1]))
+            job_matrix = sp.vstack([job.vector if job.vector is not None else empty_row for job in jobs], format="csr")
+        job_matrix_t = normalize(job_matrix).T.tocsc()
+        
+        result = {
+            "shape": [n_resumes, n_jobs],
+            "empty_resumes": [i for i, t in enumerate(resume_clean) if not t],
+            "empty_jobs": [j for j, t in enumerate(job_clean) if not t],
+        }
+        
+        k_jobs = min(top_k, n_jobs)
+        k_resumes = min(top_k, n_resumes)
+        rows = []
+        top_jobs = []
+        # Running per-job top K: (scores, resume indices), each k_resumes x M
+        best_scores = np.full((0, n_jobs), -1.0)
+        best_index = np.zeros((0, n_jobs), dtype=np.int64)
+        
+        for start in range(0, n_resumes, chunk_size):
+            chunk = resume_matrix[start:start + chunk_size]
+            scores = np.asarray((chunk @ job_matrix_t).todense())
+            np.clip(scores, 0.0, 1.0, out=scores)
+            scores = np.round(scores, 3)
+            
+            if mode == "matrix":
+                if encoding == "uint16":
+                    # Scores are already rounded to 3 decimals, so this is lossless
+                    rows.append(np.rint(scores * 1000).astype("<u2").tobytes())
+                else:
+                    rows.extend(scores.tolist())
+                continue
+            
+            # Per-resume top K jobs
+            part = np.argpartition(-scores, k_jobs - 1, axis=1)[:, :k_jobs]
+            for r, cols in enumerate(part):
+                cols = cols[np.argsort(-scores[r, cols], kind="stable")]
+                top_jobs.append([
+                    {"job_index": int(c), "match_score": float(scores[r, c])} for c in cols
+                ])
             
-            # Collect results as they complete
-            for future in as_completed(futures):
-                idx = futures[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    logger.error(f"Failed to process pair {idx}: {e}")
-                    results.append({
-                        "index": idx,
-                        "success": False,
-                        "error": str(e),
-                        "match_score": 0.0
-                    })
-        
-        # Sort by original index
-        results.sort(key=lambda x: x["index"])
+            # Merge this chunk into the per-job top K resumes
+            chunk_index = np.arange(start, start + scores.shape[0])[:, None].repeat(n_jobs, axis=1)
+            merged_scores = np.vstack([best_scores, scores])
+            merged_index = np.vstack([best_index, chunk_index])
+            # Fewer than k_resumes rows seen so far when top_k > chunk_size
+            k = min(k_resumes, merged_scores.shape[0])
+            keep = np.argpartition(-merged_scores, k - 1, axis=0)[:k]
+            best_scores = np.take_along_axis(merged_scores, keep, axis=0)
+            best_index = np.take_along_axis(merged_index, keep, axis=0)
+        
+        if mode == "matrix" and encoding == "uint16":
+            result["scores_b64"] = base64.b64encode(b"".join(rows)).decode("ascii")
+            result["scores_scale"] = 1000
+        elif mode == "matrix":
+            result["scores"] = rows
+        else:
+            order = np.argsort(-best_scores, axis=0, kind="stable")
+            best_scores = np.take_along_axis(best_scores, order, axis=0)
+            best_index = np.take_along_axis(best_index, order, axis=0)
+            result["top_k"] = top_k
+            result["top_jobs_per_resume"] = top_jobs
+            result["top_resumes_per_job"] = [
+                [
+                    {"resume_index": int(best_index[r, j]), "match_score": float(best_scores[r, j])}
+                    for r in range(best_scores.shape[0])
+                ]
+                for j in range(n_jobs)
+            ]
         
         elapsed = (datetime.now() - start_time).total_seconds()
-        logger.info(f"Processed {len(results)} pairs in {elapsed:.2f}s")
+        logger.info(f"Scored {n_resumes}x{n_jobs} matrix in {elapsed:.2f}s")
         
-        return results
+        return result
     
-    def _process_single_pair(
+    def _prepare_pair(
         self,
         index: int,
         resume: str,
         job_description: str,
-        vectorizer
+        resume_cache: DocumentCache,
+        job_cache: DocumentCache
     ) -> Dict[str, Any]:
-        """Process a single resume-job pair"""
+        """Preprocess and vectorize a single resume-job pair (scored later in bulk)"""
         try:
-            # Preprocess
-            resume_clean = process_text(resume)
-            job_clean = process_text(job_description)
+            # Preprocess + vectorize (once per unique document)
+            resume_clean, resume_vec = resume_cache.get(resume)
+            job_clean, job_vec = job_cache.get(job_description)
             
             if not resume_clean or not job_clean:
                 return {
@@ -100,31 +385,67 @@ class BatchProcessor:
                     "match_score": 0.0
                 }
             
-            # Vectorize
-            resume_vec = vectorizer.transform([resume_clean])
-            job_vec = vectorizer.transform([job_clean])
-            
-            # Compute similarity
-            score = compute_similarity(resume_vec, job_vec)
-            
             return {
                 "index": index,
                 "success": True,
-                "match_score": score,
+                "match_score": 0.0,
                 "resume_tokens": len(resume_clean.split()),
-                "job_tokens": len(job_clean.split())
+                "job_tokens": len(job_clean.split()),
+                "_vectors": (resume_vec, job_vec)
             }
         
         except Exception as e:
             logger.error(f"Error processing pair {index}: {e}")
             raise
+    
+    @staticmethod
+    def _score_pairs(prepared: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score every prepared pair with one row-wise compute_similarities call"""
+        ready = [p for p in prepared if "_vectors" in p]
+        if ready:
+            scores = compute_similarities(
+                sp.vstack([p["_vectors"][0] for p in ready]),
+                sp.vstack([p["_vectors"][1] for p in ready])
+            )
+            for p, score in zip(ready, scores.tolist()):
+                del p["_vectors"]
+                p["match_score"] = score
+        return prepared
 
 
 class MultiJobMatcher:
     """
     Match a single resume against multiple job descriptions.
+    With a job_store (JobDescriptionStore), job texts and vectors come from /
+    are saved to it instead of being preprocessed on every request.
     """
     
+    def __init__(self, job_store=None, model_version: Optional[str] = None):
+        self.job_store = job_store
+        self.model_version = model_version
+    
+    def _vectorize_jobs(self, job_descriptions: List[str], vectorizer) -> Tuple[List[int], Any]:
+        """
+        Returns:
+            (positions of the jobs with meaningful content, their vectors as one matrix or None)
+        """
+        if self.job_store is not None:
+            jobs = self.job_store.get_many(job_descriptions, vectorizer, self.model_version)
+            kept = [pos for pos, job in enumerate(jobs) if job.vector is not None]
+            return kept, sp.vstack([jobs[pos].vector for pos in kept], format="csr") if kept else None
+        
+        kept, cleans = [], []
+        for pos, job_desc in enumerate(job_descriptions):
+            try:
+                job_clean = process_text(job_desc)
+            except Exception as e:
+                logger.error(f"Failed to preprocess job: {e}")
+                continue
+            if job_clean:
+                kept.append(pos)
+                cleans.append(job_clean)
+        return kept, vectorizer.transform(cleans) if cleans else None
+    
     def match_resume_to_jobs(
         self,
         resume: str,
@@ -144,36 +465,139 @@ class MultiJobMatcher:
         Returns:
             List of matches sorted by score (highest first)
         """
+        matches = list(self.iter_matches(resume, job_descriptions, vectorizer))
+        
+        # Sort by score (highest first)
+        matches.sort(key=lambda x: x["match_score"], reverse=True)
+        
+        # Return top K if specified
+        if top_k:
+            matches = matches[:top_k]
+        
+        return matches
+    
+    def iter_matches(
+        self,
+        resume: str,
+        job_descriptions: List[str],
+        vectorizer,
+        chunk_size: int = 64
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one match per job, in job order, as each is computed.
+        Jobs are vectorized and scored `chunk_size` at a time (one transform
+        call or job store lookup, and one one-to-many compute_similarities
+        call per chunk). If a chunk fails, its jobs are retried one at a time,
+        so one bad job does not drop the rest of its chunk.
+        Jobs with no meaningful content or that fail on their own are skipped.
+        
+        Raises:
+            ValueError: If the resume has no meaningful content
+        """
         resume_clean = process_text(resume)
         if not resume_clean:
             raise ValueError("Resume has no meaningful content")
         
         resume_vec = vectorizer.transform([resume_clean])
         
-        matches = []
-        for idx, job_desc in enumerate(job_descriptions):
+        for start in range(0, len(job_descriptions), chunk_size):
+            end = min(start + chunk_size, len(job_descriptions))
+            chunk = job_descriptions[start:end]
             try:
-                job_clean = process_text(job_desc)
-                if not job_clean:
-                    continue
-                
-                job_vec = vectorizer.transform([job_clean])
-                score = compute_similarity(resume_vec, job_vec)
-                
-                matches.append({
+                kept, scores = self._score_jobs(resume_vec, chunk, vectorizer)
+            except Exception as e:
+                logger.warning(f"Failed to match jobs {start}-{end - 1} together, retrying one by one: {e}")
+                kept, scores = [], []
+                for pos, job_desc in enumerate(chunk):
+                    try:
+                        one_kept, one_scores = self._score_jobs(resume_vec, [job_desc], vectorizer)
+                    except Exception as job_error:
+                        logger.error(f"Failed to match job {start + pos}: {job_error}")
+                        continue
+                    if one_kept:
+                        kept.append(pos)
+                        scores.extend(one_scores)
+            
+            for pos, score in zip(kept, scores):
+                idx = start + pos
+                job_desc = job_descriptions[idx]
+                yield {
                     "job_index": idx,
                     "match_score": score,
                     "job_preview": job_desc[:100] + "..." if len(job_desc) > 100 else job_desc
-                })
-            except Exception as e:
-                logger.error(f"Failed to match job {idx}: {e}")
-                continue
+                }
+
+
+    def _score_jobs(self, resume_vec, job_descriptions: List[str], vectorizer) -> Tuple[List[int], List[float]]:
+        """(positions of the jobs with meaningful content, their scores against resume_vec)"""
+        kept, job_vecs = self._vectorize_jobs(job_descriptions, vectorizer)
+        if not kept:
+            return [], []
+        return kept, compute_similarities(resume_vec, job_vecs).tolist()
+    
+    def match_resume_to_jobs_dense(
+        self,
+        resume: str,
+        job_descriptions: List[str],
+        vectorizer,
+        top_k: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Match one resume against multiple jobs using LSA embeddings.
+        All jobs are vectorized in one call, projected to the dense space and
+        scored with a single matrix product (vectorizer.lsa must be set).
         
-        # Sort by score (highest first)
-        matches.sort(key=lambda x: x["match_score"], reverse=True)
+        Returns:
+            List of matches sorted by score (highest first); jobs with no
+            meaningful content are skipped
+            
+        Raises:
+            ValueError: If the resume has no meaningful content or the model has no LSA stage
+        """
+        if getattr(vectorizer, "lsa", None) is None:
+            raise ValueError("Model has no LSA embeddings; set LSA_COMPONENTS and retrain")
         
-        # Return top K if specified
-        if top_k:
-            matches = matches[:top_k]
+        resume_clean = process_text(resume)
+        if not resume_clean:
+            raise ValueError("Resume has no meaningful content")
+        
+        job_indices, job_vecs = self._vectorize_jobs(job_descriptions, vectorizer)
+        if not job_indices:
+            return []
+        
+        index = DenseIndex(vectorizer.lsa.embed(job_vecs))
+        query = vectorizer.lsa.embed(vectorizer.transform([resume_clean]))
+        positions, scores = index.search(query, top_k or len(index))
         
+        matches = []
+        for pos, score in zip(positions[0], scores[0]):
+            job_desc = job_descriptions[job_indices[pos]]
+            matches.append({
+                "job_index": job_indices[pos],
+                "match_score": round(min(max(float(score), 0.0), 1.0), 3),
+                "job_preview": job_desc[:100] + "..." if len(job_desc) > 100 else job_desc
+            })
         return matches
+
+
+class TopKMatches:
+    """
+    Keep the top K matches seen so far in a min-heap of size K,
+    so streaming callers can rank without holding every match.
+    """
+    
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self._heap = []
+    
+    def add(self, match: Dict[str, Any]):
+        """Record a match (needs match_score and job_index)"""
+        key = (match["match_score"], -match["job_index"])
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, (key, match))
+        elif key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, (key, match))
+    
+    def ranked(self) -> List[Dict[str, Any]]:
+        """Current top K, sorted by score (highest first)"""
+        return [m for _, m in sorted(self._heap, key=lambda x: x[0], reverse=True)]
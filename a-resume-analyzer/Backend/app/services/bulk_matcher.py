@@ -0,0 +1,237 @@
+# app/services/bulk_matcher.py
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import bisect
+import logging
+import time
+import zipfile
+
+from app.Backend.app.services.preprocessing import process_text
+from app.Backend.app.services.pdf_parser import PDFParser
+from app.Backend.app.services.matcher import compute_similarities
+
+logger = logging.getLogger(__name__)
+
+MAX_PDF_BYTES = 10 * 1024 * 1024        # Same per-file limit as /upload/match
+MAX_ZIP_COMPRESSION_RATIO = 100         # Reject zip-bomb style entries
+
+
+def iter_pdf_entries(uploads: Iterable[Tuple[str, Any]], max_files: int) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (filename, pdf_bytes_or_error) from uploaded PDFs and ZIP archives.
+
+    ZIP entries are read one at a time from the archive file object, so only
+    the entries currently in flight are held in memory.
+
+    Args:
+        uploads: Iterable of (filename, file_object) pairs
+        max_files: Maximum number of PDFs to yield
+
+    Yields:
+        (filename, bytes) for valid PDFs, (filename, ValueError) for rejected entries
+    """
+    count = 0
+    for filename, fileobj in uploads:
+        name = (filename or "").lower()
+
+        if name.endswith(".zip"):
+            try:
+                archive = zipfile.ZipFile(fileobj)
+            except zipfile.BadZipFile as e:
+                yield filename, ValueError(f"Invalid ZIP archive: {e}")
+                continue
+
+            with archive:
+                for info in archive.infolist():
+                    entry = info.filename
+                    if info.is_dir() or entry.startswith("__MACOSX/") or not entry.lower().endswith(".pdf"):
+                        continue
+                    if count >= max_files:
+                        logger.warning(f"Bulk upload truncated at {max_files} files")
+                        return
+                    count += 1
+
+                    if info.file_size > MAX_PDF_BYTES:
+                        yield entry, ValueError("File too large. Max size is 10MB")
+                        continue
+                    if info.compress_size and info.file_size / info.compress_size > MAX_ZIP_COMPRESSION_RATIO:
+                        yield entry, ValueError("Suspicious compression ratio")
+                        continue
+                    yield entry, archive.read(info)
+
+        elif name.endswith(".pdf"):
+            if count >= max_files:
+                logger.warning(f"Bulk upload truncated at {max_files} files")
+                return
+            count += 1
+
+            contents = fileobj.read(MAX_PDF_BYTES + 1)
+            if len(contents) > MAX_PDF_BYTES:
+                yield filename, ValueError("File too large. Max size is 10MB")
+            else:
+                yield filename, contents
+
+        else:
+            yield filename, ValueError("Only PDF and ZIP files are supported")
+
+
+def _parse_and_clean(pdf_bytes: bytes) -> Tuple[str, str]:
+    """Parse a PDF and preprocess its text (runs in a worker process)"""
+    text, stats = PDFParser.extract_text_with_stats(pdf_bytes)
+    return process_text(text), stats["strategy"]
+
+
+class BulkMatcher:
+    """
+    Match many uploaded resumes against one job description.
+    PDF parsing and preprocessing (CPU-bound) run in a process pool;
+    the job is vectorized once and results are yielded as each resume completes.
+    With a job_store (JobDescriptionStore), the job comes from / is saved to it.
+    """
+
+    def __init__(self, max_workers: int = 4, job_store=None):
+        self.max_workers = max_workers
+        self.job_store = job_store
+
+    def prepare_job(self, job_description: str, vectorizer, model_version: Optional[str] = None) -> Tuple[str, Any]:
+        """
+        Preprocess and vectorize the job description once for the whole upload.
+
+        Raises:
+            ValueError: If the job description has no meaningful content
+        """
+        if self.job_store is not None:
+            job = self.job_store.get(job_description, vectorizer, model_version)
+            job_clean, job_vec = job.clean_text, job.vector
+        else:
+            job_clean = process_text(job_description)
+            job_vec = vectorizer.transform([job_clean]) if job_clean else None
+        if not job_clean:
+            raise ValueError("Job description has no meaningful content")
+        return job_clean, job_vec
+
+    def stream_matches(
+        self,
+        entries: Iterable[Tuple[str, Any]],
+        job_clean: str,
+        job_vec,
+        vectorizer
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Match resumes against a prepared job, yielding results as they complete.
+
+        Args:
+            entries: Iterable of (filename, pdf_bytes_or_error), e.g. from iter_pdf_entries
+            job_clean: Preprocessed job description (from prepare_job)
+            job_vec: Job description vector (from prepare_job)
+            vectorizer: Pre-trained vectorizer
+
+        Yields:
+            One "result" dict per resume (with its current rank among completed
+            resumes), then a final "summary" dict with the full ranking.
+        """
+        start_time = time.perf_counter()
+        ranking = []            # (-score, index, filename), kept sorted
+        successful = 0
+        failed = 0
+        index = 0
+
+        entry_iter = iter(entries)
+        max_in_flight = self.max_workers * 2
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            exhausted = False
+
+            while pending or not exhausted:
+                # Keep a bounded number of PDFs in flight
+                while not exhausted and len(pending) < max_in_flight:
+                    try:
+                        filename, payload = next(entry_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+
+                    if isinstance(payload, Exception):
+                        failed += 1
+                        yield {
+                            "type": "result",
+                            "index": index,
+                            "filename": filename,
+                            "success": False,
+                            "error": str(payload),
+                            "match_score": 0.0
+                        }
+                    else:
+                        future = executor.submit(_parse_and_clean, payload)
+                        pending[future] = (index, filename)
+                    index += 1
+
+                if not pending:
+                    continue
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                parsed, errors = [], []
+                for future in done:
+                    idx, filename = pending.pop(future)
+                    try:
+                        resume_clean, strategy = future.result()
+                        if not resume_clean:
+                            raise ValueError("Empty content after preprocessing")
+                        parsed.append((idx, filename, resume_clean, strategy))
+                    except Exception as e:
+                        errors.append((idx, filename, e))
+
+                # Vectorize and score every finished resume in one call
+                if parsed:
+                    try:
+                        scores = compute_similarities(
+                            vectorizer.transform([clean for _, _, clean, _ in parsed]), job_vec
+                        ).tolist()
+                    except Exception as e:
+                        errors.extend((idx, filename, e) for idx, filename, _, _ in parsed)
+                        parsed, scores = [], []
+
+                for idx, filename, e in errors:
+                    logger.error(f"Failed to process {filename}: {e}")
+                    failed += 1
+                    yield {
+                        "type": "result",
+                        "index": idx,
+                        "filename": filename,
+                        "success": False,
+                        "error": str(e),
+                        "match_score": 0.0
+                    }
+
+                for (idx, filename, resume_clean, strategy), score in zip(parsed, scores):
+                    successful += 1
+                    key = (-score, idx, filename)
+                    bisect.insort(ranking, key)
+                    yield {
+                        "type": "result",
+                        "index": idx,
+                        "filename": filename,
+                        "success": True,
+                        "match_score": score,
+                        "resume_tokens": len(resume_clean.split()),
+                        "extraction_strategy": strategy,
+                        "rank": bisect.bisect_left(ranking, key) + 1,
+                        "completed": successful
+                    }
+
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Bulk matched {index} resumes in {elapsed:.2f}s")
+
+        yield {
+            "type": "summary",
+            "total_processed": index,
+            "successful": successful,
+            "failed": failed,
+            "job_tokens": len(job_clean.split()),
+            "processing_time_seconds": round(elapsed, 3),
+            "ranking": [
+                {"rank": pos + 1, "index": idx, "filename": filename, "match_score": -neg_score}
+                for pos, (neg_score, idx, filename) in enumerate(ranking)
+            ]
+        }
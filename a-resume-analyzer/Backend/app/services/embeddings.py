@@ -0,0 +1,113 @@
+# app/services/embeddings.py
+from typing import Optional, Tuple
+from pathlib import Path
+import json
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+from app.Backend.app.services.vectorizer import META_FILE
+
+LSA_FILE = "vectorizer_lsa.npy"
+
+
+class LsaProjection:
+    """
+    Truncated-SVD (LSA) projection of TF-IDF vectors to a few hundred dimensions.
+
+    Embeddings are float32 and L2-normalized, so cosine similarity is a plain
+    dense dot product (one BLAS matrix multiply for many jobs). The component
+    matrix is stored as .npy next to the vectorizer artifacts and memory-mapped.
+    """
+
+    def __init__(self, components: np.ndarray, explained_variance: Optional[float] = None):
+        self.components = components        # (n_components, vocab_size) float32
+        self.explained_variance = explained_variance
+
+    @property
+    def n_components(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, X, n_components: int, random_state: int = 42) -> "LsaProjection":
+        """
+        Fit on a TF-IDF matrix. n_components is capped below the vocabulary
+        and document counts (TruncatedSVD needs fewer components than either).
+        """
+        n_components = max(1, min(n_components, X.shape[1] - 1, X.shape[0] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=random_state)
+        svd.fit(X)
+        return cls(svd.components_.astype(np.float32), float(svd.explained_variance_ratio_.sum()))
+
+    def embed(self, X) -> np.ndarray:
+        """Project TF-IDF rows; returns (n_rows, n_components) float32, L2-normalized"""
+        E = np.asarray(X.astype(np.float32) @ self.components.T, dtype=np.float32)
+        norms = np.linalg.norm(E, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return E / norms
+
+    def save(self, artifact_dir: str):
+        """Write the component matrix and merge its summary into vectorizer_meta.json under "lsa" """
+        artifact_dir = Path(artifact_dir)
+        np.save(artifact_dir / LSA_FILE, np.ascontiguousarray(self.components, dtype=np.float32))
+
+        meta_path = artifact_dir / META_FILE
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+        meta["lsa"] = {
+            "n_components": self.n_components,
+            "vocab_size": self.components.shape[1],
+            "explained_variance": self.explained_variance,
+        }
+        meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, artifact_dir: str) -> Optional["LsaProjection"]:
+        """Memory-map the component matrix; None if this model has no LSA stage"""
+        path = Path(artifact_dir) / LSA_FILE
+        if not path.exists():
+            return None
+        return cls(np.load(path, mmap_mode="r", allow_pickle=False))
+
+
+class DenseIndex:
+    """
+    Dense float32 embedding matrix with exhaustive inner-product search.
+
+    Rows are L2-normalized embeddings, so scores are cosine similarities.
+    Saved as a plain .npy file and opened memory-mapped, so a large job
+    index is shared between worker processes through the page cache.
+    """
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors              # (n_items, n_components) float32
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine scores of each query against every row, (n_queries, n_items)"""
+        return np.atleast_2d(queries).astype(np.float32, copy=False) @ self.vectors.T
+
+    def search(self, queries: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k rows per query.
+
+        Returns:
+            (indices, scores), each (n_queries, k), best first
+        """
+        scores = self.scores(queries)
+        k = min(top_k, scores.shape[1])
+        if k == 0:
+            empty = np.zeros((scores.shape[0], 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+    def save(self, path: str):
+        np.save(path, np.ascontiguousarray(self.vectors, dtype=np.float32))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "DenseIndex":
+        return cls(np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False))
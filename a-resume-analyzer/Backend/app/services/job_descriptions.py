@@ -0,0 +1,207 @@
+# app/services/job_descriptions.py
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import logging
+import threading
+
+import scipy.sparse as sp
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.core.database import SessionLocal, JobDescription, JobDescriptionVector
+from app.Backend.app.services.preprocessing import process_text
+from app.Backend.app.services.resume_vectors import pack_vector, unpack_vector
+
+logger = logging.getLogger(__name__)
+
+_IN_CHUNK = 500  # Hashes per IN (...) query, below SQLite's bound-parameter limit
+
+
+def job_hash(job_text: str) -> str:
+    """SHA256 of the submitted job text (the key of job_descriptions and MatchHistory)"""
+    return hashlib.sha256(job_text.encode()).hexdigest()
+
+
+@dataclass
+class StoredJob:
+    text_hash: str
+    clean_text: str                       # process_text output; "" if nothing meaningful
+    token_count: int
+    vector: Optional[sp.csr_matrix]       # 1 x n_features; None when clean_text is empty
+
+
+class JobDescriptionStore:
+    """
+    Content-addressed job descriptions with per-model-version vectors.
+
+    A job text is preprocessed once ever (job_descriptions) and vectorized
+    once per model version (job_description_vectors), then served from the
+    database; the most recent `max_cached` (text, version) entries are also
+    kept in memory. Rows are written lazily by the match endpoints. Lookups
+    of many jobs are batched: IN queries of up to 500 hashes and one
+    transform call for all misses. Vectors are only persisted for versioned
+    models; a failed write is logged and the computed values still returned.
+    If another request stored some of the same jobs first, the remaining rows
+    are inserted one at a time, so one duplicate does not drop the batch.
+    """
+
+    def __init__(self, max_cached: int = 10000):
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[Tuple[str, str], StoredJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "memory_hits": 0, "db_hits": 0, "preprocessed": 0, "vectorized": 0}
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[StoredJob]:
+        with self._lock:
+            job = self._cache.get(key)
+            if job is not None:
+                self._cache.move_to_end(key)
+            return job
+
+    def _remember(self, key: Tuple[str, str], job: StoredJob):
+        with self._lock:
+            self._cache[key] = job
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def get(self, job_text: str, vectorizer, model_version: Optional[str]) -> StoredJob:
+        return self.get_many([job_text], vectorizer, model_version)[0]
+
+    def get_many(self, job_texts: List[str], vectorizer, model_version: Optional[str]) -> List[StoredJob]:
+        """
+        Preprocessed text and vector of each job, in input order (repeated texts share one entry).
+        """
+        hashes = [job_hash(text) for text in job_texts]
+        found: Dict[str, StoredJob] = {}
+        if model_version is not None:
+            for h in set(hashes):
+                job = self._cached((h, model_version))
+                if job is not None:
+                    found[h] = job
+        missing = {h: text for h, text in zip(hashes, job_texts) if h not in found}
+
+        with self._lock:
+            self._stats["lookups"] += len(job_texts)
+            self._stats["memory_hits"] += len(job_texts) - sum(1 for h in hashes if h in missing)
+
+        if missing:
+            found.update(self._load(missing, vectorizer, model_version))
+        return [found[h] for h in hashes]
+
+    def get_by_hash(self, hashes: List[str], vectorizer, model_version: Optional[str]) -> Dict[str, StoredJob]:
+        """
+        Stored jobs by text hash, for callers that kept only the hash. Hashes
+        never stored through get / get_many are left out of the result.
+        """
+        found: Dict[str, StoredJob] = {}
+        if model_version is not None:
+            for h in set(hashes):
+                job = self._cached((h, model_version))
+                if job is not None:
+                    found[h] = job
+        missing = {h: None for h in hashes if h not in found}
+
+        with self._lock:
+            self._stats["lookups"] += len(hashes)
+            self._stats["memory_hits"] += len(found)
+
+        if missing:
+            found.update(self._load(missing, vectorizer, model_version))
+        return found
+
+    def _load(self, missing: Dict[str, Optional[str]], vectorizer,
+              model_version: Optional[str]) -> Dict[str, StoredJob]:
+        """
+        Read missing jobs from the database; preprocess / vectorize and store what is not there.
+        A hash with no text (None) can only be read, and is left out if it is not stored.
+        """
+        db = SessionLocal()
+        try:
+            keys = list(missing)
+            rows, vectors = {}, {}
+            for start in range(0, len(keys), _IN_CHUNK):
+                chunk = keys[start:start + _IN_CHUNK]
+                for row in db.query(JobDescription).filter(JobDescription.text_hash.in_(chunk)):
+                    rows[row.text_hash] = row
+                if model_version is not None:
+                    for row in db.query(JobDescriptionVector).filter(
+                        JobDescriptionVector.text_hash.in_(chunk),
+                        JobDescriptionVector.model_version == model_version
+                    ):
+                        vectors[row.text_hash] = unpack_vector(row.n_features, row.indices, row.weights)
+
+            new_rows = []
+            for h, text in missing.items():
+                if h not in rows and text is not None:
+                    clean = process_text(text)
+                    rows[h] = JobDescription(text_hash=h, normalized_text=clean, token_count=len(clean.split()))
+                    new_rows.append(rows[h])
+
+            to_vectorize = [h for h in rows if h not in vectors and rows[h].normalized_text]
+            new_vectors = []
+            if to_vectorize:
+                matrix = sp.csr_matrix(vectorizer.transform([rows[h].normalized_text for h in to_vectorize]))
+                for i, h in enumerate(to_vectorize):
+                    vectors[h] = matrix[i]
+                    if model_version is not None:
+                        n_features, indices, weights = pack_vector(matrix[i])
+                        new_vectors.append(JobDescriptionVector(
+                            text_hash=h, model_version=model_version,
+                            n_features=n_features, indices=indices, weights=weights
+                        ))
+
+            result = {
+                h: StoredJob(h, rows[h].normalized_text, rows[h].token_count, vectors.get(h))
+                for h in rows
+            }
+
+            if new_rows or new_vectors:
+                try:
+                    db.add_all(new_rows)
+                    db.flush()
+                    db.add_all(new_vectors)
+                    db.commit()
+                except IntegrityError:
+                    # Some rows were stored concurrently by another request; keep the rest
+                    db.rollback()
+                    self._store_each(db, new_rows + new_vectors)
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    logger.warning(f"Job descriptions not stored: {e}")
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stats["db_hits"] += len(rows) - len(new_rows)
+            self._stats["preprocessed"] += len(new_rows)
+            self._stats["vectorized"] += len(to_vectorize)
+        if model_version is not None:
+            for h, job in result.items():
+                self._remember((h, model_version), job)
+        return result
+
+    @staticmethod
+    def _store_each(db, rows: list):
+        """Insert rows one transaction each, skipping those that already exist (same content)"""
+        for row in rows:
+            try:
+                db.add(row)
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.warning(f"Job description row not stored: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached"] = len(self._cache)
+            return stats
+
+
+# Global job description store - rows shared by all workers, memory cache per process
+job_description_store = JobDescriptionStore(max_cached=settings.JOB_STORE_CACHE_SIZE)
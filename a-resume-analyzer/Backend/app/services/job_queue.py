@@ -0,0 +1,308 @@
+# app/services/job_queue.py
+from typing import List, Dict, Any, Optional
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import uuid
+from datetime import datetime
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.core.database import SessionLocal, BatchJob, BatchJobResult
+from app.Backend.app.services.batch_processor import BatchProcessor
+from app.Backend.app.services.job_descriptions import job_description_store
+
+logger = logging.getLogger(__name__)
+
+_HOST = socket.gethostname()
+_ACTIVE = ("queued", "running", "cancelling")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner() -> str:
+    return f"{_HOST}:{os.getpid()}"
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by submit() when max_queued jobs are already waiting"""
+
+
+class BatchJobQueue:
+    """
+    In-process job queue for large batch matching requests.
+
+    Submissions are persisted as BatchJob rows and processed by background
+    worker threads in chunks. Each chunk's results are written to
+    batch_job_results before the next one starts, so progress and partial
+    results can be polled and paged while the job runs. No external broker
+    is needed; job inputs live in memory until the job is picked up, so
+    each job records its owner process. On start, jobs whose owner process
+    on this host is gone are marked failed; jobs of live sibling workers
+    (and of other hosts) are left alone. At most `max_queued` jobs (and
+    their inputs) wait in memory; further submissions are refused.
+    """
+
+    def __init__(self, num_workers: int = 2, chunk_size: int = 200, pair_workers: int = 4, max_queued: int = 20):
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.pair_workers = pair_workers
+        self.max_queued = max_queued
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._submit_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Start worker threads and mark jobs of dead server processes as failed"""
+        self._recover_interrupted()
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._worker, name=f"batch-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Batch job queue started with {self.num_workers} workers")
+
+    def stop(self, timeout: float = 5.0):
+        """Signal workers to exit after their current chunk"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def submit(self, resumes: List[str], job_descriptions: List[str], vectorizer,
+               model_version: Optional[str] = None) -> BatchJob:
+        """
+        Persist a new job and enqueue it for background processing.
+        Job texts and vectors go through the job description store under
+        `model_version` (the version of `vectorizer`).
+
+        Returns:
+            The created BatchJob row
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting
+        """
+        if len(resumes) != len(job_descriptions):
+            raise ValueError(
+                f"Mismatch: {len(resumes)} resumes vs {len(job_descriptions)} job descriptions"
+            )
+
+        with self._submit_lock:
+            if self._queue.qsize() >= self.max_queued:
+                raise JobQueueFull(f"{self._queue.qsize()} batch jobs already queued (max {self.max_queued})")
+
+            db = SessionLocal()
+            try:
+                job = BatchJob(id=uuid.uuid4().hex, status="queued", total=len(resumes), owner=_owner())
+                db.add(job)
+                db.commit()
+                db.refresh(job)
+                db.expunge(job)
+            finally:
+                db.close()
+
+            self._queue.put((job.id, resumes, job_descriptions, vectorizer, model_version))
+        logger.info(f"Queued batch job {job.id} with {job.total} pairs")
+        return job
+
+    def cancel(self, job_id: str) -> Optional[BatchJob]:
+        """
+        Request cancellation. Queued jobs are cancelled immediately; running
+        jobs are marked "cancelling" and stop after the chunk in progress.
+        The flag lives in the database so any server process can cancel.
+        Returns None if the job is unknown.
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+            if job is None:
+                return None
+
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = datetime.utcnow()
+            elif job.status == "running":
+                job.status = "cancelling"
+            db.commit()
+            db.refresh(job)
+            db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job_id, resumes, job_descriptions, vectorizer, model_version = item
+            try:
+                self._run_job(job_id, resumes, job_descriptions, vectorizer, model_version)
+            except Exception as e:
+                logger.error(f"Batch job {job_id} failed: {e}")
+                self._finish(job_id, "failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job_id: str, resumes: List[str], job_descriptions: List[str], vectorizer,
+                 model_version: Optional[str] = None):
+        db = SessionLocal()
+        try:
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+            if job is None or job.status != "queued":
+                return
+
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            processor = BatchProcessor(max_workers=self.pair_workers, cache_size=settings.BATCH_DOC_CACHE_SIZE,
+                                       job_store=job_description_store, model_version=model_version)
+            # One pair of caches for the whole job, so documents repeated across chunks are processed once
+            caches = processor.new_caches(vectorizer)
+
+            for start in range(job.processed, job.total, self.chunk_size):
+                db.refresh(job)
+                if job.status == "cancelling":
+                    job.status = "cancelled"
+                    job.finished_at = datetime.utcnow()
+                    db.commit()
+                    logger.info(f"Batch job {job_id} cancelled at {job.processed}/{job.total}")
+                    return
+                if job.status != "running":
+                    logger.warning(f"Batch job {job_id} stopped: status changed to {job.status}")
+                    return
+
+                end = min(start + self.chunk_size, job.total)
+                results = processor.process_batch(
+                    resumes[start:end], job_descriptions[start:end], vectorizer, caches=caches
+                )
+
+                rows = [self._to_row(job_id, start, r) for r in results]
+                db.add_all(rows)
+                ok = sum(1 for r in rows if r.success)
+                job.processed += len(rows)
+                job.successful += ok
+                job.failed += len(rows) - ok
+                job.dedup = json.dumps(processor.dedup_stats)
+                db.commit()
+
+            # Conditional update, so a job failed or cancelled meanwhile keeps its status
+            finished = (
+                db.query(BatchJob)
+                .filter(BatchJob.id == job_id, BatchJob.status.in_(("running", "cancelling")))
+                .update(
+                    {BatchJob.status: "completed", BatchJob.finished_at: datetime.utcnow()},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if finished:
+                logger.info(f"Batch job {job_id} completed: {job.successful}/{job.total} successful")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_row(job_id: str, offset: int, result: Dict[str, Any]) -> BatchJobResult:
+        return BatchJobResult(
+            job_id=job_id,
+            item_index=offset + result["index"],
+            success=result.get("success", False),
+            match_score=result.get("match_score", 0.0),
+            resume_tokens=result.get("resume_tokens"),
+            job_tokens=result.get("job_tokens"),
+            error=result.get("error")
+        )
+
+    @staticmethod
+    def _finish(job_id: str, status: str, error: Optional[str] = None):
+        db = SessionLocal()
+        try:
+            job = db.query(BatchJob).filter(BatchJob.id == job_id).first()
+            if job is not None:
+                job.status = status
+                job.error = error
+                job.finished_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _recover_interrupted():
+        """
+        Inputs are held in memory, so jobs of a process that is gone cannot resume.
+        A job is interrupted if its owner is a dead process on this host, or this
+        process's pid (left by an earlier process, since none were submitted yet).
+        Jobs without an owner predate owner tracking and are treated as interrupted.
+        """
+        own_pid = os.getpid()
+        db = SessionLocal()
+        try:
+            interrupted = []
+            for job_id, owner in db.query(BatchJob.id, BatchJob.owner).filter(BatchJob.status.in_(_ACTIVE)):
+                if owner is None:
+                    interrupted.append(job_id)
+                    continue
+                host, _, pid = owner.rpartition(":")
+                if host == _HOST and pid.isdigit() and (int(pid) == own_pid or not _pid_alive(int(pid))):
+                    interrupted.append(job_id)
+            if not interrupted:
+                return
+
+            count = (
+                db.query(BatchJob)
+                .filter(BatchJob.id.in_(interrupted), BatchJob.status.in_(_ACTIVE))
+                .update(
+                    {
+                        BatchJob.status: "failed",
+                        BatchJob.error: "Interrupted by server restart",
+                        BatchJob.finished_at: datetime.utcnow(),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if count:
+                logger.warning(f"Marked {count} interrupted batch jobs as failed")
+        finally:
+            db.close()
+
+
+# Global job queue - workers started in the application lifespan
+batch_job_queue = BatchJobQueue(
+    num_workers=settings.BATCH_JOB_WORKERS,
+    chunk_size=settings.BATCH_JOB_CHUNK_SIZE,
+    max_queued=settings.BATCH_JOB_MAX_QUEUED
+)
+
+
+def get_job_results(db, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """Page through persisted results of a job, ordered by pair index"""
+    rows = (
+        db.query(BatchJobResult)
+        .filter(BatchJobResult.job_id == job_id)
+        .order_by(BatchJobResult.item_index)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    results = []
+    for r in rows:
+        result = {"index": r.item_index, "success": r.success, "match_score": r.match_score}
+        if r.success:
+            result["resume_tokens"] = r.resume_tokens
+            result["job_tokens"] = r.job_tokens
+        else:
+            result["error"] = r.error
+        results.append(result)
+    return results
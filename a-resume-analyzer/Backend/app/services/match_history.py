@@ -0,0 +1,324 @@
+# app/services/match_history.py
+from typing import Any, Dict, List, Optional
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.core.database import engine, MatchHistory
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MatchHistoryRecorder:
+    """
+    Write-behind buffer for match_history rows.
+
+    record() only appends to an in-memory buffer, so the match endpoints do
+    not wait for the database. A background thread inserts the buffer in
+    bulk (one executemany INSERT per batch_size rows) when it reaches
+    batch_size or every flush_interval seconds, whichever comes first.
+
+    Backpressure: when the database is slow or down and the buffer reaches
+    max_buffer, new events go to a local spill file (<spill_dir>/<pid>.jsonl),
+    or are dropped and counted if no spill_dir is set. A failed insert spills
+    its batch too. Spill files are replayed after the next successful insert,
+    including files left by workers that are no longer running. Rows the
+    schema rejects (IntegrityError) are retried one by one and the failing
+    ones dropped, since they would never insert. Unreadable spill lines (a
+    write cut short by a crash) are dropped and counted, and a spill file
+    claimed for replay by a worker that died meanwhile is replayed again.
+    On a database created before match_history.user_id became nullable
+    (checked once in start()), anonymous events are skipped and counted
+    instead of failing every flush. stop() flushes what is still buffered
+    (called from the application lifespan).
+    """
+
+    def __init__(self, batch_size: int = 500, flush_interval: float = 2.0, max_buffer: int = 10000,
+                 spill_dir: Optional[Path] = None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._buffer: deque = deque()
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._anonymous_allowed = True
+        self._stats = {"recorded": 0, "inserted": 0, "flushes": 0, "failed_flushes": 0,
+                       "spilled": 0, "replayed": 0, "dropped": 0, "rejected": 0, "skipped_anonymous": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._anonymous_allowed = self._user_id_nullable()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="match-history-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"Match history writer started (batch {self.batch_size}, every {self.flush_interval}s)")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the writer thread and flush the remaining buffer (spilled if the database is down)"""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        while self._buffer:
+            if not self.flush():
+                break
+        if self._buffer:
+            self._spill(self._take(len(self._buffer)))
+
+    @staticmethod
+    def _user_id_nullable() -> bool:
+        """Whether the existing match_history table accepts rows without a user (assumed if unknown)"""
+        try:
+            columns = inspect(engine).get_columns(MatchHistory.__tablename__)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not inspect match_history: {e}")
+            return True
+        nullable = next((c["nullable"] for c in columns if c["name"] == "user_id"), True)
+        if not nullable:
+            logger.warning(
+                "match_history.user_id is NOT NULL (table predates anonymous history); "
+                "anonymous matches are not recorded until the column is made nullable"
+            )
+        return nullable
+
+    def record(self, job_description_hash: str, match_score: float, user_id: Optional[int] = None,
+               resume_id: Optional[int] = None, matched_keywords: Optional[List[str]] = None,
+               missing_keywords: Optional[List[str]] = None):
+        """Queue one match event; never blocks on the database"""
+        if user_id is None and not self._anonymous_allowed:
+            with self._lock:
+                self._stats["skipped_anonymous"] += 1
+            return
+        row = {
+            "user_id": user_id,
+            "resume_id": resume_id,
+            "job_description_hash": job_description_hash,
+            "match_score": float(match_score),
+            "matched_keywords": json.dumps(matched_keywords) if matched_keywords is not None else None,
+            "missing_keywords": json.dumps(missing_keywords) if missing_keywords is not None else None,
+            "created_at": datetime.utcnow(),
+        }
+        with self._lock:
+            self._stats["recorded"] += 1
+            if len(self._buffer) < self.max_buffer:
+                self._buffer.append(row)
+                full = len(self._buffer) >= self.batch_size
+                row = None
+            else:
+                full = True
+        if row is not None:
+            self._spill([row])
+        if full:
+            self._wake.set()
+
+    def _take(self, n: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._buffer.popleft() for _ in range(min(n, len(self._buffer)))]
+
+    def _insert(self, rows: List[Dict[str, Any]]):
+        """One executemany INSERT in its own transaction"""
+        with engine.begin() as conn:
+            conn.execute(MatchHistory.__table__.insert(), rows)
+
+    def _insert_each(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows one by one after a batch was rejected; rows the schema rejects are dropped"""
+        inserted = 0
+        for row in rows:
+            try:
+                self._insert([row])
+                inserted += 1
+            except IntegrityError as e:
+                logger.error(f"Match history row rejected: {e.orig}")
+        with self._lock:
+            self._stats["rejected"] += len(rows) - inserted
+        return inserted
+
+    def flush(self) -> bool:
+        """
+        Insert up to batch_size buffered rows.
+
+        Returns:
+            False if the insert failed (the rows were spilled or dropped)
+        """
+        rows = self._take(self.batch_size)
+        if not rows:
+            return True
+        try:
+            self._insert(rows)
+            inserted = len(rows)
+        except IntegrityError:
+            # Retrying will not help (e.g. anonymous rows on a database created
+            # before user_id became nullable); keep the rows that do insert
+            inserted = self._insert_each(rows)
+        except SQLAlchemyError as e:
+            logger.warning(f"Match history insert of {len(rows)} rows failed: {e}")
+            with self._lock:
+                self._stats["failed_flushes"] += 1
+            self._spill(rows)
+            return False
+        with self._lock:
+            self._stats["flushes"] += 1
+            self._stats["inserted"] += inserted
+        return True
+
+    def _run(self):
+        last_replay = 0.0
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            # Keep the writer alive whatever goes wrong; the next round retries
+            try:
+                ok = True
+                while ok and self._buffer and not self._stopping.is_set():
+                    ok = self.flush()
+                    if len(self._buffer) < self.batch_size:
+                        break
+                if ok and self.spill_dir is not None and time.monotonic() - last_replay >= self.flush_interval:
+                    last_replay = time.monotonic()
+                    self._replay()
+            except Exception as e:
+                logger.error(f"Match history writer error: {e}")
+
+    def _spill(self, rows: List[Dict[str, Any]], respill: bool = False):
+        if self.spill_dir is None:
+            with self._lock:
+                self._stats["dropped"] += len(rows)
+            return
+        try:
+            with self._spill_lock:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_dir / f"{os.getpid()}.jsonl", "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps({**row, "created_at": row["created_at"].isoformat()}) + "\n")
+            if not respill:
+                with self._lock:
+                    self._stats["spilled"] += len(rows)
+        except OSError as e:
+            logger.error(f"Could not spill {len(rows)} match history rows: {e}")
+            with self._lock:
+                self._stats["dropped"] += len(rows)
+
+    @staticmethod
+    def _owner_pid(path: Path) -> Optional[int]:
+        """
+        Process responsible for a spill file: the writer of <pid>.jsonl, or
+        the claimer of <pid>.replaying-<claimer> (None if the name is foreign).
+        """
+        try:
+            if path.suffix == ".jsonl":
+                return int(path.stem)
+            if path.suffix.startswith(".replaying-"):
+                int(path.stem)
+                return int(path.suffix[len(".replaying-"):])
+        except ValueError:
+            pass
+        return None
+
+    def _read_spill(self, path: Path) -> List[Dict[str, Any]]:
+        """Rows of a spill file; unreadable lines (e.g. cut short by a crash) are dropped and counted"""
+        rows, bad = [], 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    row["created_at"] = datetime.fromisoformat(row["created_at"])
+                    rows.append(row)
+                except (ValueError, TypeError, KeyError):
+                    bad += 1
+        if bad:
+            logger.warning(f"Dropped {bad} unreadable match history lines from {path.name}")
+            with self._lock:
+                self._stats["dropped"] += bad
+        return rows
+
+    def _replay(self):
+        """
+        Insert spill files of this process and of dead ones, claiming each by renaming it.
+        Files claimed by a worker that died during replay are claimed again.
+        """
+        if not self.spill_dir.is_dir():
+            return
+        own_pid = os.getpid()
+        for path in sorted(self.spill_dir.glob("*.*")):
+            pid = self._owner_pid(path)
+            if pid is None or (pid != own_pid and _pid_alive(pid)):
+                continue
+
+            claimed = path.with_suffix(f".replaying-{own_pid}")
+            try:
+                with self._spill_lock:
+                    os.replace(path, claimed)
+            except OSError:
+                continue  # Claimed by another worker
+
+            rows = self._read_spill(claimed)
+            if not self._anonymous_allowed:
+                kept = [row for row in rows if row.get("user_id") is not None]
+                with self._lock:
+                    self._stats["skipped_anonymous"] += len(rows) - len(kept)
+                rows = kept
+            start = 0
+            try:
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    try:
+                        self._insert(batch)
+                        inserted = len(batch)
+                    except IntegrityError:
+                        inserted = self._insert_each(batch)
+                    with self._lock:
+                        self._stats["replayed"] += inserted
+            except SQLAlchemyError as e:
+                logger.warning(f"Match history replay of {path.name} failed: {e}")
+                self._spill(rows[start:], respill=True)
+                claimed.unlink()
+                return
+            claimed.unlink()
+            logger.info(f"Replayed {len(rows)} spilled match history rows from {path.name}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["buffered"] = len(self._buffer)
+        stats["running"] = self.running
+        return stats
+
+
+# Global match history recorder - started and flushed in the application lifespan
+match_history_recorder = MatchHistoryRecorder(
+    batch_size=settings.MATCH_HISTORY_BATCH_SIZE,
+    flush_interval=settings.MATCH_HISTORY_FLUSH_SECONDS,
+    max_buffer=settings.MATCH_HISTORY_MAX_BUFFER,
+    spill_dir=settings.MATCH_HISTORY_SPILL_DIR
+)
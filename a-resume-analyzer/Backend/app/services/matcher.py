@@ -1,16 +1,51 @@
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+
+def compute_similarities(resume_vectors, job_vectors, normalized: bool = False) -> np.ndarray:
+    """
+    Cosine similarity for many pairs at once.
+
+    Accepts two aligned 2D sparse or dense matrices (row i of one against row
+    i of the other), or a single row against a matrix (one-to-many, in either
+    order). Rows are L2-normalized once (skipped if normalized=True, e.g. for
+    TF-IDF output with norm="l2"), then scored with an element-wise product
+    and row sum (or one sparse matrix-vector product). Zero rows and NaN
+    score 0.0; if either side has no rows there is nothing to score.
+
+    Returns:
+        1D float array of scores rounded to 3 decimals (empty for 0 rows)
+    """
+    a, b = resume_vectors, job_vectors
+    if a.shape[0] == 0 or b.shape[0] == 0:
+        return np.zeros(0, dtype=np.float64)
+    if not normalized:
+        a, b = normalize(a), normalize(b)
+
+    if a.shape[0] == b.shape[0]:
+        if sp.issparse(a) or sp.issparse(b):
+            sims = sp.csr_matrix(a).multiply(sp.csr_matrix(b)).sum(axis=1)
+        else:
+            sims = np.einsum("ij,ij->i", np.asarray(a), np.asarray(b))
+    elif a.shape[0] == 1:
+        sims = b @ a.T
+    elif b.shape[0] == 1:
+        sims = a @ b.T
+    else:
+        raise ValueError(f"Cannot pair {a.shape[0]} resume rows with {b.shape[0]} job rows")
+
+    if sp.issparse(sims):
+        sims = sims.toarray()
+    sims = np.asarray(sims, dtype=np.float64).ravel()
+    np.nan_to_num(sims, copy=False, nan=0.0)
+    return np.round(sims, 3)
+
 
 def compute_similarity(resume_vector, job_vector) -> float:
     """
     Expects resume_vector and job_vector to be 2D sparse or dense vectors.
     Returns a float in [0,1] rounded to 3 decimals.
     """
-    sim = cosine_similarity(resume_vector, job_vector)
-    # sim is a matrix; for single pair it's shape (1,1)
-    try:
-        value = float(sim[0][0])
-    except Exception:
-        value = 0.0
-    if value != value:  # NaN safety
-        value = 0.0
-    return round(value, 3)
+    sims = compute_similarities(resume_vector, job_vector)
+    return float(sims[0]) if sims.size else 0.0
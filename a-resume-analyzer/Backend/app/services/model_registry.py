@@ -0,0 +1,320 @@
+# app/services/model_registry.py
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import logging
+import random
+import threading
+import time
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.model_store import ModelStore, model_store, write_atomic
+from app.Backend.app.services.matcher import compute_similarity
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "primary"     # Alias for the published model
+ROUTING_FILE = "routing.json"   # Canary/shadow routing shared by all server processes
+
+
+class ShadowStats:
+    """Running score-delta and latency statistics of shadow scoring"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.errors = 0
+            self.dropped = 0
+            self.delta_sum = 0.0
+            self.abs_delta_sum = 0.0
+            self.max_abs_delta = 0.0
+            self.primary_ms_sum = 0.0
+            self.shadow_ms_sum = 0.0
+
+    def record(self, delta: float, primary_ms: float, shadow_ms: float):
+        with self._lock:
+            self.count += 1
+            self.delta_sum += delta
+            self.abs_delta_sum += abs(delta)
+            self.max_abs_delta = max(self.max_abs_delta, abs(delta))
+            self.primary_ms_sum += primary_ms
+            self.shadow_ms_sum += shadow_ms
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            n = self.count or 1
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "dropped": self.dropped,
+                "mean_delta": round(self.delta_sum / n, 4),
+                "mean_abs_delta": round(self.abs_delta_sum / n, 4),
+                "max_abs_delta": round(self.max_abs_delta, 4),
+                "mean_primary_ms": round(self.primary_ms_sum / n, 3),
+                "mean_shadow_ms": round(self.shadow_ms_sum / n, 3),
+            }
+
+
+class ModelRegistry:
+    """
+    Several resident vectorizer versions next to the published one.
+
+    Requests are routed to the published (primary) model unless they ask for
+    a resident version by header, or fall into the canary percentage. A
+    shadow version scores single-pair matches in a background thread and
+    only records the score delta and latency; responses never wait for it.
+    At most `shadow_max_pending` pairs wait for or are in shadow scoring;
+    further pairs are dropped and counted, so a shadow model slower than
+    the traffic cannot pile up work.
+
+    Versions are loaded through the model store, so with VECTOR_FORMAT=npy
+    their vocabulary/idf arrays are memory-mapped and shared through the OS
+    page cache, and the published version is never loaded twice. Routing
+    starts from Settings; configure() saves it to a file next to the model
+    store's pointer, and every process re-reads that file at most once per
+    reload interval (like published models), so all workers route alike.
+    """
+
+    def __init__(self, store: ModelStore, canary_version: Optional[str] = None, canary_percent: float = 0.0,
+                 shadow_version: Optional[str] = None, shadow_workers: int = 1, shadow_max_pending: int = 100):
+        self.store = store
+        self.canary_version = canary_version
+        self.canary_percent = canary_percent
+        self.shadow_version = shadow_version
+        self.shadow_stats = ShadowStats()
+        self.shadow_max_pending = shadow_max_pending
+        self._shadow_pending = 0
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._routing_lock = threading.Lock()
+        self._routing_mtime: Optional[int] = None
+        self._next_check = 0.0
+        self._shadow_pool = ThreadPoolExecutor(max_workers=shadow_workers, thread_name_prefix="shadow-scoring")
+
+    def load(self, version: str):
+        """
+        Make a stored version resident (no-op if already loaded).
+
+        Raises:
+            FileNotFoundError: If the version does not exist in the model store
+        """
+        with self._lock:
+            if version in self._models:
+                return self._models[version]
+
+        artifact_dir = self.store.artifact_dir(version)
+        if not self.store.model_file(artifact_dir).exists():
+            raise FileNotFoundError(f"Model version {version} not found")
+        vectorizer = self.store.load(artifact_dir)
+
+        with self._lock:
+            self._models.setdefault(version, vectorizer)
+            logger.info(f"Loaded resident model version {version}")
+            return self._models[version]
+
+    def unload(self, version: str) -> bool:
+        """Drop a resident version and any routing that points at it (in every process)"""
+        with self._lock:
+            removed = self._models.pop(version, None) is not None
+        if version in (self.canary_version, self.shadow_version):
+            if self.canary_version == version:
+                self.canary_version, self.canary_percent = None, 0.0
+            if self.shadow_version == version:
+                self.shadow_version = None
+            self._save_routing()
+        return removed
+
+    def versions(self) -> List[str]:
+        with self._lock:
+            return sorted(self._models)
+
+    @property
+    def routing_path(self) -> Path:
+        return self.store.root / ROUTING_FILE
+
+    def configure(self, canary_version: Optional[str], canary_percent: float, shadow_version: Optional[str]):
+        """
+        Set canary and shadow routing and save it for the other server processes;
+        referenced versions are loaded first.
+
+        Raises:
+            FileNotFoundError: If a referenced version does not exist
+        """
+        self._apply(canary_version, canary_percent, shadow_version)
+        self._save_routing()
+
+    def load_routing(self):
+        """
+        Apply the saved routing, or the Settings defaults if none was saved.
+        Defaults are not saved, so a restarting worker never overrides routing
+        set through the admin API; if they name a missing version, routing is
+        disabled in this process.
+        """
+        if self.routing_path.exists():
+            self._next_check = 0.0
+            self.refresh()
+            return
+        try:
+            self._apply(self.canary_version, self.canary_percent, self.shadow_version)
+        except FileNotFoundError as e:
+            logger.warning(f"⚠️  Model routing disabled: {e}")
+            self._apply(None, 0.0, None)
+
+    def refresh(self):
+        """
+        Apply routing saved by another process if the routing file changed.
+        Cheap to call per request: the file is checked at most once per interval.
+        """
+        if time.monotonic() < self._next_check:
+            return
+
+        with self._routing_lock:
+            now = time.monotonic()
+            if now < self._next_check:
+                return
+            self._next_check = now + self.store.reload_interval
+
+            try:
+                mtime = self.routing_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                return
+            if mtime == self._routing_mtime:
+                return
+            self._routing_mtime = mtime
+
+            try:
+                routing = json.loads(self.routing_path.read_text(encoding="utf-8"))
+                self._apply(routing.get("canary_version"), routing.get("canary_percent", 0.0),
+                            routing.get("shadow_version"))
+            except Exception as e:
+                logger.error(f"Failed to apply model routing from {self.routing_path}: {e}")
+                return
+            logger.info(f"Model routing updated: {routing}")
+
+    def _apply(self, canary_version: Optional[str], canary_percent: float, shadow_version: Optional[str]):
+        for version in (canary_version, shadow_version):
+            if version:
+                self.load(version)
+        if self.shadow_version != shadow_version:
+            self.shadow_stats.reset()
+        self.canary_version = canary_version
+        self.canary_percent = canary_percent if canary_version else 0.0
+        self.shadow_version = shadow_version
+
+    def _save_routing(self):
+        self.store.root.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.routing_path, json.dumps({
+            "canary_version": self.canary_version,
+            "canary_percent": self.canary_percent,
+            "shadow_version": self.shadow_version,
+        }, indent=2))
+        with self._routing_lock:
+            self._routing_mtime = self.routing_path.stat().st_mtime_ns
+
+    def select(self, requested: Optional[str], primary_version: Optional[str], primary) -> Tuple[str, Any]:
+        """
+        Pick the model for a request.
+
+        Args:
+            requested: Version asked for via header (None for automatic routing)
+            primary_version: Version name of the published model (None for the legacy layout)
+            primary: The published vectorizer
+
+        Returns:
+            (version name, vectorizer)
+
+        Raises:
+            KeyError: If the requested version is not resident
+        """
+        primary_name = primary_version or PRIMARY
+        if requested:
+            if requested in (PRIMARY, primary_version):
+                return primary_name, primary
+            with self._lock:
+                if requested not in self._models:
+                    raise KeyError(requested)
+                return requested, self._models[requested]
+
+        canary = self.canary_version
+        if canary and canary != primary_version and random.random() * 100 < self.canary_percent:
+            with self._lock:
+                if canary in self._models:
+                    return canary, self._models[canary]
+        return primary_name, primary
+
+    def shadow(self, resume_clean: str, job_clean: str, served_version: str, served_score: float, served_ms: float):
+        """Score the same pair with the shadow version in the background (never blocks)"""
+        version = self.shadow_version
+        if not version or version == served_version:
+            return
+        with self._lock:
+            vectorizer = self._models.get(version)
+        if vectorizer is None:
+            return
+        with self._lock:
+            if self._shadow_pending >= self.shadow_max_pending:
+                full = True
+            else:
+                self._shadow_pending += 1
+                full = False
+        if full:
+            self.shadow_stats.record_dropped()
+            return
+        self._shadow_pool.submit(self._score_shadow, vectorizer, version, resume_clean, job_clean,
+                                 served_version, served_score, served_ms)
+
+    def _score_shadow(self, vectorizer, version: str, resume_clean: str, job_clean: str,
+                      served_version: str, served_score: float, served_ms: float):
+        try:
+            start = time.perf_counter()
+            vectors = vectorizer.transform([resume_clean, job_clean])
+            score = compute_similarity(vectors[0:1], vectors[1:2])
+            shadow_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            self.shadow_stats.record_error()
+            logger.warning(f"Shadow scoring with {version} failed: {e}")
+            return
+        finally:
+            with self._lock:
+                self._shadow_pending -= 1
+
+        delta = score - served_score
+        self.shadow_stats.record(delta, served_ms, shadow_ms)
+        logger.info(
+            f"Shadow score {version}={score:.3f} vs {served_version}={served_score:.3f} "
+            f"(delta {delta:+.3f}, {shadow_ms:.1f}ms vs {served_ms:.1f}ms)"
+        )
+
+    def status(self, primary_version: Optional[str]) -> Dict[str, Any]:
+        return {
+            "primary_version": primary_version,
+            "resident_versions": self.versions(),
+            "available_versions": self.store.list_versions(),
+            "canary_version": self.canary_version,
+            "canary_percent": self.canary_percent,
+            "shadow_version": self.shadow_version,
+            "shadow_stats": self.shadow_stats.snapshot(),
+        }
+
+
+# Global registry - routing defaults from Settings
+model_registry = ModelRegistry(
+    model_store,
+    canary_version=settings.MODEL_CANARY_VERSION,
+    canary_percent=settings.MODEL_CANARY_PERCENT,
+    shadow_version=settings.MODEL_SHADOW_VERSION,
+    shadow_max_pending=settings.MODEL_SHADOW_MAX_PENDING
+)
@@ -0,0 +1,263 @@
+# app/services/model_store.py
+from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.vectorizer import TextVectorizer, HashingTextVectorizer, VOCAB_FILE, META_FILE
+from app.Backend.app.services.embeddings import LsaProjection
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "current"        # Pointer file holding the published version name
+VERSIONS_DIR = "versions"
+STAGING_PREFIX = ".staging-"
+VALIDATION_DOCS = 20
+
+
+def new_version() -> str:
+    """Version name for a new model (sortable by creation time)"""
+    return f"v{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+
+def write_atomic(path: Path, text: str):
+    """Write to a temp file and rename it over path, so readers never see a partial file"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive lock on path (created if missing) across processes; the OS releases it if the holder dies"""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        yield
+
+
+class ModelStore:
+    """
+    Versioned vectorizer artifacts with an atomically switched "current" pointer.
+
+    Layout under the artifact root:
+        versions/<version>/   one directory per trained model (all formats + meta)
+        current               text file naming the published version
+
+    New models are written to a staging directory, validated, renamed into
+    versions/ and only then published by replacing the pointer file with
+    os.replace, so a worker never loads a half-written model. Every process
+    checks the pointer at most once per reload interval and loads the new
+    version in place, without a restart. Without a pointer file the legacy
+    flat layout in the artifact root is used.
+    """
+
+    def __init__(self, root: Path, vector_format: str = "joblib", reload_interval: float = 5.0, keep_versions: int = 3):
+        self.root = Path(root)
+        self.vector_format = vector_format
+        self.reload_interval = reload_interval
+        self.keep_versions = keep_versions
+        self.loaded_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+
+    @property
+    def versions_dir(self) -> Path:
+        return self.root / VERSIONS_DIR
+
+    def current_version(self) -> Optional[str]:
+        """Published version name, or None when only the legacy layout exists"""
+        try:
+            version = (self.root / CURRENT_FILE).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def artifact_dir(self, version: Optional[str] = None) -> Path:
+        """Directory holding a version's artifacts (the root for the legacy layout)"""
+        return self.versions_dir / version if version else self.root
+
+    def model_file(self, artifact_dir: Path) -> Path:
+        """File whose presence means the configured format can be loaded from artifact_dir"""
+        if self.vector_format == "hashing":
+            return artifact_dir / META_FILE
+        if self.vector_format == "npy":
+            return artifact_dir / VOCAB_FILE
+        return artifact_dir / settings.VECTOR_PATH.name
+
+    def load(self, artifact_dir: Path):
+        """Load the vectorizer in the configured format (plus its LSA stage, if trained) from artifact_dir"""
+        if self.vector_format == "hashing":
+            vectorizer = HashingTextVectorizer()
+            vectorizer.load(str(artifact_dir))
+        else:
+            vectorizer = TextVectorizer()
+            vectorizer.load(str(artifact_dir if self.vector_format == "npy" else self.model_file(artifact_dir)))
+            vectorizer.lsa = LsaProjection.load(str(artifact_dir))
+        return vectorizer
+
+    def load_current(self) -> Tuple[Optional[str], Any]:
+        """
+        Load the published version (or the legacy layout).
+
+        Returns:
+            (version, vectorizer); version is None for the legacy layout
+
+        Raises:
+            FileNotFoundError: If no model has been trained yet
+        """
+        version = self.current_version()
+        artifact_dir = self.artifact_dir(version)
+        if not self.model_file(artifact_dir).exists():
+            raise FileNotFoundError(f"No pre-trained model found at {self.model_file(artifact_dir)}")
+
+        vectorizer = self.load(artifact_dir)
+        self.loaded_version = version
+        self._next_check = time.monotonic() + self.reload_interval
+        return version, vectorizer
+
+    def meta(self) -> Dict[str, Any]:
+        """Metadata of the published model ({} if missing)"""
+        meta_path = self.artifact_dir(self.current_version()) / META_FILE
+        if not meta_path.exists():
+            return {}
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+
+    def refresh(self):
+        """
+        Load a newly published version if the pointer moved since the last check.
+        Cheap to call per request: the pointer is read at most once per interval.
+
+        Returns:
+            The new vectorizer, or None if nothing changed (or loading failed)
+        """
+        if time.monotonic() < self._next_check:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_check:
+                return None
+            self._next_check = now + self.reload_interval
+
+            version = self.current_version()
+            if version is None or version == self.loaded_version:
+                return None
+
+            try:
+                vectorizer = self.load(self.artifact_dir(version))
+            except Exception as e:
+                logger.error(f"Failed to load model version {version}: {e}")
+                return None
+
+            logger.info(f"Reloaded vectorizer: {self.loaded_version} -> {version}")
+            self.loaded_version = version
+            return vectorizer
+
+    def force_check(self):
+        """Make the next refresh() re-read the pointer immediately"""
+        self._next_check = 0.0
+
+    def stage(self, version: str) -> Path:
+        """Create an empty staging directory for a new version"""
+        staging_dir = self.versions_dir / f"{STAGING_PREFIX}{version}"
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+        return staging_dir
+
+    def discard(self, staging_dir: Path):
+        """Remove a staging directory that will not be published"""
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def validate(self, artifact_dir: Path, sample_docs: List[str]):
+        """
+        Load the staged model in the configured format and transform sample documents.
+
+        Raises:
+            ValueError: If the model cannot be loaded or produces unusable vectors
+        """
+        try:
+            vectorizer = self.load(artifact_dir)
+            X = vectorizer.transform(sample_docs)
+        except Exception as e:
+            raise ValueError(f"Model failed to load: {e}") from e
+
+        if X.shape[0] != len(sample_docs) or X.shape[1] == 0:
+            raise ValueError(f"Unexpected vector shape {X.shape}")
+        if X.nnz == 0:
+            raise ValueError("Model produced empty vectors for every sample document")
+        if not np.all(np.isfinite(X.data)):
+            raise ValueError("Model produced non-finite values")
+
+    def commit(self, version: str, staging_dir: Path, sample_docs: List[str]) -> Path:
+        """
+        Validate a staged version, move it into versions/ and publish it.
+
+        Returns:
+            The final artifact directory
+
+        Raises:
+            ValueError: If validation fails (the staging directory is removed)
+        """
+        try:
+            self.validate(staging_dir, sample_docs[:VALIDATION_DOCS])
+        except Exception:
+            self.discard(staging_dir)
+            raise
+
+        final_dir = self.artifact_dir(version)
+        if final_dir.exists():
+            raise ValueError(f"Version {version} already exists")
+        os.replace(staging_dir, final_dir)
+
+        write_atomic(self.root / CURRENT_FILE, version)
+        logger.info(f"Published model version {version}")
+
+        self.force_check()
+        self.prune()
+        return final_dir
+
+    def list_versions(self) -> List[str]:
+        """Committed versions, oldest first"""
+        if not self.versions_dir.exists():
+            return []
+        return sorted(
+            p.name for p in self.versions_dir.iterdir()
+            if p.is_dir() and not p.name.startswith(STAGING_PREFIX)
+        )
+
+    def prune(self):
+        """Delete old versions beyond keep_versions (never the published one)"""
+        current = self.current_version()
+        old = [v for v in self.list_versions() if v != current]
+        for version in old[:max(0, len(old) - (self.keep_versions - 1))]:
+            shutil.rmtree(self.artifact_dir(version), ignore_errors=True)
+            logger.info(f"Removed old model version {version}")
+
+
+# Global model store - shared by startup, the vectorizer dependency and retraining
+model_store = ModelStore(
+    settings.VECTOR_DIR,
+    vector_format=settings.VECTOR_FORMAT,
+    reload_interval=settings.MODEL_RELOAD_INTERVAL_SECONDS,
+    keep_versions=settings.MODEL_KEEP_VERSIONS
+)
@@ -0,0 +1,199 @@
+# app/services/near_duplicates.py
+from typing import Any, Dict, List, Optional, Set
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from app.Backend.app.core.config import settings
+
+_SHINGLE_MULT = np.uint32(0x01000193)   # FNV prime, mixes token hashes within a shingle
+
+
+class MinHasher:
+    """
+    MinHash signatures over token shingles of process_text output.
+
+    Shingles (word n-grams) are hashed to 32 bits; num_perm universal hash
+    functions (a * x + b mod 2^32, a odd) give the signature.
+    The fraction of equal signature positions estimates Jaccard similarity.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # uint32 arithmetic wraps, which is the mod 2^32
+        self._a = (rng.integers(0, 2 ** 31, num_perm, dtype=np.uint32) << np.uint32(1)) | np.uint32(1)
+        self._b = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint32)
+
+    def shingle_hashes(self, clean_text: str) -> np.ndarray:
+        """
+        Distinct 32-bit hashes of the word shingles: tokens are hashed once
+        with crc32, then each window of shingle_size token hashes is mixed
+        position-dependently, so "a b c" and "c b a" differ.
+        """
+        tokens = np.fromiter((zlib.crc32(t.encode()) for t in clean_text.split()), dtype=np.uint32)
+        if tokens.size == 0:
+            return tokens
+        n = min(self.shingle_size, tokens.size)
+        windows = tokens.size - n + 1
+        hashes = np.zeros(windows, dtype=np.uint32)
+        for offset in range(n):
+            hashes = hashes * _SHINGLE_MULT + tokens[offset:offset + windows]
+        return np.unique(hashes)
+
+    def signature(self, clean_text: str) -> np.ndarray:
+        """(num_perm,) uint32 signature; all-max for empty text"""
+        hashes = self.shingle_hashes(clean_text)
+        if hashes.size == 0:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        return (self._a[:, None] * hashes[None, :] + self._b[:, None]).min(axis=1)
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(a == b))
+
+
+@dataclass
+class NearDuplicate:
+    doc_id: str                        # sha256 of the processed text
+    duplicate_of: Optional[str]        # Most similar earlier document above the threshold
+    similarity: float                  # Estimated Jaccard similarity to duplicate_of (1.0 = same text)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH index of recently seen documents, with per-document match results.
+
+    Signatures are split into `bands` bands; documents sharing any band are
+    candidates, and the best candidate at or above `threshold` estimated
+    similarity is reported. Match results are stored per (document, job,
+    model version), so a near-duplicate resume matched against the same job
+    can reuse the result instead of being re-sent to the LLM (callers store
+    only results worth reusing).
+    The newest `max_docs` documents are kept (LRU). Counters in stats()
+    record how much work was avoided.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3, max_docs: int = 100000, max_results: int = 100000):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_docs = max_docs
+        self.max_results = max_results
+        self.hasher = MinHasher(num_perm, shingle_size)
+
+        self._signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self._results: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "lookups": 0,
+            "exact_duplicates": 0,
+            "near_duplicates": 0,
+            "results_reused": 0,
+            "llm_calls_avoided": 0,
+            "lookup_ms_total": 0.0,
+        }
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, doc_id: str, signature: np.ndarray):
+        self._signatures[doc_id] = signature
+        for band, key in zip(self._buckets, self._band_keys(signature)):
+            band.setdefault(key, set()).add(doc_id)
+        while len(self._signatures) > self.max_docs:
+            old_id, old_sig = self._signatures.popitem(last=False)
+            for band, key in zip(self._buckets, self._band_keys(old_sig)):
+                bucket = band.get(key)
+                if bucket is not None:
+                    bucket.discard(old_id)
+                    if not bucket:
+                        del band[key]
+
+    def match(self, clean_text: str) -> NearDuplicate:
+        """Find the most similar known document, then record this one"""
+        start = time.perf_counter()
+        doc_id = hashlib.sha256(clean_text.encode()).hexdigest()
+        signature = self.hasher.signature(clean_text)
+
+        with self._lock:
+            self._stats["lookups"] += 1
+            if doc_id in self._signatures:
+                self._signatures.move_to_end(doc_id)
+                self._stats["exact_duplicates"] += 1
+                result = NearDuplicate(doc_id, doc_id, 1.0)
+            else:
+                candidates = set()
+                for band, key in zip(self._buckets, self._band_keys(signature)):
+                    candidates.update(band.get(key, ()))
+                best_id, best_sim = None, 0.0
+                for cand in candidates:
+                    sim = MinHasher.similarity(signature, self._signatures[cand])
+                    if sim > best_sim:
+                        best_id, best_sim = cand, sim
+                if best_id is not None and best_sim >= self.threshold:
+                    self._stats["near_duplicates"] += 1
+                    result = NearDuplicate(doc_id, best_id, best_sim)
+                else:
+                    result = NearDuplicate(doc_id, None, 0.0)
+                self._insert(doc_id, signature)
+            self._stats["lookup_ms_total"] += (time.perf_counter() - start) * 1000
+        return result
+
+    def cached_result(self, dup: NearDuplicate, job_key: str) -> Optional[Dict[str, Any]]:
+        """Stored result of dup.duplicate_of against job_key; counted as avoided work"""
+        if dup.duplicate_of is None:
+            return None
+        with self._lock:
+            result = self._results.get((dup.duplicate_of, job_key))
+            if result is None:
+                return None
+            self._results.move_to_end((dup.duplicate_of, job_key))
+            self._stats["results_reused"] += 1
+            if result.get("used_llm"):
+                self._stats["llm_calls_avoided"] += 1
+            return dict(result)
+
+    def store_result(self, doc_id: str, job_key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._results[(doc_id, job_key)] = dict(result)
+            self._results.move_to_end((doc_id, job_key))
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["lookups"]
+            stats["documents"] = len(self._signatures)
+            stats["stored_results"] = len(self._results)
+            stats["avg_lookup_ms"] = round(stats.pop("lookup_ms_total") / lookups, 4) if lookups else 0.0
+            stats["reuse_ratio"] = round(stats["results_reused"] / lookups, 4) if lookups else 0.0
+            stats["threshold"] = self.threshold
+            return stats
+
+
+def job_key(job_clean: str, model_version: Optional[str]) -> str:
+    """Key of a (processed job text, model version) pair for stored results"""
+    return f"{model_version}:{hashlib.sha256(job_clean.encode()).hexdigest()}"
+
+
+# Global near-duplicate index - per worker process, in memory
+near_duplicate_index = NearDuplicateIndex(
+    threshold=settings.NEAR_DUP_THRESHOLD,
+    num_perm=settings.NEAR_DUP_NUM_PERM,
+    bands=settings.NEAR_DUP_BANDS,
+    shingle_size=settings.NEAR_DUP_SHINGLE_SIZE,
+    max_docs=settings.NEAR_DUP_MAX_DOCS
+)
@@ -1,60 +1,232 @@
 # app/services/pdf_parser.py
 import io
-from typing import Optional
+import re
+import time
+from typing import Optional, Tuple
 try:
     import pypdf as PyPDF2
 except ImportError:
     import PyPDF2
-    
+
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Producers whose output is usually multi-column / absolutely positioned text.
+# pypdf tends to glue words together on these, so go straight to pdfplumber.
+LAYOUT_HEAVY_PRODUCERS = (
+    "canva",
+    "indesign",
+    "quartz pdfcontext",
+    "figma",
+    "illustrator",
+)
+
+# Quality thresholds for accepting the fast pypdf pass
+MIN_CHARS_PER_PAGE = 200        # Less than this per page usually means missed text
+MIN_WHITESPACE_RATIO = 0.08     # Normal prose is ~15% whitespace
+MAX_LONG_TOKEN_RATIO = 0.05     # Share of tokens > 25 chars (words glued together)
+LONG_TOKEN_LENGTH = 25
+
+# Pages inspected when counting fonts (cheap signal, no need to scan all pages)
+SIGNAL_SAMPLE_PAGES = 3
+
+_TOKEN_RE = re.compile(r"\S+")
+
+
 class PDFParser:
     """
-    PDF parser with multiple extraction strategies.
-    Tries pdfplumber first (better formatting), falls back to PyPDF2.
+    PDF parser with adaptive extraction strategy.
+    Runs a quick pypdf pass and escalates to pdfplumber only when
+    cheap document signals or text quality heuristics say it is needed.
     """
-    
+
     @staticmethod
     def extract_text_from_bytes(pdf_bytes: bytes) -> str:
         """
-        Extract text from PDF bytes using multiple strategies.
-        
+        Extract text from PDF bytes using the adaptive strategy.
+
         Args:
             pdf_bytes: Raw PDF file bytes
-            
+
         Returns:
             Extracted text as string
-            
+
+        Raises:
+            ValueError: If PDF cannot be parsed or is empty
+        """
+        text, _ = PDFParser.extract_text_with_stats(pdf_bytes)
+        return text
+
+    @staticmethod
+    def extract_text_with_stats(pdf_bytes: bytes) -> Tuple[str, dict]:
+        """
+        Extract text and report which strategy was used and how long it took.
+
+        Args:
+            pdf_bytes: Raw PDF file bytes
+
+        Returns:
+            Tuple of (extracted_text, stats_dict). stats_dict contains
+            strategy, escalation_reason, per-extractor timings (ms) and
+            the document signals used for the decision.
+
         Raises:
             ValueError: If PDF cannot be parsed or is empty
         """
         if not pdf_bytes:
             raise ValueError("Empty PDF file")
-        
-        # Try pdfplumber first (better text extraction)
+
+        start = time.perf_counter()
+        stats = {
+            "strategy": None,
+            "escalation_reason": None,
+            "pypdf_ms": None,
+            "pdfplumber_ms": None,
+            "elapsed_ms": None,
+            "signals": {},
+        }
+
+        fast_text = ""
+        fast_error = None
+        escalation_reason = None
+
+        # 1) Cheap signals + quick pypdf pass (same reader, parsed once)
+        t0 = time.perf_counter()
+        try:
+            with io.BytesIO(pdf_bytes) as pdf_file:
+                reader = PyPDF2.PdfReader(pdf_file)
+                signals = PDFParser._read_signals(reader)
+                stats["signals"] = signals
+
+                escalation_reason = PDFParser._signal_escalation_reason(signals)
+                if escalation_reason is None:
+                    fast_text = PDFParser._extract_pages(reader)
+                    escalation_reason = PDFParser._quality_escalation_reason(
+                        fast_text, signals["num_pages"]
+                    )
+        except Exception as e:
+            logger.warning(f"pypdf extraction failed: {e}")
+            fast_error = e
+            escalation_reason = "pypdf_failed"
+        stats["pypdf_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+
+        if escalation_reason is None:
+            stats["strategy"] = "pypdf"
+            stats["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            logger.info(f"Extracted {len(fast_text)} characters using pypdf in {stats['elapsed_ms']}ms")
+            return fast_text, stats
+
+        # No fonts on any page means an image-only (scanned) PDF; pdfplumber cannot help
+        signals = stats["signals"]
+        if (
+            escalation_reason == "empty_text"
+            and signals.get("sampled_font_count") == 0
+            and signals.get("num_pages", 0) <= SIGNAL_SAMPLE_PAGES
+        ):
+            raise ValueError("PDF has no text layer (scanned image?)")
+
+        # 2) Escalate to pdfplumber (better layout handling, slower)
+        stats["escalation_reason"] = escalation_reason
+        t0 = time.perf_counter()
         try:
             text = PDFParser._extract_with_pdfplumber(pdf_bytes)
-            if text and text.strip():
-                logger.info(f"Extracted {len(text)} characters using pdfplumber")
-                return text
         except Exception as e:
             logger.warning(f"pdfplumber extraction failed: {e}")
-        
-        # Fall back to PyPDF2
+            text = ""
+        stats["pdfplumber_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+
+        if text and text.strip():
+            stats["strategy"] = "pdfplumber"
+        elif fast_text and fast_text.strip():
+            # pdfplumber gave nothing better, keep the low-quality fast pass
+            text = fast_text
+            stats["strategy"] = "pypdf"
+        elif fast_error is not None:
+            raise ValueError(f"Failed to extract text from PDF: {fast_error}")
+        else:
+            raise ValueError("PDF appears to be empty or unreadable")
+
+        stats["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(
+            f"Extracted {len(text)} characters using {stats['strategy']} in {stats['elapsed_ms']}ms "
+            f"(escalated: {escalation_reason})"
+        )
+        return text, stats
+
+    @staticmethod
+    def _read_signals(reader) -> dict:
+        """Read cheap document signals: producer, page count, font and object counts"""
+        producer = None
         try:
-            text = PDFParser._extract_with_pypdf2(pdf_bytes)
-            if text and text.strip():
-                logger.info(f"Extracted {len(text)} characters using PyPDF2")
-                return text
-        except Exception as e:
-            logger.error(f"PyPDF2 extraction failed: {e}")
-            raise ValueError(f"Failed to extract text from PDF: {e}")
-        
-        raise ValueError("PDF appears to be empty or unreadable")
-    
+            if reader.metadata:
+                producer = reader.metadata.get("/Producer")
+        except Exception:
+            pass
+
+        try:
+            num_objects = int(reader.trailer.get("/Size", 0))
+        except Exception:
+            num_objects = 0
+
+        num_pages = len(reader.pages)
+        fonts = set()
+        for page in reader.pages[:SIGNAL_SAMPLE_PAGES]:
+            try:
+                resources = page.get("/Resources")
+                font_dict = resources.get_object().get("/Font") if resources else None
+                if font_dict:
+                    fonts.update(font_dict.get_object().keys())
+            except Exception:
+                continue
+
+        return {
+            "producer": str(producer) if producer else None,
+            "num_pages": num_pages,
+            "num_objects": num_objects,
+            "sampled_font_count": len(fonts),
+        }
+
+    @staticmethod
+    def _signal_escalation_reason(signals: dict) -> Optional[str]:
+        """Decide from document signals alone whether the fast pass is pointless"""
+        producer = (signals.get("producer") or "").lower()
+        if any(name in producer for name in LAYOUT_HEAVY_PRODUCERS):
+            return "layout_heavy_producer"
+        return None
+
+    @staticmethod
+    def _quality_escalation_reason(text: str, num_pages: int) -> Optional[str]:
+        """Check extracted text quality, return a reason to escalate or None if acceptable"""
+        stripped = text.strip() if text else ""
+        if not stripped:
+            return "empty_text"
+
+        if len(stripped) / max(num_pages, 1) < MIN_CHARS_PER_PAGE:
+            return "too_few_chars_per_page"
+
+        whitespace = sum(1 for c in stripped if c.isspace())
+        if whitespace / len(stripped) < MIN_WHITESPACE_RATIO:
+            return "broken_spacing"
+
+        tokens = _TOKEN_RE.findall(stripped)
+        long_tokens = sum(1 for t in tokens if len(t) > LONG_TOKEN_LENGTH)
+        if tokens and long_tokens / len(tokens) > MAX_LONG_TOKEN_RATIO:
+            return "broken_spacing"
+
+        return None
+
+    @staticmethod
+    def _extract_pages(reader) -> str:
+        """Extract text from an already opened pypdf reader"""
+        text_parts = []
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text_parts.append(page_text)
+        return "\n\n".join(text_parts)
+
     @staticmethod
     def _extract_with_pdfplumber(pdf_bytes: bytes) -> str:
         """Extract text using pdfplumber (better formatting)"""
@@ -62,41 +234,33 @@ class PDFParser:
             import pdfplumber
         except ImportError:
             raise ImportError("pdfplumber not installed")
-        
+
         text_parts = []
-        
+
         with io.BytesIO(pdf_bytes) as pdf_file:
             with pdfplumber.open(pdf_file) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
                         text_parts.append(page_text)
-        
+
         return "\n\n".join(text_parts)
-    
+
     @staticmethod
     def _extract_with_pypdf2(pdf_bytes: bytes) -> str:
-        """Extract text using PyPDF2 (fallback)"""
-        text_parts = []
-        
+        """Extract text using PyPDF2 / pypdf"""
         with io.BytesIO(pdf_bytes) as pdf_file:
             reader = PyPDF2.PdfReader(pdf_file)
-            
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-        
-        return "\n\n".join(text_parts)
-    
+            return PDFParser._extract_pages(reader)
+
     @staticmethod
     def extract_metadata(pdf_bytes: bytes) -> dict:
         """
         Extract PDF metadata.
-        
+
         Args:
             pdf_bytes: Raw PDF file bytes
-            
+
         Returns:
             Dictionary with metadata (title, author, pages, etc.)
         """
@@ -107,12 +271,12 @@ class PDFParser:
             "creator": None,
             "producer": None
         }
-        
+
         try:
             with io.BytesIO(pdf_bytes) as pdf_file:
                 reader = PyPDF2.PdfReader(pdf_file)
                 metadata["num_pages"] = len(reader.pages)
-                
+
                 if reader.metadata:
                     metadata["title"] = reader.metadata.get("/Title")
                     metadata["author"] = reader.metadata.get("/Author")
@@ -120,22 +284,24 @@ class PDFParser:
                     metadata["producer"] = reader.metadata.get("/Producer")
         except Exception as e:
             logger.warning(f"Failed to extract metadata: {e}")
-        
+
         return metadata
 
 
 def parse_resume_pdf(pdf_bytes: bytes) -> tuple[str, dict]:
     """
     Parse resume PDF and return text + metadata.
-    
+
     Args:
         pdf_bytes: Raw PDF file bytes
-        
+
     Returns:
-        Tuple of (extracted_text, metadata_dict)
+        Tuple of (extracted_text, metadata_dict). metadata_dict["extraction"]
+        holds the strategy used and its timings.
     """
     parser = PDFParser()
-    text = parser.extract_text_from_bytes(pdf_bytes)
+    text, stats = parser.extract_text_with_stats(pdf_bytes)
     metadata = parser.extract_metadata(pdf_bytes)
-    
+    metadata["extraction"] = stats
+
     return text, metadata
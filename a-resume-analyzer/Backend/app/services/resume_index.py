@@ -0,0 +1,236 @@
+# app/services/resume_index.py
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import json
+import logging
+import threading
+
+import scipy.sparse as sp
+from sqlalchemy.orm import Session
+
+from app.Backend.app.core.database import SessionLocal, ResumeBuild, ResumeVector
+from app.Backend.app.services.preprocessing import process_text
+
+logger = logging.getLogger(__name__)
+
+
+def resume_text(resume_data: Dict[str, Any]) -> str:
+    """Flatten stored resume_content (ResumeBuilderRequest fields) into matchable text"""
+    parts = [resume_data.get("summary") or ""]
+    for exp in resume_data.get("experience") or []:
+        parts.extend([exp.get("job_title", ""), exp.get("company", ""), exp.get("description", "")])
+    for edu in resume_data.get("education") or []:
+        parts.extend([edu.get("degree", ""), edu.get("field", ""), edu.get("school", ""), edu.get("description") or ""])
+    parts.extend(resume_data.get("skills") or [])
+    return "\n".join(p for p in parts if p)
+
+
+class ResumeIndex:
+    """
+    Inverted index of stored resumes (ResumeBuild rows) for job -> resumes ranking.
+
+    Each resume is vectorized once; its TF-IDF weights are kept in per-term
+    postings together with a per-term upper bound (max weight). A job is
+    scored term-at-a-time in decreasing order of its terms' maximum
+    contribution (MaxScore): once the k-th best accumulated score exceeds
+    what the remaining terms could add, no new candidates are admitted and
+    the rest only update existing accumulators. Results equal exhaustive
+    cosine scoring.
+
+    The index follows ResumeBuild by id: new rows are added by
+    generate_resume and picked up on every search (rows inserted by other
+    workers), and it is rebuilt when the published model version changes.
+    Rows are read from resume_vectors where possible (stored vectors of the
+    same model version are used as-is), and warm() builds the index in a
+    background thread at startup and after a model reload, so searches do
+    not pay for the rebuild.
+    """
+
+    def __init__(self):
+        self.model_version: Optional[str] = None
+        self.postings: Dict[int, Dict[int, float]] = {}     # term column -> {resume_id: weight}
+        self.max_weight: Dict[int, float] = {}              # term column -> upper bound of its weights
+        self.doc_terms: Dict[int, List[int]] = {}           # resume_id -> term columns (for replace)
+        self.owners: Dict[int, int] = {}                    # resume_id -> user_id
+        self.last_id = 0                                    # Highest ResumeBuild.id synced from the database
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.doc_terms)
+
+    def _reset(self, model_version: Optional[str]):
+        self.model_version = model_version
+        self.postings, self.max_weight, self.doc_terms, self.owners = {}, {}, {}, {}
+        self.last_id = 0
+
+    def _remove(self, resume_id: int):
+        for col in self.doc_terms.pop(resume_id, ()):
+            posting = self.postings.get(col)
+            if posting is not None:
+                posting.pop(resume_id, None)
+                if not posting:
+                    del self.postings[col]
+                    del self.max_weight[col]
+        self.owners.pop(resume_id, None)
+
+    def _add_rows(self, rows: List[Tuple[int, int, str]], vectorizer):
+        """Vectorize (resume_id, user_id, resume_content) rows and insert them into the postings"""
+        docs = []
+        for resume_id, user_id, content in rows:
+            try:
+                text = process_text(resume_text(json.loads(content)))
+            except (ValueError, TypeError, AttributeError):
+                logger.warning(f"Skipping resume {resume_id}: unreadable resume_content")
+                continue
+            if text:
+                docs.append((resume_id, user_id, text))
+        if not docs:
+            return
+
+        X = vectorizer.transform([text for _, _, text in docs])
+        self._insert([(resume_id, user_id) for resume_id, user_id, _ in docs], X)
+
+    def _add_stored(self, rows: List[tuple], vectorizer, model_version: Optional[str]):
+        """
+        Insert sync rows of (resume_id, user_id, resume_content) plus their
+        resume_vectors columns: the stored vector if it was computed with
+        model_version, else a transform of the stored processed text; rows
+        without a resume_vectors entry are preprocessed from resume_content.
+        """
+        # resume_vectors imports this module (resume_text)
+        from app.Backend.app.services.resume_vectors import unpack_vector
+
+        stored, retransform, unprocessed = [], [], []
+        for resume_id, user_id, content, text, version, n_features, indices, weights in rows:
+            if text is None:
+                unprocessed.append((resume_id, user_id, content))
+            elif version == model_version:
+                stored.append(((resume_id, user_id), unpack_vector(n_features, indices, weights)))
+            elif text:
+                retransform.append(((resume_id, user_id), text))
+
+        if stored:
+            self._insert([owner for owner, _ in stored], sp.vstack([vec for _, vec in stored]))
+        if retransform:
+            self._insert([owner for owner, _ in retransform], vectorizer.transform([text for _, text in retransform]))
+        self._add_rows(unprocessed, vectorizer)
+
+    def _insert(self, owners: List[Tuple[int, int]], X):
+        """Insert the rows of X for (resume_id, user_id) owners into the postings"""
+        X = sp.csr_matrix(X)
+        for row, (resume_id, user_id) in enumerate(owners):
+            self._remove(resume_id)
+            start, end = X.indptr[row], X.indptr[row + 1]
+            cols = X.indices[start:end].tolist()
+            for col, weight in zip(cols, X.data[start:end].tolist()):
+                if weight <= 0:
+                    continue
+                self.postings.setdefault(col, {})[resume_id] = weight
+                if weight > self.max_weight.get(col, 0.0):
+                    self.max_weight[col] = weight
+            self.doc_terms[resume_id] = cols
+            self.owners[resume_id] = user_id
+
+    def add(self, resume: ResumeBuild, vectorizer, model_version: Optional[str]):
+        """Index (or re-index) one resume right after it is stored"""
+        with self._lock:
+            if model_version != self.model_version:
+                return  # Rebuilt from the database on the next search
+            self._add_rows([(resume.id, resume.user_id, resume.resume_content)], vectorizer)
+
+    def sync(self, db: Session, vectorizer, model_version: Optional[str], batch_size: int = 500):
+        """Catch up with rows inserted since the last sync; full rebuild on a new model version"""
+        with self._lock:
+            if model_version != self.model_version:
+                self._reset(model_version)
+            while True:
+                rows = (
+                    db.query(
+                        ResumeBuild.id, ResumeBuild.user_id, ResumeBuild.resume_content,
+                        ResumeVector.processed_text, ResumeVector.model_version,
+                        ResumeVector.n_features, ResumeVector.indices, ResumeVector.weights
+                    )
+                    .outerjoin(ResumeVector, ResumeVector.resume_id == ResumeBuild.id)
+                    .filter(ResumeBuild.id > self.last_id)
+                    .order_by(ResumeBuild.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not rows:
+                    return
+                self._add_stored([tuple(r) for r in rows], vectorizer, model_version)
+                self.last_id = rows[-1][0]
+
+    def warm(self, vectorizer, model_version: Optional[str]):
+        """Sync in a background thread (at startup and after a model reload)"""
+        def run():
+            db = SessionLocal()
+            try:
+                self.sync(db, vectorizer, model_version)
+                logger.info(f"Resume index warmed: {len(self)} resumes (model {model_version})")
+            except Exception as e:
+                logger.warning(f"⚠️  Resume index warm-up failed: {e}")
+            finally:
+                db.close()
+
+        threading.Thread(target=run, name="resume-index-warm", daemon=True).start()
+
+    def search(self, job_description: str, vectorizer, top_k: int = 10, job_vector=None) -> Dict[str, Any]:
+        """
+        Top-k resumes for a job by TF-IDF cosine.
+        job_vector, if given, is the job's precomputed vector (job_description is then not preprocessed).
+
+        Returns:
+            Dict with total_resumes, candidates (resumes that received a score) and
+            matches [{resume_id, user_id, match_score}], best first
+
+        Raises:
+            ValueError: If the job description has no meaningful content
+        """
+        if job_vector is None:
+            job_clean = process_text(job_description)
+            if not job_clean:
+                raise ValueError("Job description has no meaningful content")
+            job_vector = vectorizer.transform([job_clean])
+        q = sp.csr_matrix(job_vector)
+
+        with self._lock:
+            # Query terms by maximum possible contribution, largest first
+            terms = sorted(
+                ((weight * self.max_weight[col], col, weight)
+                 for col, weight in zip(q.indices.tolist(), q.data.tolist())
+                 if col in self.postings and weight > 0),
+                reverse=True
+            )
+            remaining = [0.0] * (len(terms) + 1)
+            for i in range(len(terms) - 1, -1, -1):
+                remaining[i] = remaining[i + 1] + terms[i][0]
+
+            acc: Dict[int, float] = {}
+            threshold = 0.0
+            created = 0
+            for i, (_, col, weight) in enumerate(terms):
+                posting = self.postings[col]
+                if len(acc) >= top_k and remaining[i] < threshold:
+                    # Remaining terms cannot lift a new resume into the top k:
+                    # drop hopeless accumulators and only update the rest
+                    acc = {d: score for d, score in acc.items() if score + remaining[i] >= threshold}
+                    for resume_id in acc.keys() & posting.keys():
+                        acc[resume_id] += weight * posting[resume_id]
+                else:
+                    for resume_id, w in posting.items():
+                        acc[resume_id] = acc.get(resume_id, 0.0) + weight * w
+                    created = len(acc)
+                if len(acc) >= top_k:
+                    threshold = heapq.nlargest(top_k, acc.values())[-1]
+
+            top = heapq.nlargest(top_k, acc.items(), key=lambda item: (item[1], -item[0]))
+            matches = [
+                {"resume_id": resume_id, "user_id": self.owners.get(resume_id), "match_score": round(min(score, 1.0), 3)}
+                for resume_id, score in top
+            ]
+            return {"total_resumes": len(self.doc_terms), "candidates": created, "matches": matches}
+
+
+# Global resume index - warmed in the background, synced from ResumeBuild on each search
+resume_index = ResumeIndex()
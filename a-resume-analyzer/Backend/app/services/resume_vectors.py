@@ -0,0 +1,100 @@
+# app/services/resume_vectors.py
+from typing import Optional, Tuple
+import json
+import logging
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.Backend.app.core.database import ResumeBuild, ResumeVector
+from app.Backend.app.services.preprocessing import process_text
+from app.Backend.app.services.resume_index import resume_text
+
+logger = logging.getLogger(__name__)
+
+
+def pack_vector(row) -> Tuple[int, bytes, bytes]:
+    """(n_features, int32 indices bytes, float64 weights bytes) of a 1 x n sparse row"""
+    row = sp.csr_matrix(row)
+    return (
+        row.shape[1],
+        row.indices.astype(np.int32).tobytes(),
+        row.data.astype(np.float64).tobytes(),
+    )
+
+
+def unpack_vector(n_features: int, indices: bytes, weights: bytes) -> sp.csr_matrix:
+    cols = np.frombuffer(indices, dtype=np.int32)
+    data = np.frombuffer(weights, dtype=np.float64)
+    return sp.csr_matrix((data, cols, np.array([0, cols.size], dtype=np.int32)), shape=(1, n_features))
+
+
+class ResumeVectorStore:
+    """
+    Persisted preprocessing and vectors of stored resumes (resume_vectors table).
+
+    process_text output does not depend on the model, so it is computed
+    once per resume. The sparse vector is tagged with the model version it
+    was computed with; after a retrain it is recomputed from the stored
+    text on the next lookup (transform only) and written back. Resumes
+    created before this table existed are filled in on first use.
+    """
+
+    @staticmethod
+    def _vectorize(record: ResumeVector, vectorizer, model_version: Optional[str]) -> sp.csr_matrix:
+        row = vectorizer.transform([record.processed_text])
+        record.n_features, record.indices, record.weights = pack_vector(row)
+        record.model_version = model_version
+        return row
+
+    def store(self, db: Session, resume: ResumeBuild, vectorizer, model_version: Optional[str]) -> ResumeVector:
+        """
+        Preprocess and vectorize a resume and save (or replace) its row. Commits.
+
+        Raises:
+            ValueError: If the resume has no meaningful content after preprocessing
+        """
+        text = process_text(resume_text(json.loads(resume.resume_content)))
+        if not text:
+            raise ValueError(f"Resume {resume.id} has no meaningful content after preprocessing")
+
+        record = db.get(ResumeVector, resume.id) or ResumeVector(resume_id=resume.id)
+        record.processed_text = text
+        record.token_count = len(text.split())
+        self._vectorize(record, vectorizer, model_version)
+        db.merge(record)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # Stored concurrently by another request; same content
+        return record
+
+    def get(self, db: Session, resume: ResumeBuild, vectorizer,
+            model_version: Optional[str]) -> Tuple[sp.csr_matrix, int, bool]:
+        """
+        Vector of a stored resume for the given model version.
+
+        Returns:
+            (1 x n sparse vector, token count, True if the stored vector was used as-is)
+
+        Raises:
+            ValueError: If the resume has no meaningful content after preprocessing
+        """
+        record = db.get(ResumeVector, resume.id)
+        if record is None:
+            record = self.store(db, resume, vectorizer, model_version)
+            return unpack_vector(record.n_features, record.indices, record.weights), record.token_count, False
+
+        if record.model_version == model_version:
+            return unpack_vector(record.n_features, record.indices, record.weights), record.token_count, True
+
+        logger.info(f"Re-vectorizing resume {resume.id}: {record.model_version} -> {model_version}")
+        row = self._vectorize(record, vectorizer, model_version)
+        db.commit()
+        return row, record.token_count, False
+
+
+# Global resume vector store - rows live in the database, shared by all workers
+resume_vector_store = ResumeVectorStore()
@@ -0,0 +1,184 @@
+# app/services/retrainer.py
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pathlib import Path
+import importlib
+import json
+import logging
+import sys
+import threading
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.model_store import ModelStore, model_store, new_version, write_atomic, file_lock
+
+logger = logging.getLogger(__name__)
+
+STATUS_FILE = "retrain_status.json"
+LOCK_FILE = "retrain.lock"
+
+
+class ModelRetrainer:
+    """
+    Retrains the vectorizer in a background thread, either with a full refit
+    or incrementally from the published model's document frequencies.
+
+    The new model is written to a staging directory of the model store,
+    validated and published by flipping the store's "current" pointer, so
+    requests keep using the previous model until the switch. Progress is
+    kept in a status file next to the pointer, which every server process
+    can read, and a running retrain blocks new ones across processes.
+    """
+
+    def __init__(self, store: ModelStore, timeout_seconds: int = 3600):
+        self.store = store
+        self.timeout_seconds = timeout_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def status_path(self) -> Path:
+        return self.store.root / STATUS_FILE
+
+    def status(self) -> Dict[str, Any]:
+        """Last known retrain status plus the currently published version"""
+        try:
+            status = json.loads(self.status_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            status = {"state": "idle"}
+        status["current_version"] = self.store.current_version()
+        return status
+
+    def is_running(self) -> bool:
+        """True if a retrain is in progress (a stale "running" status counts as dead)"""
+        status = self.status()
+        if status.get("state") != "running":
+            return False
+        updated_at = datetime.fromisoformat(status["updated_at"].rstrip("Z"))
+        return (datetime.now() - updated_at).total_seconds() < self.timeout_seconds
+
+    def start(self, mode: str = "full") -> Dict[str, Any]:
+        """
+        Start a retrain in the background.
+
+        Args:
+            mode: "full" refits on the whole corpus, "incremental" absorbs new
+                documents into the published model's document frequencies
+
+        Returns:
+            The initial status
+
+        Raises:
+            RuntimeError: If a retrain is already running
+        """
+        with self._lock, self._start_lock():
+            if self.is_running():
+                raise RuntimeError("A retrain is already running")
+
+            version = new_version()
+            now = datetime.now().isoformat() + "Z"
+            self._write_status({
+                "state": "running",
+                "stage": "queued",
+                "mode": mode,
+                "version": version,
+                "started_at": now,
+                "updated_at": now,
+            })
+
+        target = self._run_incremental if mode == "incremental" else self._run
+        thread = threading.Thread(target=target, args=(version,), name=f"retrain-{version}", daemon=True)
+        thread.start()
+        logger.info(f"Started retrain of model version {version}")
+        return self.status()
+
+    def _start_lock(self):
+        """
+        Lock on a file next to the status file, held while start() checks and
+        claims the status, so two server processes cannot both start a retrain
+        """
+        self.store.root.mkdir(parents=True, exist_ok=True)
+        return file_lock(self.store.root / LOCK_FILE)
+
+    def _run(self, version: str):
+        staging_dir: Optional[Path] = None
+        try:
+            self._update(stage="loading_corpus")
+            train = _import_training("train_vectorizer")
+            watermark = train.corpus_watermark()
+            corpus = train.load_corpus_from_data_folder() or train.DEFAULT_CORPUS
+            if len(corpus) < 2:
+                raise ValueError("Need at least 2 documents to train. Add more data to data/processed/")
+
+            self._update(stage="training", num_docs=len(corpus))
+            staging_dir = self.store.stage(version)
+            meta = train.train_artifacts(corpus, staging_dir, version, watermark)
+
+            self._update(stage="validating")
+            self.store.commit(version, staging_dir, corpus)
+
+            self._update(
+                state="completed",
+                stage="published",
+                trained_at=meta["created_at"],
+                finished_at=datetime.now().isoformat() + "Z"
+            )
+            logger.info(f"Retrain completed: version {version} published")
+        except Exception as e:
+            logger.error(f"Retrain of version {version} failed: {e}")
+            if staging_dir is not None:
+                self.store.discard(staging_dir)
+            self._update(state="failed", error=str(e), finished_at=datetime.now().isoformat() + "Z")
+
+    def _run_incremental(self, version: str):
+        staging_dir: Optional[Path] = None
+        try:
+            self._update(stage="loading_corpus")
+            incremental = _import_training("incremental_idf")
+            base_version = self.store.current_version()
+
+            self._update(stage="training", base_version=base_version)
+            staging_dir = self.store.stage(version)
+            result = incremental.update_artifacts(self.store.artifact_dir(base_version), staging_dir, version)
+            if result is None:
+                self.store.discard(staging_dir)
+                self._update(state="completed", stage="no_new_documents", finished_at=datetime.now().isoformat() + "Z")
+                return
+            meta, documents = result
+
+            self._update(stage="validating", num_docs=meta["num_docs"], **meta["incremental"])
+            self.store.commit(version, staging_dir, documents)
+
+            self._update(
+                state="completed",
+                stage="published",
+                trained_at=meta["created_at"],
+                finished_at=datetime.now().isoformat() + "Z"
+            )
+            logger.info(f"Incremental update completed: version {version} published")
+        except Exception as e:
+            logger.error(f"Incremental update of version {version} failed: {e}")
+            if staging_dir is not None:
+                self.store.discard(staging_dir)
+            self._update(state="failed", error=str(e), finished_at=datetime.now().isoformat() + "Z")
+
+    def _update(self, **fields):
+        status = self.status()
+        status.update(fields)
+        status["updated_at"] = datetime.now().isoformat() + "Z"
+        self._write_status(status)
+
+    def _write_status(self, status: Dict[str, Any]):
+        status.pop("current_version", None)
+        self.store.root.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.status_path, json.dumps(status, indent=2))
+
+
+def _import_training(module: str):
+    """Import an ml.* training module (lives in the project root, outside the Backend package)"""
+    project_root = Path(__file__).resolve().parents[3]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+    return importlib.import_module(f"ml.{module}")
+
+
+# Global retrainer - shares the model store with the vectorizer dependency
+model_retrainer = ModelRetrainer(model_store, timeout_seconds=settings.MODEL_RETRAIN_TIMEOUT_SECONDS)
@@ -0,0 +1,290 @@
+# app/services/sharded_index.py
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import heapq
+import json
+import logging
+import multiprocessing
+import shutil
+import threading
+
+import numpy as np
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.embeddings import DenseIndex
+
+logger = logging.getLogger(__name__)
+
+SHARD_META_FILE = "shards.json"
+SHARD_VECTORS_FILE = "vectors.npy"
+SHARD_IDS_FILE = "ids.npy"
+
+
+class ShardError(RuntimeError):
+    """A shard process died or did not answer in time"""
+
+
+def write_shards(shard_dir: Path, ids: np.ndarray, vectors: np.ndarray, n_shards: int,
+                 model_version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Partition (ids, vectors) into n_shards directories by id % n_shards.
+
+    Each shard holds vectors.npy (float32) and ids.npy, opened memory-mapped
+    by its process. shards.json is written last, so a half-written set is
+    never started.
+    """
+    shard_dir = Path(shard_dir)
+    if shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    shard_dir.mkdir(parents=True)
+
+    ids = np.asarray(ids, dtype=np.int64)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    dim = vectors.shape[1] if vectors.ndim == 2 else 0
+    sizes = []
+    for shard in range(n_shards):
+        rows = np.flatnonzero(ids % n_shards == shard)
+        path = shard_dir / f"shard_{shard}"
+        path.mkdir()
+        np.save(path / SHARD_VECTORS_FILE, vectors[rows].reshape(len(rows), dim))
+        np.save(path / SHARD_IDS_FILE, ids[rows])
+        sizes.append(int(rows.size))
+
+    meta = {"n_shards": n_shards, "dim": dim, "count": int(ids.size), "sizes": sizes, "model_version": model_version}
+    (shard_dir / SHARD_META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta
+
+
+def _shard_main(shard_path: str, conn):
+    """Shard process: memory-map one shard and answer (query, top_k) requests until closed"""
+    index = DenseIndex.load(str(Path(shard_path) / SHARD_VECTORS_FILE))
+    ids = np.load(Path(shard_path) / SHARD_IDS_FILE, mmap_mode="r", allow_pickle=False)
+    conn.send(("ready", len(index)))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        query, top_k = message
+        rows, scores = index.search(query, top_k)
+        conn.send((ids[rows[0]].tolist(), scores[0].tolist()))
+
+
+class ShardWorker:
+    """One shard subprocess and the pipe used to query it (one request at a time)"""
+
+    def __init__(self, shard_id: int, shard_path: Path, context):
+        self.shard_id = shard_id
+        self.shard_path = shard_path
+        self.context = context
+        self.process = None
+        self.conn = None
+        self.size = 0
+        self.restarts = 0
+        self.restarting = False
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, timeout: float):
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_shard_main,
+            args=(str(self.shard_path), child_conn),
+            name=f"shard-{self.shard_id}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        if not self.conn.poll(timeout):
+            self.stop()
+            raise ShardError(f"Shard {self.shard_id} did not start within {timeout}s")
+        _, self.size = self.conn.recv()
+
+    def stop(self):
+        if self.conn is not None:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+            self.process = None
+
+    def restart(self, timeout: float):
+        logger.warning(f"Restarting shard {self.shard_id}")
+        with self._lock:
+            self.stop()
+            self.restarts += 1
+            self.start(timeout)
+
+    def query(self, query: np.ndarray, top_k: int, timeout: float) -> Tuple[List[int], List[float]]:
+        """
+        Raises:
+            ShardError: If the process is gone or does not answer within timeout
+        """
+        with self._lock:
+            if not self.alive:
+                raise ShardError(f"Shard {self.shard_id} is not running")
+            try:
+                self.conn.send((query, top_k))
+                if not self.conn.poll(timeout):
+                    raise ShardError(f"Shard {self.shard_id} timed out after {timeout}s")
+                return self.conn.recv()
+            except (EOFError, BrokenPipeError, OSError) as e:
+                raise ShardError(f"Shard {self.shard_id} failed: {e}")
+
+
+class ShardCoordinator:
+    """
+    Scatter-gather search over memory-mapped index shards in local subprocesses.
+
+    A query is sent to every shard in parallel; each returns its own top-k
+    by exact inner product and the coordinator merges them with a heap. A
+    shard that has died or timed out is restarted in a background thread
+    (it re-maps its files); the query, and any query until the restart
+    completes, is answered from the remaining shards without waiting, and
+    the shard is reported under "failed_shards". Shard processes are started with "spawn", so they do
+    not inherit the server's threads or sockets.
+    """
+
+    def __init__(self, shard_dir: Path, timeout: float = 2.0, start_timeout: float = 30.0):
+        self.shard_dir = Path(shard_dir)
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.meta: Dict[str, Any] = {}
+        self.workers: List[ShardWorker] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.RLock()
+
+    @property
+    def running(self) -> bool:
+        return bool(self.workers)
+
+    @property
+    def built(self) -> bool:
+        return (self.shard_dir / SHARD_META_FILE).exists()
+
+    def start(self):
+        """Start one process per shard listed in shards.json"""
+        with self._lock:
+            self.stop()
+            self.meta = json.loads((self.shard_dir / SHARD_META_FILE).read_text(encoding="utf-8"))
+            context = multiprocessing.get_context("spawn")
+            workers = [
+                ShardWorker(shard, self.shard_dir / f"shard_{shard}", context)
+                for shard in range(self.meta["n_shards"])
+            ]
+            try:
+                for worker in workers:
+                    worker.start(self.start_timeout)
+            except ShardError:
+                for worker in workers:
+                    worker.stop()
+                raise
+            self.workers = workers
+            self._executor = ThreadPoolExecutor(max_workers=len(workers), thread_name_prefix="shard-query")
+            logger.info(f"Started {len(workers)} shard processes for {self.meta['count']} vectors")
+
+    def stop(self):
+        with self._lock:
+            for worker in self.workers:
+                worker.stop()
+            self.workers = []
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def rebuild(self, ids: np.ndarray, vectors: np.ndarray, n_shards: int, model_version: Optional[str] = None):
+        """Re-partition the data and restart every shard on the new files"""
+        with self._lock:
+            self.stop()
+            write_shards(self.shard_dir, ids, vectors, n_shards, model_version)
+            self.start()
+
+    def _query_shard(self, worker: ShardWorker, query: np.ndarray, top_k: int):
+        if worker.restarting:
+            return None
+        try:
+            return worker.query(query, top_k, self.timeout)
+        except ShardError as e:
+            logger.error(str(e))
+            self._restart_in_background(worker)
+            return None
+
+    def _restart_in_background(self, worker: ShardWorker):
+        with self._lock:
+            if worker.restarting:
+                return
+            worker.restarting = True
+
+        def run():
+            try:
+                worker.restart(self.start_timeout)
+            except ShardError as e:
+                logger.error(str(e))
+            finally:
+                with self._lock:
+                    worker.restarting = False
+                    if worker not in self.workers:
+                        worker.stop()  # Stopped or rebuilt while restarting
+
+        threading.Thread(target=run, name=f"shard-{worker.shard_id}-restart", daemon=True).start()
+
+    def search(self, query: np.ndarray, top_k: int) -> Dict[str, Any]:
+        """
+        Exact top-k over all shards.
+
+        Returns:
+            Dict with matches [(id, score)] best first, shards and failed_shards
+
+        Raises:
+            RuntimeError: If the shards are not running
+        """
+        with self._lock:
+            if not self.workers:
+                raise RuntimeError("Shards are not running")
+            workers, executor = list(self.workers), self._executor
+
+        query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+        futures = [executor.submit(self._query_shard, worker, query, top_k) for worker in workers]
+
+        partials, failed = [], []
+        for worker, future in zip(workers, futures):
+            result = future.result()
+            if result is None:
+                failed.append(worker.shard_id)
+            else:
+                partials.append(zip(*result))
+
+        merged = heapq.nlargest(top_k, (item for partial in partials for item in partial), key=lambda item: item[1])
+        return {"matches": merged, "shards": len(workers), "failed_shards": failed}
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "n_shards": self.meta.get("n_shards", 0),
+                "count": self.meta.get("count", 0),
+                "model_version": self.meta.get("model_version"),
+                "shards": [
+                    {"shard": w.shard_id, "size": w.size, "alive": w.alive, "restarts": w.restarts,
+                     "restarting": w.restarting}
+                    for w in self.workers
+                ],
+            }
+
+
+# Global shard coordinator - started in the application lifespan when shards exist
+shard_coordinator = ShardCoordinator(settings.SHARD_DIR, timeout=settings.SHARD_TIMEOUT_SECONDS)
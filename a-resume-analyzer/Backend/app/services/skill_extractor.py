@@ -0,0 +1,166 @@
+# app/services/skill_extractor.py
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from pathlib import Path
+import json
+import logging
+
+from app.Backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Punctuation that joins a phrase to the word before it ("node.js", "f#", "notepad++")
+_JOINERS = ".#+"
+
+
+def _fold(text: str) -> str:
+    """Case-fold, treat hyphens as spaces and collapse whitespace, so "Machine-\\n Learning" matches "machine learning" """
+    return " ".join(text.casefold().replace("-", " ").split())
+
+
+class SkillAutomaton:
+    """
+    Aho-Corasick automaton over skill phrases (names and aliases).
+
+    scan() finds every phrase occurrence in one left-to-right pass over the
+    case-folded text, regardless of how many phrases there are. Matches must
+    sit on word boundaries: a phrase starting (ending) with a letter or
+    digit may not be preceded (followed) by one, so "java" does not match
+    inside "javascript" while "c++" and "ci/cd" still match. A ".", "#" or
+    "+" directly after a word also counts as part of that word, so "js"
+    does not match inside "node.js".
+    """
+
+    def __init__(self, phrases: Dict[str, str]):
+        """
+        Args:
+            phrases: Surface phrase -> canonical skill name
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, bool, bool]]] = [[]]
+
+        for phrase, skill in phrases.items():
+            phrase = _fold(phrase)
+            if not phrase:
+                continue
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(phrase), skill, phrase[0].isalnum(), phrase[-1].isalnum()))
+
+        # Breadth-first failure links; each state inherits the outputs of its failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    @property
+    def n_states(self) -> int:
+        return len(self._goto)
+
+    def scan(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Returns:
+            (start offset in the folded text, canonical skill) for every boundary-respecting match
+        """
+        text = _fold(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        hits = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for length, skill, check_start, check_end in out[state]:
+                    start = i - length + 1
+                    if check_start and start > 0 and (
+                        text[start - 1].isalnum()
+                        or (text[start - 1] in _JOINERS and start > 1 and text[start - 2].isalnum())
+                    ):
+                        continue
+                    if check_end and i + 1 < n and text[i + 1].isalnum():
+                        continue
+                    hits.append((start, skill))
+        return hits
+
+
+class SkillExtractor:
+    """
+    Skill taxonomy (canonical names, categories, aliases) with an Aho-Corasick matcher.
+
+    The taxonomy is a JSON file: {"skills": [{"name", "category", "aliases",
+    "match_name"}]}. match_name=false matches only the aliases, for names
+    that are ordinary words ("Go", "Excel").
+    """
+
+    def __init__(self, skills: Iterable[Dict]):
+        self.categories: Dict[str, str] = {}
+        phrases: Dict[str, str] = {}
+        for entry in skills:
+            name = entry["name"]
+            self.categories[name] = entry.get("category", "other")
+            if entry.get("match_name", True):
+                phrases[name] = name
+            for alias in entry.get("aliases", []):
+                phrases[alias] = name
+        self.automaton = SkillAutomaton(phrases)
+
+    @classmethod
+    def load(cls, path: Path) -> "SkillExtractor":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data.get("skills", []))
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct canonical skills in text, in order of first occurrence"""
+        seen = {}
+        for _, skill in self.automaton.scan(text):
+            seen.setdefault(skill, None)
+        return list(seen)
+
+    def match_keywords(self, resume_text: str, job_text: str) -> Tuple[List[str], List[str]]:
+        """
+        Compare the job's skills with the resume's.
+
+        Returns:
+            (matched, missing): job skills found / not found in the resume, in job order
+        """
+        resume_skills = set(self.extract(resume_text))
+        job_skills = self.extract(job_text)
+        matched = [s for s in job_skills if s in resume_skills]
+        missing = [s for s in job_skills if s not in resume_skills]
+        return matched, missing
+
+
+def load_skill_extractor(path: Optional[Path] = None) -> SkillExtractor:
+    """Load the taxonomy from SKILLS_TAXONOMY_PATH; an empty extractor if it is missing"""
+    path = Path(path or settings.SKILLS_TAXONOMY_PATH)
+    try:
+        extractor = SkillExtractor.load(path)
+        logger.info(f"Loaded {len(extractor)} skills ({extractor.automaton.n_states} automaton states) from {path}")
+        return extractor
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Skill taxonomy not loaded from {path}: {e}")
+        return SkillExtractor([])
+
+
+# Global skill extractor - built once at import
+skill_extractor = load_skill_extractor()
@@ -1,10 +1,33 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+from pathlib import Path
 from typing import List
+from collections import Counter
+import json
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.Backend.app.core.config import settings
+
+# Pickle-free artifact files (written next to vectorizer_meta.json)
+VOCAB_FILE = "vectorizer_vocab.npy"
+IDF_FILE = "vectorizer_idf.npy"
+HASHING_IDF_FILE = "vectorizer_hashing_idf.npy"
+# Document-frequency state for incremental IDF updates
+DF_FILE = "vectorizer_df.npy"
+HASHING_DF_FILE = "vectorizer_hashing_df.npy"
+PENDING_TERMS_FILE = "vectorizer_pending_terms.npy"
+PENDING_DF_FILE = "vectorizer_pending_df.npy"
+META_FILE = "vectorizer_meta.json"
+
 
 class TextVectorizer:
     def __init__(self, **kwargs):
         # keep default params simple; override later for experiments
         self.vectorizer = TfidfVectorizer(**kwargs)
+        self.lsa = None     # Optional LsaProjection, attached by the model store
 
     def fit_transform(self, documents: List[str]):
         return self.vectorizer.fit_transform(documents)
@@ -17,6 +40,281 @@ class TextVectorizer:
         joblib.dump(self.vectorizer, path)
 
     def load(self, path: str):
+        if Path(path).is_dir():
+            return self.load_npy(path)
         import joblib
         self.vectorizer = joblib.load(path)
         return self.vectorizer
+
+    def save_npy(self, artifact_dir: str) -> dict:
+        """
+        Save the fitted model in the pickle-free format:
+        vocabulary as a sorted fixed-width UTF-8 string table, idf as a
+        float array (both .npy, memory-mappable) and the analyzer config
+        merged into vectorizer_meta.json under "config".
+
+        Returns:
+            The config dict written to the metadata file
+        """
+        if isinstance(self.vectorizer, MmapTfidf):
+            vocab, idf, config = self.vectorizer.vocab, self.vectorizer.idf, self.vectorizer.config
+        else:
+            vocab, idf, config = _export_sklearn(self.vectorizer)
+
+        artifact_dir = Path(artifact_dir)
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        np.save(artifact_dir / VOCAB_FILE, vocab)
+        np.save(artifact_dir / IDF_FILE, idf)
+
+        meta_path = artifact_dir / META_FILE
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+        meta["config"] = config
+        meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return config
+
+    def load_npy(self, artifact_dir: str):
+        """
+        Load the pickle-free format. The vocabulary and idf arrays are
+        memory-mapped read-only, so worker processes share their pages
+        through the OS page cache instead of each holding a private copy.
+        """
+        artifact_dir = Path(artifact_dir)
+        meta = json.loads((artifact_dir / META_FILE).read_text(encoding="utf-8"))
+        if "config" not in meta:
+            raise ValueError(f"No vectorizer config in {artifact_dir / META_FILE}")
+
+        vocab = np.load(artifact_dir / VOCAB_FILE, mmap_mode="r", allow_pickle=False)
+        idf = np.load(artifact_dir / IDF_FILE, mmap_mode="r", allow_pickle=False)
+        self.vectorizer = MmapTfidf(vocab, idf, meta["config"])
+        return self.vectorizer
+
+
+class MmapTfidf:
+    """
+    TF-IDF transform over a memory-mapped sorted vocabulary table.
+
+    Reproduces TfidfVectorizer.transform for word analyzers (lowercase,
+    token_pattern, optional stop words, word n-grams, sublinear_tf, binary,
+    l1/l2 norm) without unpickling an sklearn object. Term lookup is a
+    binary search (np.searchsorted) in the sorted table, whose row order
+    matches sklearn's alphabetically sorted vocabulary indices.
+    """
+
+    def __init__(self, vocab: np.ndarray, idf: np.ndarray, config: dict):
+        if vocab.shape[0] != idf.shape[0]:
+            raise ValueError("Vocabulary and idf sizes differ")
+        self.vocab = vocab
+        self.idf = idf
+        self.config = config
+        self.dtype = np.dtype(config.get("dtype", "float64"))
+        self.ngram_range = tuple(config.get("ngram_range", (1, 1)))
+        self.stop_words = frozenset(config["stop_words"]) if config.get("stop_words") else None
+        self._tokenize = re.compile(config["token_pattern"]).findall
+        self._max_term_bytes = vocab.dtype.itemsize
+
+    def analyze(self, doc: str) -> List[str]:
+        """Terms (tokens and n-grams) of a document, as TfidfVectorizer's analyzer"""
+        if self.config.get("lowercase", True):
+            doc = doc.lower()
+        tokens = self._tokenize(doc)
+        if self.stop_words is not None:
+            tokens = [t for t in tokens if t not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            for i in range(len(tokens) - n + 1):
+                terms.append(" ".join(tokens[i:i + n]))
+        return terms
+
+    def lookup(self, terms: List[str]):
+        """Map distinct terms to column indices; returns (columns, found_mask)"""
+        encoded = [t.encode("utf-8") for t in terms]
+        # Terms wider than the table cannot be in it (and would be truncated)
+        fits = np.fromiter((len(e) <= self._max_term_bytes for e in encoded), dtype=bool, count=len(encoded))
+        keys = np.array(encoded, dtype=self.vocab.dtype)
+        pos = np.searchsorted(self.vocab, keys)
+        pos = np.minimum(pos, self.vocab.shape[0] - 1)
+        found = fits & (self.vocab[pos] == keys)
+        return pos, found
+
+    def transform(self, documents: List[str]):
+        indptr = [0]
+        indices = []
+        data = []
+
+        for doc in documents:
+            term_counts = Counter(self.analyze(doc))
+            if term_counts:
+                pos, found = self.lookup(list(term_counts))
+                counts = np.fromiter(term_counts.values(), dtype=np.int64, count=len(term_counts))
+                cols = pos[found]
+                order = np.argsort(cols)
+                indices.extend(cols[order].tolist())
+                data.extend(counts[found][order].tolist())
+            indptr.append(len(indices))
+
+        X = sp.csr_matrix(
+            (np.asarray(data, dtype=self.dtype), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(documents), self.vocab.shape[0]),
+        )
+
+        if self.config.get("binary", False):
+            X.data[:] = 1
+        if self.config.get("sublinear_tf", False):
+            np.log(X.data, out=X.data)
+            X.data += 1
+        if self.config.get("use_idf", True):
+            X.data *= self.idf[X.indices]
+
+        norm = self.config.get("norm", "l2")
+        if norm:
+            X = normalize(X, norm=norm, copy=False)
+        return X
+
+
+class HashingTextVectorizer:
+    """
+    Stateless alternative to TextVectorizer using feature hashing.
+
+    Terms are hashed into a fixed number of columns, so no fitted vocabulary
+    has to be loaded or kept in sync across nodes. An optional IDF weight
+    array (one float per column) can be fitted and shipped separately;
+    without it vectors are plain L2-normalized term counts. transform()
+    returns L2-normalized sparse rows, the same contract as TextVectorizer.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, dtype=None, **kwargs):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.dtype(dtype or settings.VECTOR_DTYPE),
+            **kwargs
+        )
+        self.idf = None
+        self.df = None
+        self.lsa = None     # LSA is fitted on TF-IDF columns, so never set for hashing
+
+    def fit_transform(self, documents: List[str]):
+        """Fit smoothed IDF weights (same formula as TfidfVectorizer) and transform"""
+        counts = self.vectorizer.transform(documents).tocsc()
+        n_docs = counts.shape[0]
+        self.df = np.diff(counts.indptr)
+        self.idf = smoothed_idf(self.df, n_docs)
+        return self.transform(documents)
+
+    def transform(self, documents: List[str]):
+        X = self.vectorizer.transform(documents)
+        if self.idf is not None:
+            X.data *= self.idf[X.indices]
+        return normalize(X, norm="l2", copy=False)
+
+    def save_npy(self, artifact_dir: str) -> dict:
+        """Save the IDF array and merge the hashing config into vectorizer_meta.json"""
+        params = self.vectorizer.get_params()
+        config = {
+            "format": "hashing",
+            "n_features": params["n_features"],
+            "lowercase": params["lowercase"],
+            "token_pattern": params["token_pattern"],
+            "ngram_range": list(params["ngram_range"]),
+            "dtype": np.dtype(params["dtype"]).name,
+            "has_idf": self.idf is not None,
+        }
+
+        artifact_dir = Path(artifact_dir)
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        if self.idf is not None:
+            np.save(artifact_dir / HASHING_IDF_FILE, np.asarray(self.idf, dtype=np.float64))
+        if self.df is not None:
+            np.save(artifact_dir / HASHING_DF_FILE, np.asarray(self.df, dtype=np.int64))
+
+        meta_path = artifact_dir / META_FILE
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+        meta["hashing_config"] = config
+        meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return config
+
+    def load(self, path: str):
+        """Load hashing config (and IDF array, memory-mapped) from an artifact directory"""
+        artifact_dir = Path(path)
+        meta = json.loads((artifact_dir / META_FILE).read_text(encoding="utf-8"))
+        config = meta.get("hashing_config")
+        if config is None:
+            raise ValueError(f"No hashing config in {artifact_dir / META_FILE}")
+
+        self.vectorizer = HashingVectorizer(
+            n_features=config["n_features"],
+            lowercase=config["lowercase"],
+            token_pattern=config["token_pattern"],
+            ngram_range=tuple(config["ngram_range"]),
+            dtype=np.dtype(config["dtype"]),
+            alternate_sign=False,
+            norm=None
+        )
+        self.idf = None
+        if config.get("has_idf"):
+            self.idf = np.load(artifact_dir / HASHING_IDF_FILE, mmap_mode="r", allow_pickle=False)
+        return self.vectorizer
+
+
+def smoothed_idf(df: np.ndarray, n_docs: int) -> np.ndarray:
+    """IDF from document frequencies, as TfidfVectorizer(smooth_idf=True)"""
+    return np.log((1 + n_docs) / (1 + np.asarray(df, dtype=np.float64))) + 1
+
+
+def build_sklearn(vocab: np.ndarray, idf: np.ndarray, config: dict) -> TfidfVectorizer:
+    """Rebuild a fitted TfidfVectorizer from npy arrays (inverse of _export_sklearn)"""
+    vectorizer = TfidfVectorizer(
+        vocabulary={term.decode("utf-8"): i for i, term in enumerate(vocab.tolist())},
+        lowercase=config["lowercase"],
+        token_pattern=config["token_pattern"],
+        ngram_range=tuple(config["ngram_range"]),
+        stop_words=config["stop_words"],
+        binary=config["binary"],
+        sublinear_tf=config["sublinear_tf"],
+        use_idf=config["use_idf"],
+        norm=config["norm"],
+        dtype=np.dtype(config["dtype"]).type,
+    )
+    if config["use_idf"]:
+        vectorizer.idf_ = np.asarray(idf, dtype=config["dtype"])
+    return vectorizer
+
+
+def _export_sklearn(vectorizer: TfidfVectorizer):
+    """Convert a fitted TfidfVectorizer into (vocab_table, idf, config)"""
+    params = vectorizer.get_params()
+    if params["analyzer"] != "word" or params["tokenizer"] is not None or params["preprocessor"] is not None:
+        raise ValueError("Only the default word analyzer can be exported to the npy format")
+    if params["strip_accents"] is not None:
+        raise ValueError("strip_accents is not supported by the npy format")
+
+    stop_words = vectorizer.get_stop_words()
+    terms = sorted(vectorizer.vocabulary_.items())
+    encoded = [term.encode("utf-8") for term, _ in terms]
+    width = max((len(e) for e in encoded), default=1)
+    vocab = np.array(encoded, dtype=f"S{width}")
+
+    if params["use_idf"]:
+        idf = np.asarray(vectorizer.idf_)[[col for _, col in terms]]
+    else:
+        idf = np.ones(len(terms))
+
+    config = {
+        "format": "npy",
+        "lowercase": params["lowercase"],
+        "token_pattern": params["token_pattern"],
+        "ngram_range": list(params["ngram_range"]),
+        "stop_words": sorted(stop_words) if stop_words else None,
+        "binary": params["binary"],
+        "sublinear_tf": params["sublinear_tf"],
+        "use_idf": params["use_idf"],
+        "norm": params["norm"],
+        "dtype": np.dtype(params["dtype"]).name,
+        "vocab_size": len(terms),
+    }
+    return vocab, idf.astype(config["dtype"]), config
@@ -36,6 +36,11 @@ def init_database():
         print("  - user (id, email, hashed_password, is_verified, created_at, updated_at)")
         print("  - subscription (id, user_id, plan, trial_used, remaining_credits, created_at, expires_at)")
         print("  - resume_build (id, user_id, template_name, resume_content, score, created_at, updated_at)")
+        print("  - resume_vectors (resume_id, processed_text, token_count, model_version, n_features, indices, weights)")
+        print("  - job_descriptions (text_hash, normalized_text, token_count, created_at)")
+        print("  - job_description_vectors (text_hash, model_version, n_features, indices, weights)")
+        print("  - batch_jobs (id, status, total, processed, successful, failed, created_at, finished_at)")
+        print("  - batch_job_results (id, job_id, item_index, success, match_score)")
         
         # Add unique constraint info
         print("\n🔐 Database constraints:")
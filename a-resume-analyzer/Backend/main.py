@@ -19,7 +19,13 @@ from app.Backend.app.api.resume_routes import router as resume_router
 from app.Backend.app.api.admin_routes import router as admin_router
 from app.Backend.app.core.config import settings
 from app.Backend.app.core.dependencies import set_vectorizer
-from app.Backend.app.services.vectorizer import TextVectorizer
+from app.Backend.app.services.model_store import model_store
+from app.Backend.app.services.model_registry import model_registry
+from app.Backend.app.services.job_queue import batch_job_queue
+from app.Backend.app.services.ann_index import job_catalog
+from app.Backend.app.services.sharded_index import shard_coordinator
+from app.Backend.app.services.match_history import match_history_recorder
+from app.Backend.app.services.resume_index import resume_index
 
 # Configure logging
 LOG_LEVEL = settings.LOG_LEVEL if hasattr(settings, "LOG_LEVEL") else "INFO"
@@ -44,29 +50,49 @@ async def lifespan(app: FastAPI):
     # Initialize Redis Cache
     await init_redis()
     
-    # Try to load the pre-trained vectorizer
-    if settings.VECTOR_PATH.exists():
-        try:
-            logger.info(f"📦 Loading vectorizer from {settings.VECTOR_PATH}")
-            vectorizer = TextVectorizer()
-            vectorizer.load(str(settings.VECTOR_PATH))
-            set_vectorizer(vectorizer)
-            logger.info("✅ Vectorizer loaded successfully")
-            
-            # Log metadata if available
-            if settings.META_PATH.exists():
-                import json
-                meta = json.loads(settings.META_PATH.read_text())
-                logger.info(f"📊 Model version: {meta.get('version')}")
-                logger.info(f"📊 Trained on {meta.get('num_docs')} documents")
-        except Exception as e:
-            logger.error(f"❌ Failed to load vectorizer: {e}")
-            logger.warning("⚠️  API will return 503 until model is trained via /api/admin/retrain")
-    else:
-        logger.warning(f"⚠️  No pre-trained model found at {settings.VECTOR_PATH}")
+    # Try to load the published (or legacy) pre-trained vectorizer
+    try:
+        version, vectorizer = model_store.load_current()
+        set_vectorizer(vectorizer)
+        resume_index.warm(vectorizer, model_store.loaded_version)
+        logger.info(f"✅ {settings.VECTOR_FORMAT} vectorizer loaded from {model_store.artifact_dir(version)}")
+        
+        # Log metadata if available
+        meta = model_store.meta()
+        if meta:
+            logger.info(f"📊 Model version: {meta.get('version')}")
+            logger.info(f"📊 Trained on {meta.get('num_docs')} documents")
+    except FileNotFoundError as e:
+        logger.warning(f"⚠️  {e}")
         logger.warning("⚠️  Please train the model first:")
         logger.warning("   1. Run: python -m ml.train_vectorizer")
         logger.warning("   2. Or call: POST /api/admin/retrain")
+    except Exception as e:
+        logger.error(f"❌ Failed to load vectorizer: {e}")
+        logger.warning("⚠️  API will return 503 until model is trained via /api/admin/retrain")
+    
+    # Load canary/shadow versions (saved routing, else the Settings defaults)
+    model_registry.load_routing()
+    
+    # Load the persisted job catalog index
+    try:
+        job_catalog.load()
+    except Exception as e:
+        logger.error(f"❌ Failed to load job catalog: {e}")
+    
+    # Start shard processes if shards have been built
+    if shard_coordinator.built:
+        try:
+            shard_coordinator.start()
+        except Exception as e:
+            logger.error(f"❌ Failed to start shards: {e}")
+    
+    # Start background batch job workers
+    batch_job_queue.start()
+    
+    # Start the write-behind match history writer
+    if settings.MATCH_HISTORY_ENABLED:
+        match_history_recorder.start()
     
     logger.info("✅ Application startup complete")
     
@@ -75,6 +101,16 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("👋 Shutting down AI Resume Analyzer...")
     
+    # Stop batch job workers
+    batch_job_queue.stop()
+    
+    # Flush buffered match history
+    match_history_recorder.stop()
+    
+    # Persist job catalog changes and stop shard processes
+    job_catalog.save()
+    shard_coordinator.stop()
+    
     # Close Redis Cache
     await close_redis()
 
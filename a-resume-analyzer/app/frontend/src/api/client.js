@@ -105,6 +105,10 @@ export const api = {
       apiClient.post('/api/admin/retrain', null, {
         headers: { 'X-Admin-Token': adminToken },
       }),
+    retrainStatus: (adminToken) =>
+      apiClient.get('/api/admin/retrain/status', {
+        headers: { 'X-Admin-Token': adminToken },
+      }),
   },
 }
 
@@ -0,0 +1,87 @@
+"""
+Benchmark the LSH job catalog index against brute-force search.
+
+Embeds the local corpus with LSA and, to simulate a large catalog, grows it
+to --jobs rows with noisy copies of those embeddings. Queries are (a sample
+of) the corpus. For each (tables, bits, probes) setting, reports build
+time, mean candidates scored per query, per-query latency and recall@k
+against exhaustive DenseIndex search.
+
+Usage (from the project root):
+    python -m ml.benchmark_ann --jobs 100000 --tables 4 8 16 --bits 10 12 14 --probes 1 2 4
+"""
+
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from app.Backend.app.services.ann_index import LshIndex
+from app.Backend.app.services.embeddings import LsaProjection, DenseIndex
+from ml.train_vectorizer import load_corpus_from_data_folder, build_vectorizer, DEFAULT_CORPUS
+
+
+def synthetic_catalog(base: np.ndarray, n_jobs: int, noise: float, seed: int = 0) -> np.ndarray:
+    """Catalog of n_jobs L2-normalized rows: base plus perturbed copies of it"""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(base), max(0, n_jobs - len(base)))
+    extra = base[picks] + rng.normal(0, noise / np.sqrt(base.shape[1]), (len(picks), base.shape[1]))
+    jobs = np.vstack([base, extra]).astype(np.float32)
+    return jobs / np.linalg.norm(jobs, axis=1, keepdims=True)
+
+
+def recall_at_k(found: np.ndarray, exact: np.ndarray) -> float:
+    """Fraction of the exact top-k present in the approximate top-k"""
+    return len(set(found.tolist()) & set(exact.tolist())) / max(len(exact), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50000, help="Catalog size (corpus plus noisy copies)")
+    parser.add_argument("--components", type=int, default=128)
+    parser.add_argument("--noise", type=float, default=0.5, help="Perturbation of synthetic jobs")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--tables", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--bits", type=int, nargs="+", default=[10, 12, 14])
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    corpus = load_corpus_from_data_folder() or DEFAULT_CORPUS
+    tv = build_vectorizer()
+    X = tv.fit_transform(corpus)
+    lsa = LsaProjection.fit(X, args.components)
+    base = lsa.embed(X)
+    jobs = synthetic_catalog(base, args.jobs, args.noise)
+    queries = base[:args.queries]
+    print(f"Catalog: {len(jobs)} jobs, {jobs.shape[1]} dims; {len(queries)} queries, top-{args.top_k}")
+
+    brute = DenseIndex(jobs)
+    start = time.perf_counter()
+    exact = [brute.search(q, args.top_k)[0][0] for q in queries]
+    brute_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"{'tables':>6}{'bits':>6}{'probes':>8}{'build s':>10}{'cands':>10}{'ms/query':>10}{'recall':>8}")
+    print(f"{'brute force':>20}{'':>10}{len(jobs):>10}{brute_ms:>10.3f}{1.0:>8.3f}")
+
+    ids = np.arange(len(jobs))
+    for n_tables, n_bits in itertools.product(args.tables, args.bits):
+        start = time.perf_counter()
+        index = LshIndex(jobs.shape[1], n_tables, n_bits)
+        index.insert(ids, jobs)
+        build_s = time.perf_counter() - start
+
+        for n_probes in args.probes:
+            recall = 0.0
+            start = time.perf_counter()
+            for q, truth in zip(queries, exact):
+                found, _ = index.search(q, args.top_k, n_probes)
+                recall += recall_at_k(found, truth)
+            ms = (time.perf_counter() - start) * 1000 / len(queries)
+            candidates = sum(index.candidates(q, n_probes).size for q in queries) / len(queries)
+            print(f"{n_tables:>6}{n_bits:>6}{n_probes:>8}{build_s:>10.2f}{candidates:>10.0f}"
+                  f"{ms:>10.3f}{recall / len(queries):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark the stateless HashingTextVectorizer against the TF-IDF TextVectorizer.
+
+Reports model memory, transform throughput and score agreement (pairwise
+cosine scores and top-k ranking overlap) on the local corpus.
+
+Usage (from the project root):
+    python -m ml.benchmark_hashing --n-features 262144 --top-k 5
+"""
+
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+from app.Backend.app.services.vectorizer import TextVectorizer, HashingTextVectorizer
+from ml.train_vectorizer import load_corpus_from_data_folder, DEFAULT_CORPUS
+
+
+def model_bytes(vectorizer) -> int:
+    """Serialized size of the state a worker has to hold"""
+    if isinstance(vectorizer, HashingTextVectorizer):
+        return 0 if vectorizer.idf is None else vectorizer.idf.nbytes
+    return len(pickle.dumps(vectorizer.vectorizer))
+
+
+def throughput(vectorizer, docs, repeat: int) -> float:
+    """Documents transformed per second"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        vectorizer.transform(docs)
+    return len(docs) * repeat / (time.perf_counter() - start)
+
+
+def top_k_overlap(a: np.ndarray, b: np.ndarray, k: int) -> float:
+    """Mean |top-k(a) ∩ top-k(b)| / k over rows"""
+    k = min(k, a.shape[1])
+    top_a = np.argsort(-a, axis=1)[:, :k]
+    top_b = np.argsort(-b, axis=1)[:, :k]
+    return float(np.mean([len(set(x) & set(y)) / k for x, y in zip(top_a, top_b)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = load_corpus_from_data_folder() or DEFAULT_CORPUS
+    print(f"Corpus: {len(corpus)} documents")
+
+    tfidf = TextVectorizer()
+    tfidf.fit_transform(corpus)
+    hashing = HashingTextVectorizer(n_features=args.n_features)
+    hashing.fit_transform(corpus)
+
+    # Score every document against every other one
+    a = tfidf.transform(corpus)
+    b = hashing.transform(corpus)
+    scores_tfidf = (a @ a.T).toarray()
+    scores_hash = (b @ b.T).toarray()
+    mask = ~np.eye(len(corpus), dtype=bool)
+    diff = np.abs(scores_tfidf - scores_hash)[mask]
+    corr = np.corrcoef(scores_tfidf[mask], scores_hash[mask])[0, 1] if mask.sum() > 1 else 1.0
+
+    np.fill_diagonal(scores_tfidf, -1)
+    np.fill_diagonal(scores_hash, -1)
+
+    print(f"{'':24}{'tfidf':>14}{'hashing':>14}")
+    print(f"{'model bytes':24}{model_bytes(tfidf):>14,}{model_bytes(hashing):>14,}")
+    print(f"{'columns':24}{a.shape[1]:>14,}{b.shape[1]:>14,}")
+    print(f"{'transform docs/s':24}{throughput(tfidf, corpus, args.repeat):>14,.0f}"
+          f"{throughput(hashing, corpus, args.repeat):>14,.0f}")
+    print()
+    print(f"Score agreement over {mask.sum()} pairs:")
+    print(f"  mean |diff|      {diff.mean():.4f}")
+    print(f"  max |diff|       {diff.max():.4f}")
+    print(f"  pearson r        {corr:.4f}")
+    print(f"  top-{args.top_k} overlap    {top_k_overlap(scores_tfidf, scores_hash, args.top_k):.4f}")
+
+
+if __name__ == "__main__":
+    main()
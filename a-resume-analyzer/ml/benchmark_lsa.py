@@ -0,0 +1,74 @@
+"""
+Benchmark LSA dense embeddings against raw TF-IDF cosine.
+
+Uses the local corpus as a job catalog and (a sample of) it as resume
+queries. For each LSA size, the job embeddings are written as a memory-
+mapped DenseIndex and every query is ranked against all jobs. Reports index
+bytes, ranking throughput and agreement with sparse cosine (Pearson r of
+scores and top-k overlap).
+
+Usage (from the project root):
+    python -m ml.benchmark_lsa --components 64 128 256 --top-k 10
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.Backend.app.services.embeddings import LsaProjection, DenseIndex
+from ml.benchmark_hashing import top_k_overlap
+from ml.train_vectorizer import load_corpus_from_data_folder, build_vectorizer, DEFAULT_CORPUS
+from ml.report_vectorizer_variants import matrix_bytes
+
+
+def timed(fn, repeat: int) -> float:
+    """Best wall time of fn() over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--queries", type=int, default=100, help="Resumes ranked against the catalog")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus_from_data_folder() or DEFAULT_CORPUS
+    tv = build_vectorizer()
+    X = tv.fit_transform(corpus)
+    queries = X[:args.queries]
+    print(f"Catalog: {X.shape[0]} jobs, {X.shape[1]} terms; {queries.shape[0]} queries, top-{args.top_k}")
+
+    exact = (queries @ X.T).toarray()
+    sparse_s = timed(lambda: (queries @ X.T).toarray(), args.repeat)
+    print(f"{'mode':16}{'index B':>12}{'queries/s':>12}{'pearson':>10}{'top-k':>8}")
+    print(f"{'tfidf sparse':16}{matrix_bytes(X):>12,}{queries.shape[0] / sparse_s:>12,.0f}{1.0:>10.4f}{1.0:>8.3f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_components in args.components:
+            lsa = LsaProjection.fit(X, n_components)
+            index_path = Path(tmp) / f"jobs_{n_components}.npy"
+            DenseIndex(lsa.embed(X)).save(str(index_path))
+            index = DenseIndex.load(str(index_path))
+
+            query_emb = lsa.embed(queries)
+            approx = index.scores(query_emb)
+            dense_s = timed(lambda: index.search(query_emb, args.top_k), args.repeat)
+            corr = np.corrcoef(exact.ravel(), approx.ravel())[0, 1]
+
+            name = f"lsa-{lsa.n_components}"
+            print(f"{name:16}{index.vectors.nbytes:>12,}{queries.shape[0] / dense_s:>12,.0f}"
+                  f"{corr:>10.4f}{top_k_overlap(approx, exact, args.top_k):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark the Aho-Corasick skill extractor on large batches.
+
+Builds a batch of --docs documents from the local corpus (repeated as
+needed) and extracts skills with the automaton (one pass per document,
+independent of taxonomy size). For comparison it runs one word-boundary
+regex per taxonomy phrase, the straightforward alternative. Reports
+docs/s, MB/s and whether both find the same skills.
+
+Usage (from the project root):
+    python -m ml.benchmark_skills --docs 20000 --taxonomy Backend/app/ml/skills_taxonomy.json
+"""
+
+import argparse
+import itertools
+import json
+import re
+import time
+from pathlib import Path
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.skill_extractor import SkillExtractor, _fold
+from ml.train_vectorizer import load_corpus_from_data_folder, DEFAULT_CORPUS
+
+
+def regex_extractor(extractor: SkillExtractor, skills):
+    """One compiled pattern per phrase, with the automaton's boundary rules"""
+    patterns = []
+    for entry in skills:
+        phrases = ([entry["name"]] if entry.get("match_name", True) else []) + entry.get("aliases", [])
+        for phrase in phrases:
+            phrase = _fold(phrase)
+            start = r"(?<![^\W_])" if phrase[0].isalnum() else ""
+            end = r"(?![^\W_])" if phrase[-1].isalnum() else ""
+            patterns.append((re.compile(start + re.escape(phrase) + end), entry["name"]))
+
+    def extract(text):
+        text = _fold(text)
+        return {name for pattern, name in patterns if pattern.search(text)}
+
+    return extract
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--taxonomy", type=Path, default=settings.SKILLS_TAXONOMY_PATH)
+    parser.add_argument("--skip-regex", action="store_true", help="Only time the automaton")
+    args = parser.parse_args()
+
+    skills = json.loads(args.taxonomy.read_text(encoding="utf-8"))["skills"]
+    build_start = time.perf_counter()
+    extractor = SkillExtractor(skills)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    corpus = load_corpus_from_data_folder() or DEFAULT_CORPUS
+    docs = list(itertools.islice(itertools.cycle(corpus), args.docs))
+    mb = sum(len(d) for d in docs) / 1e6
+    print(f"Taxonomy: {len(extractor)} skills, {extractor.automaton.n_states} states, built in {build_ms:.1f} ms")
+    print(f"Batch: {len(docs)} docs, {mb:.1f} MB")
+
+    start = time.perf_counter()
+    found = [set(extractor.extract(d)) for d in docs]
+    elapsed = time.perf_counter() - start
+    hits = sum(len(f) for f in found)
+    print(f"{'method':16}{'docs/s':>12}{'MB/s':>10}{'skills/doc':>12}")
+    print(f"{'aho-corasick':16}{len(docs) / elapsed:>12,.0f}{mb / elapsed:>10.2f}{hits / len(docs):>12.2f}")
+
+    if not args.skip_regex:
+        extract = regex_extractor(extractor, skills)
+        start = time.perf_counter()
+        expected = [extract(d) for d in docs]
+        elapsed = time.perf_counter() - start
+        print(f"{'regex/phrase':16}{len(docs) / elapsed:>12,.0f}{mb / elapsed:>10.2f}"
+              f"{sum(len(e) for e in expected) / len(docs):>12.2f}")
+        agree = sum(f == e for f, e in zip(found, expected)) / len(docs)
+        print(f"Identical skill sets: {agree:.1%}")
+
+
+if __name__ == "__main__":
+    main()
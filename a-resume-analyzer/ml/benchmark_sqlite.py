@@ -0,0 +1,143 @@
+"""
+Benchmark SQLite write contention with and without the connection profile.
+
+Runs --writers processes (like uvicorn workers) against a fresh database
+file, each doing signup-style (read user, insert user + subscription) and
+resume-save-style (insert resume, update credits) transactions for
+--seconds, while --readers processes list resumes. Each profile gets its
+own file:
+    default  driver defaults (rollback journal, synchronous=FULL)
+    tuned    the SQLITE_* PRAGMAs from Settings (WAL, synchronous=NORMAL, ...)
+Reports committed writes/s, reads/s, write latency percentiles and
+"database is locked" errors.
+
+Usage (from the project root):
+    python -m ml.benchmark_sqlite --writers 8 --readers 2 --seconds 10
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.core.database import (
+    Base, User, Subscription, ResumeBuild, apply_sqlite_pragmas, sqlite_pragmas
+)
+
+
+def _engine(url: str, pragmas):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def _signup(db, worker: int, n: int):
+    email = f"w{worker}-{n}@example.com"
+    if db.scalar(select(User).where(User.email == email)) is None:
+        user = User(email=email, hashed_password="x" * 60)
+        db.add(user)
+        db.flush()
+        db.add(Subscription(user_id=user.id, remaining_credits=100))
+    db.commit()
+
+
+def _save_resume(db, user_id: int):
+    db.add(ResumeBuild(user_id=user_id, template_name="ats-friendly-1",
+                       resume_content=json.dumps({"summary": "x" * 2000}), score=80.0))
+    subscription = db.scalar(select(Subscription).where(Subscription.user_id == user_id))
+    subscription.remaining_credits -= 1
+    db.commit()
+
+
+def _worker(url: str, pragmas, role: str, worker: int, start_at: float, seconds: float, queue):
+    Session = sessionmaker(bind=_engine(url, pragmas), autoflush=False)
+    rng = random.Random(worker)
+    latencies, ops, locked, n = [], 0, 0, 0
+    with Session() as db:
+        while time.time() < start_at:
+            time.sleep(0.001)
+        deadline = start_at + seconds
+        while time.time() < deadline:
+            start = time.perf_counter()
+            try:
+                if role == "reader":
+                    db.scalars(select(ResumeBuild).where(ResumeBuild.user_id == rng.randint(1, 50))).all()
+                    db.rollback()
+                elif rng.random() < 0.3:
+                    _signup(db, worker, n)
+                    n += 1
+                else:
+                    _save_resume(db, rng.randint(1, 50))
+                ops += 1
+                latencies.append(time.perf_counter() - start)
+            except OperationalError as e:
+                db.rollback()
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+    queue.put((role, ops, locked, latencies))
+
+
+def run_profile(name: str, pragmas, args, workdir: Path):
+    url = f"sqlite:///{workdir / f'{name}.db'}"
+    engine = _engine(url, pragmas)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        for worker in range(50):
+            _signup(db, -1, worker)
+    with engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+    engine.dispose()
+
+    queue = mp.Queue()
+    start_at = time.time() + 1.0
+    roles = ["writer"] * args.writers + ["reader"] * args.readers
+    procs = [mp.Process(target=_worker, args=(url, pragmas, role, i, start_at, args.seconds, queue))
+             for i, role in enumerate(roles)]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    writes = sum(ops for role, ops, _, _ in results if role == "writer")
+    reads = sum(ops for role, ops, _, _ in results if role == "reader")
+    locked = sum(errors for _, _, errors, _ in results)
+    latencies = np.array([t for role, _, _, lat in results if role == "writer" for t in lat]) * 1000
+    p50, p99 = (np.percentile(latencies, [50, 99]) if latencies.size else (0.0, 0.0))
+    print(f"{name:10}{journal_mode:>9}{writes / args.seconds:>11,.0f}{reads / args.seconds:>10,.0f}"
+          f"{p50:>10.2f}{p99:>10.2f}{locked:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--dir", type=Path, default=None, help="Where to create the database files (default: a temp dir)")
+    args = parser.parse_args()
+
+    # Benchmark the configured values even when the profile is switched off
+    settings.SQLITE_TUNING = True
+    profiles = {"default": {}, "tuned": sqlite_pragmas()}
+    print("tuned: " + ", ".join(f"{k}={v}" for k, v in profiles["tuned"].items()))
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:.0f}s per profile")
+    print(f"{'profile':10}{'journal':>9}{'writes/s':>11}{'reads/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'locked':>9}")
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as workdir:
+        for name, pragmas in profiles.items():
+            run_profile(name, pragmas, args, Path(workdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Incremental IDF update for the published vectorizer.
+
+Instead of refitting over the whole corpus, continue from the document
+frequencies saved with the published version: absorb only documents in
+data/processed/ modified after its watermark, add their document
+frequencies and recompute IDF in O(vocabulary). Unknown terms are held as
+pending counts and admitted into the vocabulary once they occur in
+INCREMENTAL_MIN_DF documents (bounded by VECTOR_MAX_FEATURES). The result
+is published as a new version through the model store.
+
+max_df / max_features pruning is only applied by a full retrain; run one
+periodically to re-prune the vocabulary.
+
+Usage (from the project root):
+    python -m ml.incremental_idf
+"""
+
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+
+import numpy as np
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.model_store import model_store, new_version
+from app.Backend.app.services.embeddings import LsaProjection
+from app.Backend.app.services.preprocessing import process_text
+from app.Backend.app.services.vectorizer import (
+    TextVectorizer, HashingTextVectorizer, MmapTfidf, build_sklearn, smoothed_idf,
+    VOCAB_FILE, IDF_FILE, DF_FILE, HASHING_DF_FILE, PENDING_TERMS_FILE, PENDING_DF_FILE, META_FILE,
+)
+from ml.train_vectorizer import DATA_DIR, VECTOR_PATH, iter_corpus_files
+
+
+def iter_new_documents(since: float, data_dir: Path = DATA_DIR) -> Iterator[Tuple[float, str]]:
+    """Yield (mtime, preprocessed text) for corpus files modified after the watermark"""
+    for path in iter_corpus_files(data_dir):
+        mtime = path.stat().st_mtime
+        if mtime <= since:
+            continue
+        text = process_text(path.read_text(encoding="utf-8", errors="ignore"))
+        if text:
+            yield mtime, text
+
+
+def load_pending(artifact_dir: Path) -> Counter:
+    """Document frequencies of terms not yet admitted into the vocabulary"""
+    if not (artifact_dir / PENDING_TERMS_FILE).exists():
+        return Counter()
+    terms = np.load(artifact_dir / PENDING_TERMS_FILE, allow_pickle=False)
+    counts = np.load(artifact_dir / PENDING_DF_FILE, allow_pickle=False)
+    return Counter({t.decode("utf-8"): int(c) for t, c in zip(terms.tolist(), counts.tolist())})
+
+
+def count_document_frequencies(model: MmapTfidf, documents: List[str]) -> Tuple[np.ndarray, Counter]:
+    """
+    Document frequencies of a batch against a vocabulary.
+
+    Returns:
+        (df of known terms aligned with model.vocab, Counter of unknown terms)
+    """
+    df = np.zeros(model.vocab.shape[0], dtype=np.int64)
+    unknown = Counter()
+    for doc in documents:
+        terms = list(set(model.analyze(doc)))
+        if not terms:
+            continue
+        pos, found = model.lookup(terms)
+        df[pos[found]] += 1
+        unknown.update(term for term, ok in zip(terms, found) if not ok)
+    return df, unknown
+
+
+def admit_terms(pending: Counter, min_df: int, room: Optional[int]) -> List[str]:
+    """Admission policy: most frequent pending terms seen in at least min_df documents, up to room"""
+    candidates = sorted(
+        ((count, term) for term, count in pending.items() if count >= min_df),
+        key=lambda item: (-item[0], item[1])
+    )
+    if room is not None:
+        candidates = candidates[:max(0, room)]
+    return [term for _, term in candidates]
+
+
+def merge_vocabulary(vocab: np.ndarray, df: np.ndarray, new_terms: List[str], new_df: List[int]):
+    """Insert terms into the sorted vocabulary table, keeping df aligned"""
+    encoded = [t.encode("utf-8") for t in new_terms]
+    width = max([vocab.dtype.itemsize] + [len(e) for e in encoded])
+    merged = np.concatenate([vocab.astype(f"S{width}"), np.array(encoded, dtype=f"S{width}")])
+    merged_df = np.concatenate([df, np.asarray(new_df, dtype=np.int64)])
+    order = np.argsort(merged, kind="stable")
+    return merged[order], merged_df[order]
+
+
+def update_artifacts(base_dir: Path, artifact_dir: Path, version: str,
+                     data_dir: Path = DATA_DIR) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Absorb documents newer than the base version's watermark and write a new
+    version (all artifact formats plus updated df state) into artifact_dir.
+
+    Returns:
+        (new metadata, absorbed documents), or None if there are no new documents
+
+    Raises:
+        ValueError: If the base version has no document-frequency state
+    """
+    base_dir = Path(base_dir)
+    meta = json.loads((base_dir / META_FILE).read_text(encoding="utf-8"))
+    if not (base_dir / DF_FILE).exists() or "config" not in meta:
+        raise ValueError("Published model has no document-frequency state; run a full retrain first")
+
+    new_docs = list(iter_new_documents(meta.get("ingested_until", 0.0), data_dir))
+    if not new_docs:
+        return None
+    documents = [text for _, text in new_docs]
+    n_docs = meta["num_docs"] + len(documents)
+    config = dict(meta["config"])
+
+    # Known terms: add batch df; unknown terms accumulate as pending
+    model = TextVectorizer().load_npy(str(base_dir))
+    batch_df, unknown = count_document_frequencies(model, documents)
+    df = np.load(base_dir / DF_FILE, allow_pickle=False) + batch_df
+    pending = load_pending(base_dir)
+    pending.update(unknown)
+
+    max_features = settings.VECTOR_MAX_FEATURES
+    room = None if max_features is None else max_features - df.shape[0]
+    admitted = admit_terms(pending, settings.INCREMENTAL_MIN_DF, room)
+    base_vocab = vocab = np.asarray(model.vocab)
+    if admitted:
+        vocab, df = merge_vocabulary(vocab, df, admitted, [pending.pop(t) for t in admitted])
+    pending = Counter(dict(pending.most_common(settings.INCREMENTAL_MAX_PENDING)))
+
+    # O(vocabulary) IDF recompute
+    idf = smoothed_idf(df, n_docs) if config["use_idf"] else np.ones(df.shape[0])
+    idf = idf.astype(config["dtype"])
+    config["vocab_size"] = int(vocab.shape[0])
+
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    np.save(artifact_dir / VOCAB_FILE, vocab)
+    np.save(artifact_dir / IDF_FILE, idf)
+    np.save(artifact_dir / DF_FILE, df)
+    pending_terms = list(pending)
+    width = max((len(t.encode("utf-8")) for t in pending_terms), default=1)
+    np.save(artifact_dir / PENDING_TERMS_FILE, np.array([t.encode("utf-8") for t in pending_terms], dtype=f"S{width}"))
+    np.save(artifact_dir / PENDING_DF_FILE, np.array([pending[t] for t in pending_terms], dtype=np.int64))
+
+    tv = TextVectorizer()
+    tv.vectorizer = build_sklearn(vocab, idf, config)
+    tv.save(str(artifact_dir / VECTOR_PATH.name))
+
+    new_meta = {
+        **meta,
+        "version": version,
+        "created_at": datetime.now().isoformat() + "Z",
+        "num_docs": n_docs,
+        "vocab_size": int(vocab.shape[0]),
+        "ingested_until": max(mtime for mtime, _ in new_docs),
+        "config": config,
+        "incremental": {
+            "base_version": meta.get("version"),
+            "new_docs": len(documents),
+            "admitted_terms": len(admitted),
+            "pending_terms": len(pending),
+        },
+    }
+    new_meta.pop("hashing_config", None)
+    new_meta.pop("lsa", None)
+    (artifact_dir / META_FILE).write_text(json.dumps(new_meta, indent=2), encoding="utf-8")
+
+    # Keep the LSA basis; admitted terms get zero weight until the next full retrain
+    lsa = LsaProjection.load(str(base_dir))
+    if lsa is not None:
+        components = np.zeros((lsa.n_components, vocab.shape[0]), dtype=np.float32)
+        components[:, np.searchsorted(vocab, base_vocab.astype(vocab.dtype))] = lsa.components
+        LsaProjection(components, meta.get("lsa", {}).get("explained_variance")).save(str(artifact_dir))
+
+    # Hashing columns need no admission: just add the batch df
+    if meta.get("hashing_config") and (base_dir / HASHING_DF_FILE).exists():
+        hv = HashingTextVectorizer()
+        hv.load(str(base_dir))
+        counts = hv.vectorizer.transform(documents).tocsr()
+        hv.df = np.load(base_dir / HASHING_DF_FILE, allow_pickle=False) + np.bincount(
+            counts.indices, minlength=counts.shape[1]
+        )
+        hv.idf = smoothed_idf(hv.df, n_docs)
+        hv.save_npy(str(artifact_dir))
+
+    return json.loads((artifact_dir / META_FILE).read_text(encoding="utf-8")), documents
+
+
+def main():
+    base_version = model_store.current_version()
+    base_dir = model_store.artifact_dir(base_version)
+
+    version = new_version()
+    staging_dir = model_store.stage(version)
+    result = update_artifacts(base_dir, staging_dir, version)
+    if result is None:
+        model_store.discard(staging_dir)
+        print(f"No new documents in {DATA_DIR} since {base_version or 'the legacy model'}")
+        return
+
+    meta, documents = result
+    model_store.commit(version, staging_dir, documents)
+    print(f"Published version {version} to: {model_store.artifact_dir(version)}")
+    print(f"Incremental: {meta['incremental']}")
+
+
+if __name__ == "__main__":
+    main()
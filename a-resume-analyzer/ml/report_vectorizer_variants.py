@@ -0,0 +1,94 @@
+"""
+Memory/accuracy report for vectorizer variants (dtype and vocabulary pruning).
+
+Each variant is fitted on the training corpus and compared with the
+float64, unpruned baseline on an evaluation set: vocabulary size, model
+bytes, bytes of the transformed evaluation vectors, transform throughput
+and ranking agreement of pairwise scores (max |diff|, Pearson r, top-k
+overlap). Use it to choose VECTOR_DTYPE / VECTOR_MIN_DF / VECTOR_MAX_DF /
+VECTOR_MAX_FEATURES.
+
+Usage (from the project root):
+    python -m ml.report_vectorizer_variants --eval-dir data/eval --top-k 5
+"""
+
+import argparse
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from ml.benchmark_hashing import throughput, top_k_overlap
+from ml.train_vectorizer import load_corpus_from_data_folder, build_vectorizer, DEFAULT_CORPUS
+
+BASELINE = {"dtype": "float64", "min_df": 1, "max_df": 1.0, "max_features": None}
+
+
+def default_variants(vocab_size: int) -> dict:
+    """Baseline plus one variant per setting and a combined one"""
+    pruned = max(1, vocab_size // 4)
+    return {
+        "baseline": BASELINE,
+        "float32": {**BASELINE, "dtype": "float32"},
+        "min_df=2": {**BASELINE, "min_df": 2},
+        "max_df=0.5": {**BASELINE, "max_df": 0.5},
+        f"max_features={pruned}": {**BASELINE, "max_features": pruned},
+        "float32+min_df=2": {**BASELINE, "dtype": "float32", "min_df": 2},
+    }
+
+
+def matrix_bytes(X) -> int:
+    """Memory held by a CSR matrix (data + indices + indptr)"""
+    return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+
+def pairwise_scores(X) -> np.ndarray:
+    scores = (X @ X.T).toarray().astype(np.float64)
+    np.fill_diagonal(scores, -1)
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eval-dir", type=Path, default=None,
+                        help="Folder of .txt evaluation documents (default: the training corpus)")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = load_corpus_from_data_folder() or DEFAULT_CORPUS
+    eval_docs = load_corpus_from_data_folder(args.eval_dir) if args.eval_dir else corpus
+    if len(eval_docs) < 2:
+        raise SystemExit("Need at least 2 evaluation documents")
+    print(f"Training corpus: {len(corpus)} documents, evaluation set: {len(eval_docs)} documents")
+
+    baseline = build_vectorizer(BASELINE)
+    baseline.fit_transform(corpus)
+    reference = pairwise_scores(baseline.transform(eval_docs))
+    mask = reference >= 0
+
+    print(f"{'variant':24}{'vocab':>8}{'model B':>11}{'vectors B':>11}{'docs/s':>10}"
+          f"{'max|diff|':>11}{'pearson':>9}{'top-' + str(args.top_k):>8}")
+
+    for name, params in default_variants(len(baseline.vectorizer.vocabulary_)).items():
+        tv = build_vectorizer(params)
+        try:
+            tv.fit_transform(corpus)
+        except ValueError as e:
+            # e.g. min_df prunes every term on a tiny corpus
+            print(f"{name:24}  skipped: {e}")
+            continue
+
+        X = tv.transform(eval_docs)
+        scores = pairwise_scores(X)
+        diff = np.abs(scores - reference)[mask]
+        corr = np.corrcoef(scores[mask], reference[mask])[0, 1] if mask.sum() > 1 else 1.0
+
+        print(f"{name:24}{len(tv.vectorizer.vocabulary_):>8,}"
+              f"{len(pickle.dumps(tv.vectorizer)):>11,}{matrix_bytes(X):>11,}"
+              f"{throughput(tv, eval_docs, args.repeat):>10,.0f}"
+              f"{diff.max():>11.4f}{corr:>9.4f}{top_k_overlap(scores, reference, args.top_k):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Out-of-core, parallel training for the TF-IDF vectorizer.
+
+Streams .txt files from data/processed/ in chunks to a process pool. Each
+worker preprocesses its chunk with process_text, analyzes it with the
+configured TfidfVectorizer analyzer and returns only per-chunk document
+frequencies and term totals. The main process merges the counts, so memory
+is bounded by the vocabulary, not the corpus. min_df / max_df /
+max_features are applied as TfidfVectorizer does, and the same artifacts
+as ml.train_vectorizer (joblib, npy, hashing, df state) are published as a
+new version, with timing and throughput stats in the metadata. With
+LSA_COMPONENTS > 0 the LSA stage is fitted on a uniform random sample of at
+most --lsa-sample documents (reservoir sampling over the stream).
+
+Usage (from the project root):
+    python -m ml.train_streaming --workers 4 --chunk-size 256
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.embeddings import LsaProjection
+from app.Backend.app.services.model_store import model_store, new_version
+from app.Backend.app.services.preprocessing import process_text
+from app.Backend.app.services.vectorizer import (
+    TextVectorizer, HashingTextVectorizer, build_sklearn, smoothed_idf, DF_FILE, META_FILE,
+)
+from ml.train_vectorizer import (
+    DATA_DIR, VECTOR_PATH, DEFAULT_CORPUS, iter_corpus_files, vectorizer_params, build_vectorizer, train_artifacts,
+)
+
+VALIDATION_DOCS = 20
+LSA_SAMPLE_DOCS = 20000
+
+
+@lru_cache(maxsize=1)
+def _analyzers(params_json: str):
+    """TF-IDF analyzer and hashing vectorizer, built once per worker process"""
+    analyzer = build_vectorizer(json.loads(params_json)).vectorizer.build_analyzer()
+    return analyzer, HashingTextVectorizer().vectorizer
+
+
+def count_chunk(paths: List[str], params_json: str, keep_docs: bool = False) -> Dict[str, Any]:
+    """
+    Preprocess and count one chunk of files (runs in a worker process).
+
+    Returns:
+        Document frequencies, term totals, hashing-column document
+        frequencies, sample documents for validation and, if keep_docs,
+        every preprocessed document (for the LSA sample)
+    """
+    analyzer, hasher = _analyzers(params_json)
+    df, tf = Counter(), Counter()
+    docs, read_bytes = [], 0
+
+    for path in paths:
+        raw = Path(path).read_text(encoding="utf-8", errors="ignore")
+        read_bytes += len(raw)
+        text = process_text(raw)
+        if not text:
+            continue
+        terms = analyzer(text)
+        tf.update(terms)
+        df.update(set(terms))
+        docs.append(text)
+
+    hashed_cols, hashed_df = np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    if docs:
+        counts = hasher.transform(docs).tocsr()
+        hashed_cols, hashed_df = np.unique(counts.indices, return_counts=True)
+
+    return {
+        "files": len(paths),
+        "docs": len(docs),
+        "bytes": read_bytes,
+        "df": df,
+        "tf": tf,
+        "hashed_cols": hashed_cols,
+        "hashed_df": hashed_df,
+        "samples": docs[:VALIDATION_DOCS],
+        "docs_text": docs if keep_docs else [],
+    }
+
+
+def iter_chunks(paths: Iterator[Path], chunk_size: int) -> Iterator[List[str]]:
+    while True:
+        chunk = [str(p) for p in islice(paths, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def limit_features(df: Counter, tf: Counter, n_docs: int, params: Dict[str, Any]) -> List[str]:
+    """Apply min_df / max_df / max_features like TfidfVectorizer; returns the sorted kept terms"""
+    max_df, min_df = params["max_df"], params["min_df"]
+    max_count = max_df if isinstance(max_df, int) else max_df * n_docs
+    min_count = min_df if isinstance(min_df, int) else min_df * n_docs
+    if max_count < min_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+
+    terms = sorted(t for t, count in df.items() if min_count <= count <= max_count)
+    if params["max_features"] is not None and len(terms) > params["max_features"]:
+        # Most frequent across the corpus (total term count), ties alphabetical
+        terms = sorted(sorted(terms, key=lambda t: -tf[t])[:params["max_features"]])
+    if not terms:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    return terms
+
+
+def stream_train(artifact_dir: Path, version: str, workers: int, chunk_size: int,
+                 data_dir: Path = DATA_DIR, lsa_sample: int = LSA_SAMPLE_DOCS) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Count the corpus in parallel chunks and write every artifact format into artifact_dir.
+    The LSA stage (if LSA_COMPONENTS > 0) is fitted on at most lsa_sample documents.
+
+    Returns:
+        (metadata, sample documents for validation)
+    """
+    params = vectorizer_params()
+    params_json = json.dumps(params)
+    start = time.perf_counter()
+
+    df, tf = Counter(), Counter()
+    hashing_df = np.zeros(HashingTextVectorizer().vectorizer.n_features, dtype=np.int64)
+    n_files = n_docs = n_bytes = 0
+    watermark = 0.0
+    samples: List[str] = []
+    fit_lsa = settings.LSA_COMPONENTS > 0
+    lsa_docs: List[str] = []
+    rng = random.Random(42)
+
+    def paths():
+        nonlocal watermark
+        for path in iter_corpus_files(data_dir):
+            watermark = max(watermark, path.stat().st_mtime)
+            yield path
+
+    def absorb(result: Dict[str, Any]):
+        nonlocal n_files, n_docs, n_bytes
+        _sample(lsa_docs, result["docs_text"], n_docs, lsa_sample, rng)
+        n_files, n_docs, n_bytes = _merge(result, df, tf, hashing_df, samples, n_files, n_docs, n_bytes)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = iter_chunks(paths(), chunk_size)
+        pending = []
+        # Keep a bounded number of chunks in flight so file lists are not all materialized
+        for chunk in chunks:
+            pending.append(executor.submit(count_chunk, chunk, params_json, fit_lsa))
+            if len(pending) >= workers * 2:
+                absorb(pending.pop(0).result())
+        for future in pending:
+            absorb(future.result())
+    count_seconds = time.perf_counter() - start
+
+    if n_docs == 0:
+        raise ValueError(f"No documents in {data_dir}")
+
+    # Build the model from the merged counts (O(vocabulary))
+    build_start = time.perf_counter()
+    terms = limit_features(df, tf, n_docs, params)
+    term_df = np.array([df[t] for t in terms], dtype=np.int64)
+    dtype = np.dtype(params["dtype"]).name
+    idf = smoothed_idf(term_df, n_docs).astype(dtype)
+
+    width = max(len(t.encode("utf-8")) for t in terms)
+    vocab = np.array([t.encode("utf-8") for t in terms], dtype=f"S{width}")
+    tv = TextVectorizer()
+    tv.vectorizer = build_sklearn(vocab, idf, {**_sklearn_config(params), "dtype": dtype})
+    build_seconds = time.perf_counter() - build_start
+
+    write_start = time.perf_counter()
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    tv.save(str(artifact_dir / VECTOR_PATH.name))
+    np.save(artifact_dir / DF_FILE, term_df)
+
+    meta = {
+        "version": version,
+        "created_at": datetime.now().isoformat() + "Z",
+        "num_docs": n_docs,
+        "params": params,
+        "vocab_size": len(terms),
+        "ingested_until": watermark,
+    }
+    (artifact_dir / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    tv.save_npy(str(artifact_dir))
+
+    hv = HashingTextVectorizer()
+    hv.df = hashing_df
+    hv.idf = smoothed_idf(hashing_df, n_docs)
+    hv.save_npy(str(artifact_dir))
+    write_seconds = time.perf_counter() - write_start
+
+    lsa_seconds = 0.0
+    if fit_lsa:
+        lsa_start = time.perf_counter()
+        LsaProjection.fit(tv.transform(lsa_docs), settings.LSA_COMPONENTS).save(str(artifact_dir))
+        lsa_seconds = time.perf_counter() - lsa_start
+
+    total = time.perf_counter() - start
+    meta = json.loads((artifact_dir / META_FILE).read_text(encoding="utf-8"))
+    meta["training"] = {
+        "mode": "streaming",
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "files": n_files,
+        "bytes": n_bytes,
+        "distinct_terms": len(df),
+        "count_seconds": round(count_seconds, 3),
+        "build_seconds": round(build_seconds, 3),
+        "write_seconds": round(write_seconds, 3),
+        "lsa_sample_docs": len(lsa_docs),
+        "lsa_seconds": round(lsa_seconds, 3),
+        "total_seconds": round(total, 3),
+        "docs_per_second": round(n_docs / count_seconds, 1) if count_seconds else None,
+        "mb_per_second": round(n_bytes / 1e6 / count_seconds, 2) if count_seconds else None,
+    }
+    (artifact_dir / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta, samples
+
+
+def _merge(result: Dict[str, Any], df: Counter, tf: Counter, hashing_df: np.ndarray, samples: List[str],
+           n_files: int, n_docs: int, n_bytes: int) -> Tuple[int, int, int]:
+    df.update(result["df"])
+    tf.update(result["tf"])
+    hashing_df[result["hashed_cols"]] += result["hashed_df"]
+    samples.extend(result["samples"][:VALIDATION_DOCS - len(samples)])
+    return n_files + result["files"], n_docs + result["docs"], n_bytes + result["bytes"]
+
+
+def _sample(reservoir: List[str], docs: List[str], seen: int, size: int, rng: random.Random):
+    """Reservoir sampling: keep a uniform sample of at most size docs; seen counts docs before these"""
+    for doc in docs:
+        seen += 1
+        if len(reservoir) < size:
+            reservoir.append(doc)
+        else:
+            j = rng.randrange(seen)
+            if j < size:
+                reservoir[j] = doc
+
+
+def _sklearn_config(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyzer settings of the TfidfVectorizer that build_vectorizer(params) creates"""
+    vectorizer = build_vectorizer(params).vectorizer
+    return {
+        "lowercase": vectorizer.lowercase,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": vectorizer.stop_words,
+        "binary": vectorizer.binary,
+        "sublinear_tf": vectorizer.sublinear_tf,
+        "use_idf": vectorizer.use_idf,
+        "norm": vectorizer.norm,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=256, help="Files per worker task")
+    parser.add_argument("--lsa-sample", type=int, default=LSA_SAMPLE_DOCS,
+                        help="Documents the LSA stage is fitted on (when LSA_COMPONENTS > 0)")
+    args = parser.parse_args()
+
+    version = new_version()
+    staging_dir = model_store.stage(version)
+
+    if next(iter_corpus_files(), None) is None:
+        print(f"No documents in {DATA_DIR}, using default corpus")
+        meta = train_artifacts(DEFAULT_CORPUS, staging_dir, version)
+        samples = DEFAULT_CORPUS
+    else:
+        meta, samples = stream_train(staging_dir, version, args.workers, args.chunk_size,
+                                     lsa_sample=args.lsa_sample)
+
+    model_store.commit(version, staging_dir, samples)
+    print(f"Published version {version} to: {model_store.artifact_dir(version)}")
+    print(f"Training: {json.dumps(meta.get('training', {}), indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Offline training for the TF-IDF vectorizer.
+
+Reads .txt files from data/processed/ (falls back to a small built-in corpus),
+preprocesses them with the same pipeline used at match time and publishes
+the model artifacts as a new version in the API's model store.
+
+Usage (from the project root):
+    python -m ml.train_vectorizer
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+from app.Backend.app.core.config import settings
+from app.Backend.app.services.preprocessing import process_text
+from app.Backend.app.services.vectorizer import TextVectorizer, HashingTextVectorizer, META_FILE, DF_FILE
+from app.Backend.app.services.model_store import model_store, new_version
+from app.Backend.app.services.embeddings import LsaProjection
+
+DATA_DIR = Path("data/processed")
+ARTIFACT_DIR = settings.VECTOR_DIR
+VECTOR_PATH = settings.VECTOR_PATH
+
+# Used when data/processed/ is empty
+DEFAULT_CORPUS = [
+    "python backend developer fastapi sql",
+    "frontend developer react javascript html css",
+    "data scientist python machine learning pandas numpy",
+    "devops engineer aws docker kubernetes cloud infrastructure",
+    "bigdata spark hive data",
+]
+
+
+def vectorizer_params() -> Dict[str, Any]:
+    """TfidfVectorizer parameters from Settings, in the JSON form stored in the metadata file"""
+    return {
+        "dtype": np.dtype(settings.VECTOR_DTYPE).name,
+        "min_df": settings.VECTOR_MIN_DF,
+        "max_df": settings.VECTOR_MAX_DF,
+        "max_features": settings.VECTOR_MAX_FEATURES,
+    }
+
+
+def build_vectorizer(params: Dict[str, Any] = None) -> TextVectorizer:
+    """Create an unfitted TextVectorizer from (JSON-form) params, defaulting to Settings"""
+    params = dict(params if params is not None else vectorizer_params())
+    params["dtype"] = np.dtype(params["dtype"]).type
+    return TextVectorizer(**params)
+
+
+def iter_corpus_files(data_dir: Path = DATA_DIR) -> Iterator[Path]:
+    """Yield corpus .txt files in a stable order"""
+    if not data_dir.exists():
+        return
+    yield from sorted(data_dir.glob("*.txt"))
+
+
+def corpus_watermark(data_dir: Path = DATA_DIR) -> float:
+    """Newest modification time in data_dir; documents after it are new to incremental updates"""
+    return max((path.stat().st_mtime for path in iter_corpus_files(data_dir)), default=0.0)
+
+
+def load_corpus_from_data_folder(data_dir: Path = DATA_DIR) -> List[str]:
+    """Load and preprocess every .txt document in data_dir (empty documents are skipped)"""
+    corpus = []
+    for path in iter_corpus_files(data_dir):
+        text = process_text(path.read_text(encoding="utf-8", errors="ignore"))
+        if text:
+            corpus.append(text)
+    return corpus
+
+
+def train_artifacts(corpus: List[str], artifact_dir: Path, version: str, ingested_until: float = 0.0) -> Dict[str, Any]:
+    """
+    Fit the vectorizer on a preprocessed corpus and write every artifact format
+    (joblib, npy vocabulary/idf, hashing idf, LSA components if LSA_COMPONENTS > 0)
+    plus vectorizer_meta.json into artifact_dir.
+    Document frequencies are saved as well, so ml.incremental_idf can continue from here;
+    ingested_until is the corpus watermark (see corpus_watermark) the fit covers.
+
+    Returns:
+        The metadata written to vectorizer_meta.json
+    """
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+
+    params = vectorizer_params()
+    tv = build_vectorizer(params)
+    X = tv.fit_transform(corpus)
+    tv.save(str(artifact_dir / VECTOR_PATH.name))
+    np.save(artifact_dir / DF_FILE, np.bincount(X.indices, minlength=X.shape[1]).astype(np.int64))
+
+    meta = {
+        "version": version,
+        "created_at": datetime.now().isoformat() + "Z",
+        "num_docs": len(corpus),
+        "params": params,
+        "vocab_size": len(tv.vectorizer.vocabulary_),
+        "ingested_until": ingested_until,
+    }
+    (artifact_dir / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    tv.save_npy(str(artifact_dir))
+
+    if settings.LSA_COMPONENTS > 0:
+        LsaProjection.fit(X, settings.LSA_COMPONENTS).save(str(artifact_dir))
+
+    hv = HashingTextVectorizer()
+    hv.fit_transform(corpus)
+    hv.save_npy(str(artifact_dir))
+    return meta
+
+
+def main():
+    watermark = corpus_watermark()
+    corpus = load_corpus_from_data_folder()
+    if not corpus:
+        print(f"No documents in {DATA_DIR}, using default corpus")
+        corpus = DEFAULT_CORPUS
+
+    # Write into a staging directory, validate, then flip the "current" pointer;
+    # running API workers pick the new version up on their next reload check
+    version = new_version()
+    staging_dir = model_store.stage(version)
+    meta = train_artifacts(corpus, staging_dir, version, watermark)
+    model_store.commit(version, staging_dir, corpus)
+
+    print(f"Published version {version} to: {model_store.artifact_dir(version)}")
+    print(f"Meta: {meta}")
+
+
+if __name__ == "__main__":
+    main()